@@ -0,0 +1,106 @@
+"""
+Evaluator benchmark.
+
+Compares the compiled evaluation plan against walking the split's condition/matcher graph,
+using the splits & segments from the integration test fixtures.
+
+Usage: python benchmarks/bench_evaluator.py (with the sdk installed, ie: `pip install -e .`)
+"""
+from __future__ import print_function
+
+import json
+import os
+import timeit
+
+from splitio.engine.evaluator import Evaluator
+from splitio.engine.splitters import Splitter
+from splitio.models import splits, segments
+from splitio.models.grammar.condition import ConditionType
+from splitio.models.impressions import Label
+from splitio.models.treatments import CONTROL
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
+
+_FILES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'integration', 'files')
+
+
+def _load(filename):
+    with open(os.path.join(_FILES, filename), 'r') as flo:
+        return json.loads(flo.read())
+
+
+def _interpreted(evaluator, split, matching_key, bucketing_key, attributes):
+    """Evaluate a split walking its conditions, as the evaluator did before compilation."""
+    context = evaluator._build_context(matching_key, bucketing_key)  #pylint: disable=protected-access
+    roll_out = False
+    for condition in split.conditions:
+        if not roll_out and condition.condition_type == ConditionType.ROLLOUT:
+            if split.traffic_allocation < 100:
+                bucket = evaluator._splitter.get_bucket(  #pylint: disable=protected-access
+                    bucketing_key, split.traffic_allocation_seed, split.algo
+                )
+                if bucket > split.traffic_allocation:
+                    return split.default_treatment, Label.NOT_IN_SPLIT
+            roll_out = True
+        if condition.matches(matching_key, attributes=attributes, context=context):
+            return _treatment_for_partitions(
+                evaluator, bucketing_key, split.seed, condition.partitions, split.algo
+            ), condition.label
+    return None, None
+
+
+def _treatment_for_partitions(evaluator, key, seed, partitions, algo):
+    """Pick a treatment scanning the partitions, as the splitter did before lookup tables."""
+    if not partitions:
+        return CONTROL
+    if len(partitions) == 1 and partitions[0].size == 100:
+        return partitions[0].treatment
+    bucket = evaluator._splitter.get_bucket(key, seed, algo)  #pylint: disable=protected-access
+    covered_buckets = 0
+    for partition in partitions:
+        covered_buckets += partition.size
+        if covered_buckets >= bucket:
+            return partition.treatment
+    return CONTROL
+
+
+def main():
+    """Run the benchmark."""
+    split_storage = InMemorySplitStorage()
+    segment_storage = InMemorySegmentStorage()
+    for raw in _load('splitChanges.json')['splits']:
+        split_storage.put(splits.from_raw(raw))
+    segment_storage.put(segments.from_raw(_load('segmentEmployeesChanges.json')))
+    segment_storage.put(segments.from_raw(_load('segmentHumanBeignsChanges.json')))
+
+    evaluator = Evaluator(split_storage, segment_storage, Splitter())
+    features = [s.name for s in split_storage.get_all_splits() if not s.killed]
+    keys = ['user%d' % i for i in range(200)]
+
+    for feature in features:
+        split = split_storage.get(feature)
+        for key in keys:
+            assert evaluator._get_treatment_for_split(split, key, key) == \
+                _interpreted(evaluator, split, key, key, None)  #pylint: disable=protected-access
+
+    def _run(func):
+        for feature in features:
+            split = split_storage.get(feature)
+            for key in keys:
+                func(split, key)
+
+    compiled = min(timeit.repeat(
+        lambda: _run(lambda s, k: evaluator._get_treatment_for_split(s, k, k)),  #pylint: disable=protected-access
+        number=20, repeat=5
+    ))
+    interpreted = min(timeit.repeat(
+        lambda: _run(lambda s, k: _interpreted(evaluator, s, k, k, None)),
+        number=20, repeat=5
+    ))
+    evaluations = 20 * len(features) * len(keys)
+    print('interpreted: %.2f us/evaluation' % (interpreted / evaluations * 1e6))
+    print('compiled:    %.2f us/evaluation' % (compiled / evaluations * 1e6))
+    print('speedup:     %.2fx' % (interpreted / compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Hash functions benchmark.
+
+Compares bucketing a list of keys one by one against the numpy vectorized hash functions.
+
+Usage: python benchmarks/bench_hashfns.py (with the sdk & numpy installed)
+"""
+from __future__ import print_function
+
+import timeit
+import uuid
+
+from splitio.engine import hashfns
+from splitio.models.splits import HashAlgorithm
+
+
+def main():
+    """Run the benchmark."""
+    if hashfns.vectorized is None:
+        print('numpy is not installed, nothing to compare.')
+        return
+
+    keys = [str(uuid.uuid4()) for _ in range(100000)]
+    for name, algo in [('legacy', HashAlgorithm.LEGACY), ('murmur', HashAlgorithm.MURMUR)]:
+        hashfn = hashfns.get_hash_fn(algo)
+        scalar = [abs(hashfn(key, 123456)) % 100 + 1 for key in keys]
+        assert hashfns.get_buckets(keys, 123456, algo) == scalar
+
+        scalar_time = min(timeit.repeat(
+            lambda: [abs(hashfn(key, 123456)) % 100 + 1 for key in keys],  #pylint: disable=cell-var-from-loop
+            number=1, repeat=3
+        ))
+        vector_time = min(timeit.repeat(
+            lambda: hashfns.get_buckets(keys, 123456, algo),  #pylint: disable=cell-var-from-loop
+            number=1, repeat=3
+        ))
+        print('%s: scalar %.1f ms, vectorized %.1f ms (%.1fx) for %d keys' % (
+            name, scalar_time * 1000, vector_time * 1000, scalar_time / vector_time, len(keys)
+        ))
+
+
+if __name__ == '__main__':
+    main()
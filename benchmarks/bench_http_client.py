@@ -0,0 +1,174 @@
+"""
+HTTP client benchmark.
+
+Runs a local stand-in for the split servers and compares issuing requests through module-level
+`requests` calls (as HttpClient did before) against HttpClient's pooled session: number of TCP
+connections opened, latency of a split poll and of 20 concurrent segment fetches, and size of an
+impressions bulk POST.
+
+Usage: python benchmarks/bench_http_client.py (with the sdk installed)
+"""
+from __future__ import print_function
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import socket
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+import requests
+
+from splitio.api.client import HttpClient
+
+
+_REQUESTS = 200
+_CONCURRENT_FETCHES = 20
+_SPLIT_CHANGES = json.dumps({
+    'splits': [{'name': 'feature%d' % index, 'conditions': []} for index in range(50)],
+    'since': -1,
+    'till': 123
+}).encode('utf-8')
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answers every request with a fixed body, keeping connections alive."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        """Count new connections."""
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _respond(self):
+        """Send the fixed response."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(_SPLIT_CHANGES)))
+        self.end_headers()
+        self.wfile.write(_SPLIT_CHANGES)
+
+    def do_GET(self):  #pylint: disable=invalid-name
+        """Handle GET requests."""
+        self._respond()
+
+    def do_POST(self):  #pylint: disable=invalid-name
+        """Handle POST requests, recording the size of the body received."""
+        length = int(self.headers['Content-Length'])
+        self.rfile.read(length)
+        self.server.last_body_size = length
+        self._respond()
+
+    def log_message(self, *_):  #pylint: disable=arguments-differ
+        """Don't log requests."""
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """Threaded stand-in server counting connections."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self):
+        """Listen on a random local port."""
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.last_body_size = 0
+
+
+class _UnpooledHttpClient(HttpClient):
+    """HttpClient issuing requests through module-level functions (old behavior)."""
+
+    def get(  #pylint: disable=too-many-arguments,unused-argument
+            self,
+            server,
+            path,
+            apikey,
+            query=None,
+            extra_headers=None
+    ):
+        """Issue a get request without reusing connections."""
+        response = requests.get(
+            self._build_url(server, path),
+            params=query,
+            headers=self._build_basic_headers(apikey),
+            timeout=self._timeout
+        )
+        return response.status_code, response.text
+
+    def post(  #pylint: disable=too-many-arguments,unused-argument
+            self,
+            server,
+            path,
+            apikey,
+            body,
+            query=None,
+            extra_headers=None,
+            compress=False
+    ):
+        """Issue a post request without reusing connections or compressing the body."""
+        response = requests.post(
+            self._build_url(server, path),
+            json=body,
+            params=query,
+            headers=self._build_basic_headers(apikey),
+            timeout=self._timeout
+        )
+        return response.status_code, response.text
+
+
+def _run(name, client, server):
+    """Measure a client against the stand-in server."""
+    server.connections = 0
+
+    start = time.time()
+    for _ in range(_REQUESTS):
+        client.get('sdk', '/splitChanges', 'some_api_key', {'since': -1})
+    poll_latency = (time.time() - start) / _REQUESTS
+
+    pool = ThreadPoolExecutor(_CONCURRENT_FETCHES)
+    start = time.time()
+    for _ in range(_REQUESTS // _CONCURRENT_FETCHES):
+        list(pool.map(
+            lambda index: client.get('sdk', '/segmentChanges/segment%d' % index, 'some_api_key'),
+            range(_CONCURRENT_FETCHES)
+        ))
+    fetch_latency = (time.time() - start) / (_REQUESTS // _CONCURRENT_FETCHES)
+    pool.shutdown()
+
+    impressions = [{
+        'testName': 'feature%d' % (index % 50),
+        'keyImpressions': [{
+            'keyName': 'user%d' % index, 'treatment': 'on', 'time': 1560000000000 + index,
+            'changeNumber': 123, 'label': 'default rule', 'bucketingKey': None
+        }]
+    } for index in range(5000)]
+    client.post('events', '/testImpressions/bulk', 'some_api_key', impressions, compress=True)
+
+    print('%s: %d connections for %d requests, %.2f ms per split poll, '
+          '%.2f ms per %d concurrent segment fetches, %d KB impressions bulk' % (
+              name, server.connections, 2 * _REQUESTS + 1, poll_latency * 1000,
+              fetch_latency * 1000, _CONCURRENT_FETCHES, server.last_body_size // 1024
+          ))
+
+
+def main():
+    """Run the benchmark."""
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d' % server.server_address[1]
+
+    _run('module-level requests', _UnpooledHttpClient(1500, url, url), server)
+    _run('pooled session', HttpClient(1500, url, url, compression=True), server)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
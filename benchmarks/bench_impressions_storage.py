@@ -0,0 +1,91 @@
+"""
+Impressions storage benchmark.
+
+Measures impressions stored per second from many producer threads while a consumer pops them
+in bulk, comparing a queue.Queue based storage (as used before) with the deque backed one.
+
+Usage: python benchmarks/bench_impressions_storage.py (with the sdk installed)
+"""
+from __future__ import print_function
+
+import threading
+import time
+
+from six.moves import queue
+
+from splitio.models.impressions import Impression
+from splitio.storage.inmemmory import InMemoryImpressionStorage
+
+
+class QueueImpressionStorage(object):
+    """Impressions storage backed by a queue.Queue guarded by an extra lock."""
+
+    def __init__(self, queue_size):
+        """Constructor."""
+        self._impressions = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+
+    def put(self, impressions):
+        """Put impressions in storage."""
+        try:
+            with self._lock:
+                for impression in impressions:
+                    self._impressions.put(impression, False)
+            return True
+        except queue.Full:
+            return False
+
+    def pop_many(self, count):
+        """Pop the oldest impressions from storage."""
+        impressions = []
+        with self._lock:
+            while not self._impressions.empty() and count > 0:
+                impressions.append(self._impressions.get(False))
+                count -= 1
+        return impressions
+
+
+def _run(storage, producers, duration):
+    """Produce impressions from many threads while consuming them, return stored per second."""
+    stop = threading.Event()
+    counts = [0] * producers
+    popped = [0]
+    impression = Impression('key', 'feature', 'on', 'label', 123, None, 456)
+
+    def _produce(index):
+        count = 0
+        while not stop.is_set():
+            for _ in range(100):
+                if storage.put([impression]):
+                    count += 1
+        counts[index] = count
+
+    def _consume():
+        while not stop.is_set():
+            popped[0] += len(storage.pop_many(5000))
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=_produce, args=(i,)) for i in range(producers)]
+    workers.append(threading.Thread(target=_consume))
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.time() - start)
+
+
+def main():
+    """Run the benchmark."""
+    for producers in [1, 4, 16]:
+        old = _run(QueueImpressionStorage(10000000), producers, 2)
+        new = _run(InMemoryImpressionStorage(10000000), producers, 2)
+        print('%d producers: queue %.0f impressions/s, deque %.0f impressions/s (%.1fx)' % (
+            producers, old, new, new / old
+        ))
+
+
+if __name__ == '__main__':
+    main()
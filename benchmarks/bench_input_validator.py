@@ -0,0 +1,53 @@
+"""
+Input validation benchmark.
+
+Compares the cost of validating the arguments of a `get_treatment` call when the operation
+name is passed explicitly against recovering it by inspecting the stack, as was done before.
+
+Usage: python benchmarks/bench_input_validator.py (with the sdk installed)
+"""
+from __future__ import print_function
+
+import inspect
+import timeit
+
+from splitio.client import input_validator
+
+
+def _inspect_operation():
+    """Recover the name of the method called by the user by walking the stack (old behavior)."""
+    calls = [
+        inspect.getframeinfo(frame[0]).function
+        for frame in inspect.stack()
+        if 'self' in frame[0].f_locals
+        and frame[0].f_locals['self'].__class__.__name__ in ['Client', 'SplitManager']
+    ]
+    return calls[-1] if calls else 'unknown-method'
+
+
+class Client(object):  #pylint: disable=too-few-public-methods
+    """Stand-in for the sdk client, so that the stack looks like a user call."""
+
+    def get_treatment(self, key, feature, attributes, inspect_stack):
+        """Validate the arguments of a get_treatment call."""
+        operations = [_inspect_operation() for _ in range(3)] if inspect_stack \
+            else ['get_treatment'] * 3
+        input_validator.validate_key(key, operations[0])
+        input_validator.validate_feature_name(feature, operations[1])
+        input_validator.validate_attributes(attributes, operations[2])
+
+
+def main():
+    """Run the benchmark."""
+    client = Client()
+    number = 2000
+    for name, inspect_stack in [('stack inspection', True), ('explicit operation', False)]:
+        elapsed = min(timeit.repeat(
+            lambda: client.get_treatment('some_key', 'some_feature', {'age': 30}, inspect_stack),  #pylint: disable=cell-var-from-loop
+            number=number, repeat=3
+        ))
+        print('%s: %.2f us per call' % (name, elapsed / number * 1000000))
+
+
+if __name__ == '__main__':
+    main()
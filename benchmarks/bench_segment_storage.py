@@ -0,0 +1,104 @@
+"""
+Segment storage benchmark.
+
+Compares the in-memory segment storage with & without its key to segments reverse index:
+memory used by the storage and get_treatments throughput for splits with several IN_SEGMENT
+conditions.
+
+Usage: python benchmarks/bench_segment_storage.py (with the sdk installed)
+"""
+from __future__ import print_function
+
+import random
+import timeit
+import tracemalloc
+
+from splitio.engine.evaluator import Evaluator
+from splitio.engine.splitters import Splitter
+from splitio.models import splits
+from splitio.models.segments import Segment
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
+
+
+_SEGMENTS = 20
+_SEGMENT_SIZE = 20000
+_FEATURES = 10
+_SEGMENTS_PER_FEATURE = 8
+
+
+def _segment_condition(segment_name):
+    """Build a raw condition matching the keys in a segment."""
+    return {
+        'conditionType': 'ROLLOUT',
+        'label': 'in segment %s' % segment_name,
+        'matcherGroup': {
+            'combiner': 'AND',
+            'matchers': [{
+                'matcherType': 'IN_SEGMENT',
+                'negate': False,
+                'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+            }]
+        },
+        'partitions': [{'treatment': 'on', 'size': 50}, {'treatment': 'off', 'size': 50}]
+    }
+
+
+def _build_split(name, segment_names):
+    """Build a split with an IN_SEGMENT condition per segment."""
+    return splits.from_raw({
+        'changeNumber': 123,
+        'trafficTypeName': 'user',
+        'name': name,
+        'trafficAllocation': 100,
+        'trafficAllocationSeed': 123456,
+        'seed': 321654,
+        'status': 'ACTIVE',
+        'killed': False,
+        'defaultTreatment': 'off',
+        'algo': 2,
+        'conditions': [_segment_condition(segment_name) for segment_name in segment_names]
+    })
+
+
+def _build_segment_storage(reverse_index, segment_keys):
+    """Build a segment storage, returning it along with the memory allocated for it."""
+    tracemalloc.start()
+    storage = InMemorySegmentStorage(reverse_index)
+    for index, keys in enumerate(segment_keys):
+        storage.put(Segment('segment%d' % index, keys, 1))
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return storage, used
+
+
+def main():
+    """Run the benchmark."""
+    rand = random.Random(1234)
+    population = ['user%d' % index for index in range(_SEGMENT_SIZE * 5)]
+    segment_keys = [rand.sample(population, _SEGMENT_SIZE) for _ in range(_SEGMENTS)]
+
+    split_storage = InMemorySplitStorage()
+    for index in range(_FEATURES):
+        segment_names = rand.sample(['segment%d' % i for i in range(_SEGMENTS)],
+                                    _SEGMENTS_PER_FEATURE)
+        split_storage.put(_build_split('feature%d' % index, segment_names))
+    features = split_storage.get_split_names()
+    keys = rand.sample(population, 1000)
+
+    results = {}
+    for name, reverse_index in [('no index', False), ('reverse index', True)]:
+        segment_storage, used = _build_segment_storage(reverse_index, segment_keys)
+        evaluator = Evaluator(split_storage, segment_storage, Splitter())
+        results[name] = [evaluator.evaluate_treatments(features, key, None) for key in keys]
+        elapsed = min(timeit.repeat(
+            lambda: [evaluator.evaluate_treatments(features, key, None) for key in keys],  #pylint: disable=cell-var-from-loop
+            number=1, repeat=5
+        ))
+        print('%s: %.1f MB, %.1f us per get_treatments of %d features' % (
+            name, used / 1024.0 / 1024.0, elapsed / len(keys) * 1e6, len(features)
+        ))
+    assert results['no index'] == results['reverse index']
+
+
+if __name__ == '__main__':
+    main()
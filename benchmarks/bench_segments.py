@@ -0,0 +1,61 @@
+"""
+Segment representation benchmark.
+
+Compares the memory used by a large segment and the latency of lookups & update pages when
+keys are kept in a set against the compact, packed representation.
+
+Usage: python benchmarks/bench_segments.py (with the sdk installed)
+"""
+from __future__ import print_function
+
+import random
+import timeit
+import tracemalloc
+
+from splitio.models.segments import Segment, CompactSegment
+
+
+_SEGMENT_SIZE = 1000000
+
+
+def _random_keys(seed, count):
+    """Build a list of random uuid-like keys."""
+    rand = random.Random(seed)
+    return ['%032x' % rand.getrandbits(128) for _ in range(count)]
+
+
+def _build(segment_class):
+    """Build a segment, returning it along with the memory it holds on to."""
+    tracemalloc.start()
+    # Keys are built while tracing, as they'd be when parsing segment changes, so that memory
+    # held by the segment includes the key strings it keeps alive.
+    segment = segment_class('some_segment', _random_keys(1, _SEGMENT_SIZE), 1)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segment, used
+
+
+def main():
+    """Run the benchmark."""
+    keys = _random_keys(1, _SEGMENT_SIZE)
+    lookups = keys[::1000] + _random_keys(2, 1000)
+    page = (_random_keys(3, 500), keys[:500])
+
+    for name, segment_class in [('set', Segment), ('compact', CompactSegment)]:
+        segment, used = _build(segment_class)
+        assert sum(segment.contains(key) for key in lookups) == len(keys[::1000])
+        lookup = min(timeit.repeat(
+            lambda: [segment.contains(key) for key in lookups],  #pylint: disable=cell-var-from-loop
+            number=10, repeat=3
+        )) / (10 * len(lookups))
+        update = min(timeit.repeat(
+            lambda: segment.update(*page),  #pylint: disable=cell-var-from-loop
+            number=1, repeat=3
+        ))
+        print('%s: %.1f MB for %d keys, %.2f us per lookup, %.2f ms per update page' % (
+            name, used / 1024.0 / 1024.0, len(keys), lookup * 1e6, update * 1e3
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Split storage contention benchmark.
+
+Measures split reads per second from many threads while splits are being updated, comparing
+a storage guarded by a lock on every read against the in-memory storage's lock-free snapshots.
+
+Usage: python benchmarks/bench_split_storage.py (with the sdk installed)
+"""
+from __future__ import print_function
+
+import threading
+import time
+
+from splitio.models import splits
+from splitio.storage.inmemmory import InMemorySplitStorage
+
+
+class LockedSplitStorage(object):
+    """Split storage taking a lock on every read & write, as the in-memory storage used to."""
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.RLock()
+        self._splits = {}
+
+    def get(self, split_name):
+        """Retrieve a split."""
+        with self._lock:
+            return self._splits.get(split_name)
+
+    def put(self, split):
+        """Store a split."""
+        with self._lock:
+            self._splits[split.name] = split
+
+
+def _build_split(index):
+    """Build a split named after an index."""
+    return splits.from_raw({
+        'changeNumber': index,
+        'trafficTypeName': 'user',
+        'name': 'split%d' % (index % 100),
+        'trafficAllocation': 100,
+        'trafficAllocationSeed': 123456,
+        'seed': 321654,
+        'status': 'ACTIVE',
+        'killed': False,
+        'defaultTreatment': 'off',
+        'algo': 2,
+        'conditions': []
+    })
+
+
+def _run(storage, threads, duration):
+    """Read splits from many threads while a writer updates them, return reads per second."""
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def _read(index):
+        names = ['split%d' % i for i in range(100)]
+        count = 0
+        while not stop.is_set():
+            for name in names:
+                storage.get(name)
+            count += len(names)
+        counts[index] = count
+
+    def _write():
+        index = 0
+        while not stop.is_set():
+            storage.put(_build_split(index))
+            index += 1
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=_read, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=_write))
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.time() - start)
+
+
+def main():
+    """Run the benchmark."""
+    for threads in [1, 8, 64]:
+        results = []
+        for storage_class in [LockedSplitStorage, InMemorySplitStorage]:
+            storage = storage_class()
+            for index in range(100):
+                storage.put(_build_split(index))
+            results.append(_run(storage, threads, 2))
+        print('%d threads: locked %.0f reads/s, snapshots %.0f reads/s (%.1fx)' % (
+            threads, results[0], results[1], results[1] / results[0]
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -36,7 +36,8 @@ setup(name='splitio_client',
           'test': tests_require,
           'redis': ['redis>=2.10.5'],
           'uwsgi': ['uwsgi>=2.0.0'],
-          'cpphash': ['mmh3cffi>=0.1.4']
+          'cpphash': ['mmh3cffi>=0.1.4'],
+          'numpy': ['numpy>=1.9.0']
       },
       setup_requires=['pytest-runner'],
       classifiers=[
@@ -2,9 +2,13 @@
 from __future__ import division
 
 from collections import namedtuple
+import gzip
+import io
+import json
 
 from future.utils import raise_from
 import requests
+from requests.adapters import HTTPAdapter
 
 HttpResponse = namedtuple('HttpResponse', ['status_code', 'body'])
 
@@ -28,22 +32,42 @@ class HttpClient(object):
     SDK_URL = 'https://sdk.split.io/api'
     EVENTS_URL = 'https://events.split.io/api'
 
-    def __init__(self, timeout=None, sdk_url=None, events_url=None):
+    def __init__(  #pylint: disable=too-many-arguments
+            self,
+            timeout=None,
+            sdk_url=None,
+            events_url=None,
+            pool_size=20,
+            compression=False
+    ):
         """
         Class constructor.
 
+        Requests are issued through a session shared by all the threads using the client, so
+        connections to each server are pooled & kept alive between requests.
+
         :param timeout: How many milliseconds to wait until the server responds.
         :type timeout: int
         :param sdk_url: Optional alternative sdk URL.
         :type sdk_url: str
         :param events_url: Optional alternative events URL.
         :type events_url: str
+        :param pool_size: Maximum number of connections kept alive per server.
+        :type pool_size: int
+        :param compression: Whether to gzip the body of POST requests that ask for it. Off by
+            default, since not every proxy in front of the servers accepts gzipped bodies.
+        :type compression: bool
         """
         self._timeout = timeout / 1000  if timeout else None  # Convert ms to seconds.
         self._urls = {
             'sdk': sdk_url if sdk_url is not None else self.SDK_URL,
             'events': events_url if events_url is not None else self.EVENTS_URL,
         }
+        self._compression = compression
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self._urls), pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
 
     def _build_url(self, server, path):
         """
@@ -69,9 +93,26 @@ class HttpClient(object):
         """
         return {
             'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip',
             'Authorization': "Bearer %s" % apikey
         }
 
+    @staticmethod
+    def _compress(body):
+        """
+        Serialize a body as JSON & gzip it.
+
+        :param body: Body to send.
+        :type body: object
+
+        :return: Compressed body.
+        :rtype: bytes
+        """
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as gzip_file:
+            gzip_file.write(json.dumps(body).encode('utf-8'))
+        return buf.getvalue()
+
     def get(self, server, path, apikey, query=None, extra_headers=None):  #pylint: disable=too-many-arguments
         """
         Issue a get request.
@@ -96,7 +137,7 @@ class HttpClient(object):
             headers.update(extra_headers)
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 self._build_url(server, path),
                 params=query,
                 headers=headers,
@@ -106,7 +147,16 @@ class HttpClient(object):
         except Exception as exc:  #pylint: disable=broad-except
             raise_from(HttpClientException('requests library is throwing exceptions'), exc)
 
-    def post(self, server, path, apikey, body, query=None, extra_headers=None):  #pylint: disable=too-many-arguments
+    def post(  #pylint: disable=too-many-arguments
+            self,
+            server,
+            path,
+            apikey,
+            body,
+            query=None,
+            extra_headers=None,
+            compress=False
+    ):
         """
         Issue a POST request.
 
@@ -122,6 +172,8 @@ class HttpClient(object):
         :type query: dict
         :param extra_headers: key/value pairs of possible extra headers.
         :type extra_headers: dict
+        :param compress: Whether to gzip the body, if compression is enabled.
+        :type compress: bool
 
         :return: Tuple of status_code & response text
         :rtype: HttpResponse
@@ -132,13 +184,27 @@ class HttpClient(object):
             headers.update(extra_headers)
 
         try:
-            response = requests.post(
-                self._build_url(server, path),
-                json=body,
-                params=query,
-                headers=headers,
-                timeout=self._timeout
-            )
+            if compress and self._compression:
+                headers['Content-Encoding'] = 'gzip'
+                response = self._session.post(
+                    self._build_url(server, path),
+                    data=self._compress(body),
+                    params=query,
+                    headers=headers,
+                    timeout=self._timeout
+                )
+            else:
+                response = self._session.post(
+                    self._build_url(server, path),
+                    json=body,
+                    params=query,
+                    headers=headers,
+                    timeout=self._timeout
+                )
             return HttpResponse(response.status_code, response.text)
         except Exception as exc:  #pylint: disable=broad-except
             raise_from(HttpClientException('requests library is throwing exceptions'), exc)
+
+    def close(self):
+        """Close the pooled connections."""
+        self._session.close()
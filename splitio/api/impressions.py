@@ -72,7 +72,8 @@ class ImpressionsAPI(object): # pylint: disable=too-few-public-methods
                 '/testImpressions/bulk',
                 self._apikey,
                 body=bulk,
-                extra_headers=self._metadata
+                extra_headers=self._metadata,
+                compress=True
             )
             if not 200 <= response.status_code < 300:
                 raise APIException(response.body, response.status_code)
@@ -80,3 +81,44 @@ class ImpressionsAPI(object): # pylint: disable=too-few-public-methods
             self._logger.error('Http client is throwing exceptions')
             self._logger.debug('Error: ', exc_info=True)
             raise_from(APIException('Impressions not flushed properly.'), exc)
+
+    @staticmethod
+    def _build_counters(counts):
+        """
+        Build an impression counts bulk formatted as the API expects it.
+
+        :param counts: Impression counts per feature & hour.
+        :type counts: list(splitio.engine.impressions.CountPerFeature)
+
+        :return: Dictionary with the list of counts.
+        :rtype: dict
+        """
+        return {
+            'pf': [
+                {'f': count.feature, 'm': count.timeframe, 'rc': count.count}
+                for count in counts
+            ]
+        }
+
+    def flush_counters(self, counts):
+        """
+        Send impression counts to the backend.
+
+        :param counts: Impression counts per feature & hour.
+        :type counts: list(splitio.engine.impressions.CountPerFeature)
+        """
+        bulk = self._build_counters(counts)
+        try:
+            response = self._client.post(
+                'events',
+                '/testImpressions/count',
+                self._apikey,
+                body=bulk,
+                extra_headers=self._metadata
+            )
+            if not 200 <= response.status_code < 300:
+                raise APIException(response.body, response.status_code)
+        except HttpClientException as exc:
+            self._logger.error('Http client is throwing exceptions')
+            self._logger.debug('Error: ', exc_info=True)
+            raise_from(APIException('Impression counts not flushed properly.'), exc)
@@ -7,6 +7,7 @@ import time
 import six
 from splitio.engine.evaluator import Evaluator, CONTROL
 from splitio.engine.splitters import Splitter
+from splitio.engine.impressions import ImpressionsManager
 from splitio.models.impressions import Impression, Label
 from splitio.models.events import Event
 from splitio.models.telemetry import get_latency_bucket_index
@@ -19,8 +20,18 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
 
     _METRIC_GET_TREATMENT = 'sdk.getTreatment'
     _METRIC_GET_TREATMENTS = 'sdk.getTreatments'
+    _METRIC_GET_TREATMENTS_FOR_KEYS = 'sdk.getTreatmentsForKeys'
+    _BULK_EVALUATION_SIZE = 1000
 
-    def __init__(self, factory, labels_enabled=True, impression_listener=None):
+    def __init__(  #pylint: disable=too-many-arguments
+            self,
+            factory,
+            labels_enabled=True,
+            impression_listener=None,
+            splitter=None,
+            evaluation_cache=None,
+            impressions_manager=None
+    ):
         """
         Construct a Client instance.
 
@@ -33,6 +44,15 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
         :param impression_listener: impression listener implementation
         :type impression_listener: ImpressionListener
 
+        :param splitter: Splitter shared among the factory's clients
+        :type splitter: splitio.engine.splitters.Splitter
+
+        :param evaluation_cache: Evaluation result cache shared among the factory's clients
+        :type evaluation_cache: splitio.engine.cache.EvaluationCache
+
+        :param impressions_manager: Impressions manager shared among the factory's clients
+        :type impressions_manager: splitio.engine.impressions.ImpressionsManager
+
         :rtype: Client
         """
         self._logger = logging.getLogger(self.__class__.__name__)
@@ -40,13 +60,20 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
         self._labels_enabled = labels_enabled
         self._impression_listener = impression_listener
 
-        self._splitter = Splitter()
+        self._splitter = splitter if splitter is not None else Splitter()
+        self._impressions_manager = impressions_manager if impressions_manager is not None \
+            else ImpressionsManager()
         self._split_storage = factory._get_storage('splits')  #pylint: disable=protected-access
         self._segment_storage = factory._get_storage('segments')  #pylint: disable=protected-access
         self._impressions_storage = factory._get_storage('impressions')  #pylint: disable=protected-access
         self._events_storage = factory._get_storage('events')  #pylint: disable=protected-access
         self._telemetry_storage = factory._get_storage('telemetry')  #pylint: disable=protected-access
-        self._evaluator = Evaluator(self._split_storage, self._segment_storage, self._splitter)
+        self._evaluator = Evaluator(
+            self._split_storage,
+            self._segment_storage,
+            self._splitter,
+            evaluation_cache
+        )
 
     def destroy(self):
         """
@@ -85,19 +112,18 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
                 )
                 self._logger.debug('Error', exc_info=True)
 
-    def get_treatment_with_config(self, key, feature, attributes=None):
+    def _get_treatment(self, key, feature, attributes, operation):
         """
         Get the treatment and config for a feature and key, with optional dictionary of attributes.
 
-        This method never raises an exception. If there's a problem, the appropriate log message
-        will be generated and the method will return the CONTROL treatment.
-
         :param key: The key for which to get the treatment
         :type key: str
         :param feature: The name of the feature for which to get the treatment
         :type feature: str
         :param attributes: An optional dictionary of attributes
         :type attributes: dict
+        :param operation: Name of the method called by the user, used in log messages.
+        :type operation: str
         :return: The treatment for the key and feature
         :rtype: tuple(str, str)
         """
@@ -108,12 +134,12 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
 
             start = int(round(time.time() * 1000))
 
-            matching_key, bucketing_key = input_validator.validate_key(key)
-            feature = input_validator.validate_feature_name(feature)
+            matching_key, bucketing_key = input_validator.validate_key(key, operation)
+            feature = input_validator.validate_feature_name(feature, operation)
 
             if (matching_key is None and bucketing_key is None) \
                     or feature is None \
-                    or not input_validator.validate_attributes(attributes):
+                    or not input_validator.validate_attributes(attributes, operation):
                 return CONTROL, None
 
             result = self._evaluator.evaluate_treatment(
@@ -156,6 +182,24 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
                 self._logger.debug('Error: ', exc_info=True)
             return CONTROL, None
 
+    def get_treatment_with_config(self, key, feature, attributes=None):
+        """
+        Get the treatment and config for a feature and key, with optional dictionary of attributes.
+
+        This method never raises an exception. If there's a problem, the appropriate log message
+        will be generated and the method will return the CONTROL treatment.
+
+        :param key: The key for which to get the treatment
+        :type key: str
+        :param feature: The name of the feature for which to get the treatment
+        :type feature: str
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+        :return: The treatment for the key and feature
+        :rtype: tuple(str, str)
+        """
+        return self._get_treatment(key, feature, attributes, 'get_treatment_with_config')
+
     def get_treatment(self, key, feature, attributes=None):
         """
         Get the treatment for a feature and key, with an optional dictionary of attributes.
@@ -172,71 +216,69 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
         :return: The treatment for the key and feature
         :rtype: str
         """
-        treatment, _ = self.get_treatment_with_config(key, feature, attributes)
+        treatment, _ = self._get_treatment(key, feature, attributes, 'get_treatment')
         return treatment
 
-    def get_treatments_with_config(self, key, features, attributes=None):
+    def _get_treatments(self, key, features, attributes, operation):
         """
         Evaluate multiple features and return a dict with feature -> (treatment, config).
 
-        Get the treatments for a list of features considering a key, with an optional dictionary of
-        attributes. This method never raises an exception. If there's a problem, the appropriate
-        log message will be generated and the method will return the CONTROL treatment.
         :param key: The key for which to get the treatment
         :type key: str
         :param features: Array of the names of the features for which to get the treatment
         :type feature: list
         :param attributes: An optional dictionary of attributes
         :type attributes: dict
+        :param operation: Name of the method called by the user, used in log messages.
+        :type operation: str
         :return: Dictionary with the result of all the features provided
         :rtype: dict
         """
         if self.destroyed:
             self._logger.error("Client has already been destroyed - no calls possible")
-            return input_validator.generate_control_treatments(features)
+            return input_validator.generate_control_treatments(features, operation)
 
         start = int(round(time.time() * 1000))
 
-        matching_key, bucketing_key = input_validator.validate_key(key)
+        matching_key, bucketing_key = input_validator.validate_key(key, operation)
         if matching_key is None and bucketing_key is None:
-            return input_validator.generate_control_treatments(features)
+            return input_validator.generate_control_treatments(features, operation)
 
-        if input_validator.validate_attributes(attributes) is False:
-            return input_validator.generate_control_treatments(features)
+        if input_validator.validate_attributes(attributes, operation) is False:
+            return input_validator.generate_control_treatments(features, operation)
 
-        features = input_validator.validate_features_get_treatments(features)
+        features = input_validator.validate_features_get_treatments(features, operation)
         if features is None:
             return {}
 
+        try:
+            evaluations = self._evaluator.evaluate_treatments(
+                features,
+                matching_key,
+                bucketing_key,
+                attributes
+            )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('get_treatments: An exception occured when evaluating '
+                               'features ' + ', '.join(features) + ' returning CONTROL.')
+            self._logger.debug('Error: ', exc_info=True)
+            return {feature: (CONTROL, None) for feature in features}
+
         bulk_impressions = []
         treatments = {}
 
         for feature in features:
-            try:
-                treatment = self._evaluator.evaluate_treatment(
-                    feature,
-                    matching_key,
-                    bucketing_key,
-                    attributes
-                )
-
-                impression = self._build_impression(matching_key,
-                                                    feature,
-                                                    treatment['treatment'],
-                                                    treatment['impression']['label'],
-                                                    treatment['impression']['change_number'],
-                                                    bucketing_key,
-                                                    start)
-
-                bulk_impressions.append(impression)
-                treatments[feature] = (treatment['treatment'], treatment['configurations'])
-
-            except Exception:  #pylint: disable=broad-except
-                self._logger.error('get_treatments: An exception occured when evaluating '
-                                   'feature ' + feature + ' returning CONTROL.')
-                treatments[feature] = CONTROL, None
-                self._logger.debug('Error: ', exc_info=True)
-                continue
+            treatment = evaluations[feature]
+            impression = self._build_impression(matching_key,
+                                                feature,
+                                                treatment['treatment'],
+                                                treatment['impression']['label'],
+                                                treatment['impression']['change_number'],
+                                                bucketing_key,
+                                                start)
+
+            bulk_impressions.append(impression)
+            treatments[feature] = (treatment['treatment'], treatment['configurations'])
 
         # Register impressions
         try:
@@ -251,6 +293,23 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
 
         return treatments
 
+    def get_treatments_with_config(self, key, features, attributes=None):
+        """
+        Evaluate multiple features and return a dict with feature -> (treatment, config).
+
+        Get the treatments for a list of features considering a key, with an optional dictionary of
+        attributes. This method never raises an exception. If there's a problem, the appropriate
+        log message will be generated and the method will return the CONTROL treatment.
+        :param key: The key for which to get the treatment
+        :type key: str
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+        :return: Dictionary with the result of all the features provided
+        :rtype: dict
+        """
+        return self._get_treatments(key, features, attributes, 'get_treatments_with_config')
 
     def get_treatments(self, key, features, attributes=None):
         """
@@ -268,9 +327,190 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
         :return: Dictionary with the result of all the features provided
         :rtype: dict
         """
-        with_config = self.get_treatments_with_config(key, features, attributes)
+        with_config = self._get_treatments(key, features, attributes, 'get_treatments')
         return {feature: result[0] for (feature, result) in six.iteritems(with_config)}
 
+    def get_treatments_with_config_for_keys(self, keys, features, attributes=None):
+        """
+        Evaluate a few features for many keys, yielding results as they're computed.
+
+        Intended for offline/bulk workloads: features & attributes are validated once, splits
+        are fetched once for the whole stream, segment memberships are resolved in batches and
+        impressions are stored in bulk. Invalid keys are logged and skipped. This method never
+        raises an exception. If a feature can't be evaluated, CONTROL is returned for it.
+
+        Latencies are reported under their own `sdk.getTreatmentsForKeys` metric, with one
+        sample per batch of stored impressions measuring the time spent evaluating that batch
+        (time spent by the caller between results is excluded), so that bulk workloads don't
+        skew the `sdk.getTreatments` latencies.
+
+        :param keys: Iterable of keys for which to get the treatments
+        :type keys: iterable
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :param attributes: An optional dictionary of attributes, shared by all keys
+        :type attributes: dict
+        :return: Generator of (matching_key, {feature: (treatment, config)}) tuples
+        :rtype: generator
+        """
+        return self._get_treatments_for_keys(
+            keys,
+            features,
+            attributes,
+            'get_treatments_with_config_for_keys'
+        )
+
+    def _get_treatments_for_keys(self, keys, features, attributes, operation):
+        """
+        Evaluate a few features for many keys, yielding results as they're computed.
+
+        :param keys: Iterable of keys for which to get the treatments
+        :type keys: iterable
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :param attributes: An optional dictionary of attributes, shared by all keys
+        :type attributes: dict
+        :param operation: Name of the method called by the user, used in log messages.
+        :type operation: str
+        :return: Generator of (matching_key, {feature: (treatment, config)}) tuples
+        :rtype: generator
+        """
+        if self.destroyed:
+            self._logger.error("Client has already been destroyed - no calls possible")
+            return
+
+        if input_validator.validate_attributes(attributes, operation) is False:
+            return
+
+        features = input_validator.validate_features_get_treatments(features, operation)
+        if not features:
+            return
+
+        def _valid_keys():
+            for key in keys:
+                matching_key, bucketing_key = input_validator.validate_key(key, operation)
+                if matching_key is not None or bucketing_key is not None:
+                    yield matching_key, bucketing_key
+
+        evaluations = self._evaluator.evaluate_treatments_for_keys(
+            features,
+            _valid_keys(),
+            attributes,
+            self._BULK_EVALUATION_SIZE
+        )
+        bulk_impressions = []
+        start = int(round(time.time() * 1000))
+        elapsed = 0
+        try:
+            while True:
+                before = int(round(time.time() * 1000))
+                try:
+                    matching_key, bucketing_key, results = next(evaluations)
+                except StopIteration:
+                    break
+                elapsed += int(round(time.time() * 1000)) - before
+
+                for feature, result in six.iteritems(results):
+                    bulk_impressions.append(self._build_impression(
+                        matching_key,
+                        feature,
+                        result['treatment'],
+                        result['impression']['label'],
+                        result['impression']['change_number'],
+                        bucketing_key,
+                        start
+                    ))
+
+                yield matching_key, {
+                    feature: (result['treatment'], result['configurations'])
+                    for feature, result in six.iteritems(results)
+                }
+
+                if len(bulk_impressions) >= self._BULK_EVALUATION_SIZE:
+                    self._record_bulk_stats(bulk_impressions, elapsed, attributes)
+                    bulk_impressions = []
+                    start = int(round(time.time() * 1000))
+                    elapsed = 0
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('get_treatments_for_keys: An exception occured when evaluating '
+                               'features. Stopping.')
+            self._logger.debug('Error: ', exc_info=True)
+        finally:
+            if bulk_impressions:
+                self._record_bulk_stats(bulk_impressions, elapsed, attributes)
+
+    def get_treatments_for_keys(self, keys, features, attributes=None):
+        """
+        Evaluate a few features for many keys, yielding results as they're computed.
+
+        See `get_treatments_with_config_for_keys` for details.
+
+        :param keys: Iterable of keys for which to get the treatments
+        :type keys: iterable
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :param attributes: An optional dictionary of attributes, shared by all keys
+        :type attributes: dict
+        :return: Generator of (matching_key, {feature: treatment}) tuples
+        :rtype: generator
+        """
+        with_config = self._get_treatments_for_keys(
+            keys,
+            features,
+            attributes,
+            'get_treatments_for_keys'
+        )
+        for key, results in with_config:
+            yield key, {feature: result[0] for (feature, result) in six.iteritems(results)}
+
+    def scoped(self, key, attributes=None):
+        """
+        Return a scope to evaluate many features for the same key & attributes.
+
+        Key & attributes are validated once, and evaluations in the scope share an evaluation
+        context, so splits, segment memberships & results are fetched or computed only once.
+        Impressions are stored in bulk when the scope is closed. Meant to be used for the
+        duration of a single unit of work (ie: a request)::
+
+            with client.scoped(user_id, attributes) as scope:
+                scope.get_treatment('some_feature')
+                scope.get_treatments(['some_other_feature', 'yet_another_feature'])
+
+        :param key: The key for which to get the treatments
+        :type key: str
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+        :return: Client scope
+        :rtype: ClientScope
+        """
+        return ClientScope(self, key, attributes)
+
+    def _record_bulk_stats(self, impressions, elapsed, attributes):
+        """
+        Record a batch of impressions generated by a multi-key evaluation, and its latency.
+
+        :param impressions: Generated impressions
+        :type impressions: list
+
+        :param elapsed: milliseconds spent evaluating the batch
+        :type elapsed: int
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+        """
+        self._store_impressions(impressions)
+        self._record_latency(
+            int(round(time.time() * 1000)) - elapsed,
+            self._METRIC_GET_TREATMENTS_FOR_KEYS
+        )
+        try:
+            for impression in impressions:
+                self._send_impression_to_listener(impression, attributes)
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('get_treatments_for_keys: An exception when trying to store '
+                               'impressions.')
+            self._logger.debug('Error: ', exc_info=True)
+
     def _build_impression(  #pylint: disable=too-many-arguments
             self,
             matching_key,
@@ -304,15 +544,41 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
         :param operation: operation performed.
         :type operation: str
         """
+        if operation == self._METRIC_GET_TREATMENT:
+            impressions = [impressions]
+        self._store_impressions(impressions)
+        self._record_latency(start, operation)
+
+    def _store_impressions(self, impressions):
+        """
+        Store impressions, deduping or counting them as configured.
+
+        :param impressions: Generated impressions
+        :type impressions: list
+        """
         try:
-            end = int(round(time.time() * 1000))
-            if operation == self._METRIC_GET_TREATMENT:
-                self._impressions_storage.put([impressions])
-            else:
+            impressions = self._impressions_manager.process_impressions(impressions)
+            if impressions:
                 self._impressions_storage.put(impressions)
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('Error recording impressions')
+            self._logger.debug('Error: ', exc_info=True)
+
+    def _record_latency(self, start, operation):
+        """
+        Record the latency of an operation.
+
+        :param start: timestamp when the operation was called
+        :type start: int
+
+        :param operation: operation performed.
+        :type operation: str
+        """
+        try:
+            end = int(round(time.time() * 1000))
             self._telemetry_storage.inc_latency(operation, get_latency_bucket_index(end - start))
         except Exception:  #pylint: disable=broad-except
-            self._logger.error('Error recording impressions and metrics')
+            self._logger.error('Error recording metrics')
             self._logger.debug('Error: ', exc_info=True)
 
     def track(self, key, traffic_type, event_type, value=None):
@@ -351,3 +617,235 @@ class Client(object):  #pylint: disable=too-many-instance-attributes
             timestamp=int(time.time()*1000)
         )
         return self._events_storage.put([event])
+
+
+class ClientScope(object):  #pylint: disable=too-many-instance-attributes
+    """Evaluates features for a single key & set of attributes. Built with `Client.scoped`."""
+
+    _OPERATION = 'scoped'
+
+    def __init__(self, client, key, attributes):
+        """
+        Construct a scope, validating key & attributes.
+
+        :param client: Client the scope belongs to.
+        :type client: Client
+        :param key: The key for which to get the treatments
+        :type key: str
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+        """
+        self._client = client
+        self._logger = client._logger  #pylint: disable=protected-access
+        self._evaluator = client._evaluator  #pylint: disable=protected-access
+        self._impressions = []
+        self._closed = False
+        self._matching_key = None
+        self._bucketing_key = None
+        self._attributes = None
+        self._context = None
+
+        if client.destroyed:
+            self._logger.error("Client has already been destroyed - no calls possible")
+            return
+
+        matching_key, bucketing_key = input_validator.validate_key(key, self._OPERATION)
+        if (matching_key is None and bucketing_key is None) \
+                or not input_validator.validate_attributes(attributes, self._OPERATION):
+            return
+
+        self._matching_key = matching_key
+        self._bucketing_key = bucketing_key
+        self._attributes = dict(attributes) if attributes is not None else None
+        self._context = self._evaluator.build_context(matching_key, bucketing_key)
+
+    def __enter__(self):
+        """Return the scope itself."""
+        return self
+
+    def __exit__(self, *_):
+        """Close the scope."""
+        self.close()
+
+    @property
+    def valid(self):
+        """Return whether key & attributes are valid. Evaluations return CONTROL otherwise."""
+        return self._context is not None
+
+    def _add_impression(self, feature, result, start):
+        """
+        Build & keep the impression for an evaluation.
+
+        :param feature: Evaluated feature.
+        :type feature: str
+        :param result: Evaluation result.
+        :type result: dict
+        :param start: timestamp when the evaluation was requested
+        :type start: int
+        """
+        self._impressions.append(self._client._build_impression(  #pylint: disable=protected-access
+            self._matching_key,
+            feature,
+            result['treatment'],
+            result['impression']['label'],
+            result['impression']['change_number'],
+            self._bucketing_key,
+            start
+        ))
+
+    def _get_treatment(self, feature, operation):
+        """
+        Get the treatment and config for a feature.
+
+        :param feature: The name of the feature for which to get the treatment
+        :type feature: str
+        :param operation: Name of the method called by the user, used in log messages.
+        :type operation: str
+        :return: The treatment for the key and feature
+        :rtype: tuple(str, str)
+        """
+        start = int(round(time.time() * 1000))
+        if self._closed or not self.valid:
+            return CONTROL, None
+
+        feature = input_validator.validate_feature_name(feature, operation)
+        if feature is None:
+            return CONTROL, None
+
+        try:
+            result = self._evaluator.evaluate_treatment(
+                feature,
+                self._matching_key,
+                self._bucketing_key,
+                self._attributes,
+                self._context
+            )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('Error getting treatment for feature')
+            self._logger.debug('Error: ', exc_info=True)
+            result = {
+                'treatment': CONTROL,
+                'configurations': None,
+                'impression': {'label': Label.EXCEPTION, 'change_number': -1}
+            }
+
+        self._add_impression(feature, result, start)
+        self._client._record_latency(  #pylint: disable=protected-access
+            start,
+            Client._METRIC_GET_TREATMENT  #pylint: disable=protected-access
+        )
+        return result['treatment'], result['configurations']
+
+    def get_treatment_with_config(self, feature):
+        """
+        Get the treatment and config for a feature.
+
+        :param feature: The name of the feature for which to get the treatment
+        :type feature: str
+        :return: The treatment for the key and feature
+        :rtype: tuple(str, str)
+        """
+        return self._get_treatment(feature, 'get_treatment_with_config')
+
+    def get_treatment(self, feature):
+        """
+        Get the treatment for a feature.
+
+        :param feature: The name of the feature for which to get the treatment
+        :type feature: str
+        :return: The treatment for the key and feature
+        :rtype: str
+        """
+        treatment, _ = self._get_treatment(feature, 'get_treatment')
+        return treatment
+
+    def _get_treatments(self, features, operation):
+        """
+        Evaluate multiple features and return a dict with feature -> (treatment, config).
+
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :param operation: Name of the method called by the user, used in log messages.
+        :type operation: str
+        :return: Dictionary with the result of all the features provided
+        :rtype: dict
+        """
+        start = int(round(time.time() * 1000))
+        if self._closed or not self.valid:
+            return input_validator.generate_control_treatments(features, operation)
+
+        features = input_validator.validate_features_get_treatments(features, operation)
+        if features is None:
+            return {}
+
+        try:
+            evaluations = self._evaluator.evaluate_treatments(
+                features,
+                self._matching_key,
+                self._bucketing_key,
+                self._attributes,
+                self._context
+            )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('%s: An exception occured when evaluating features %s returning '
+                               'CONTROL.', operation, ', '.join(features))
+            self._logger.debug('Error: ', exc_info=True)
+            return {feature: (CONTROL, None) for feature in features}
+
+        for feature in features:
+            self._add_impression(feature, evaluations[feature], start)
+        self._client._record_latency(  #pylint: disable=protected-access
+            start,
+            Client._METRIC_GET_TREATMENTS  #pylint: disable=protected-access
+        )
+        return {
+            feature: (result['treatment'], result['configurations'])
+            for feature, result in six.iteritems(evaluations)
+        }
+
+    def get_treatments_with_config(self, features):
+        """
+        Evaluate multiple features and return a dict with feature -> (treatment, config).
+
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :return: Dictionary with the result of all the features provided
+        :rtype: dict
+        """
+        return self._get_treatments(features, 'get_treatments_with_config')
+
+    def get_treatments(self, features):
+        """
+        Evaluate multiple features and return a dictionary with all the feature/treatments.
+
+        :param features: Array of the names of the features for which to get the treatment
+        :type feature: list
+        :return: Dictionary with the result of all the features provided
+        :rtype: dict
+        """
+        with_config = self._get_treatments(features, 'get_treatments')
+        return {feature: result[0] for (feature, result) in six.iteritems(with_config)}
+
+    def close(self):
+        """
+        Store the impressions generated in the scope. Further evaluations return CONTROL.
+
+        Latencies are recorded by each evaluation call, not for the lifetime of the scope.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if not self._impressions:
+            return
+
+        try:
+            self._client._store_impressions(self._impressions)  #pylint: disable=protected-access
+            for impression in self._impressions:
+                self._client._send_impression_to_listener(  #pylint: disable=protected-access
+                    impression,
+                    self._attributes
+                )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('scoped: An exception when trying to store impressions.')
+            self._logger.debug('Error: ', exc_info=True)
+        self._impressions = []
@@ -4,6 +4,8 @@ import os.path
 
 DEFAULT_CONFIG = {
     'connectionTimeout': 1500,
+    'connectionPoolSize': 20,
+    'httpCompression': False,
     'splitSdkMachineName': None,
     'splitSdkMachineIp': None,
     'featuresRefreshRate': 5,
@@ -12,11 +14,29 @@ DEFAULT_CONFIG = {
     'impressionsRefreshRate': 10,
     'impressionsBulkSize': 5000,
     'impressionsQueueSize': 10000,
+    'impressionsOverflowPolicy': 'drop_newest',
+    'impressionsHighWaterMark': None,
+    'impressionsMode': 'DEBUG',
+    'impressionsObserverSize': 500000,
+    'impressionsCountsRefreshRate': 60,
     'eventsPushRate': 10,
     'eventsBulkSize': 5000,
     'eventsQueueSize': 10000,
+    'eventsOverflowPolicy': 'drop_newest',
+    'eventsHighWaterMark': None,
+    'queueBlockTimeout': 1,
     'labelsEnabled': True,
+    'bucketCacheSize': 0,
+    'evaluationCacheSize': 0,
+    'evaluationCacheTTL': 60,
+    'segmentReverseIndex': False,
+    'compactSegmentSize': 0,
+    'segmentStorageDirectory': None,
     'impressionListener': None,
+    'impressionListenerAsync': False,
+    'impressionListenerQueueSize': 10000,
+    'impressionListenerBatchSize': 100,
+    'impressionListenerStopTimeout': 5,
     'redisHost': 'localhost',
     'redisPort': 6379,
     'redisDb': 0,
@@ -39,6 +59,10 @@ DEFAULT_CONFIG = {
     'redisSslCertReqs': None,
     'redisSslCaCerts': None,
     'redisMaxConnections': None,
+    'redisSplitCacheInterval': 0,
+    'redisImpressionsQueueSize': 0,
+    'redisImpressionsFlushInterval': 1,
+    'redisTelemetryFlushInterval': 0,
     'machineName': None,
     'machineIp': None,
     'splitFile': os.path.join(os.path.expanduser('~'), '.split')
@@ -9,15 +9,19 @@ from enum import Enum
 import six
 
 from splitio.client.client import Client
+from splitio.engine.cache import EvaluationCache
+from splitio.engine.impressions import ImpressionsManager, ImpressionsMode
+from splitio.engine.splitters import Splitter
 from splitio.client import input_validator
 from splitio.client.manager import SplitManager
 from splitio.client.config import DEFAULT_CONFIG
 from splitio.client import util
-from splitio.client.listener import ImpressionListenerWrapper
+from splitio.client.listener import ImpressionListenerWrapper, AsyncImpressionListenerWrapper
 
 #Storage
 from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
     InMemoryImpressionStorage, InMemoryEventStorage, InMemoryTelemetryStorage
+from splitio.storage.mmapped import MMapSegmentStorage
 from splitio.storage.adapters import redis
 from splitio.storage.redis import RedisSplitStorage, RedisSegmentStorage, RedisImpressionsStorage, \
     RedisEventsStorage, RedisTelemetryStorage
@@ -36,9 +40,10 @@ from splitio.api.telemetry import TelemetryAPI
 # Tasks
 from splitio.tasks.split_sync import SplitSynchronizationTask
 from splitio.tasks.segment_sync import SegmentSynchronizationTask
-from splitio.tasks.impressions_sync import ImpressionsSyncTask
+from splitio.tasks.impressions_sync import ImpressionsSyncTask, ImpressionsCountSyncTask
 from splitio.tasks.events_sync import EventsSyncTask
 from splitio.tasks.telemetry_sync import TelemetrySynchronizationTask
+from splitio.tasks.storage_flush import StorageFlushTask
 
 # Localhost stuff
 from splitio.client.localhost import LocalhostEventsStorage, LocalhostImpressionsStorage, \
@@ -69,7 +74,11 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
             apis=None,
             tasks=None,
             sdk_ready_flag=None,
-            impression_listener=None
+            impression_listener=None,
+            bucket_cache_size=0,
+            evaluation_cache=None,
+            impressions_manager=None,
+            http_client=None
     ):
         """
         Class constructor.
@@ -86,6 +95,14 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
         :type sdk_ready_flag: threading.Event
         :param impression_listener: User custom listener to handle impressions locally.
         :type impression_listener: splitio.client.listener.ImpressionListener
+        :param bucket_cache_size: Number of key buckets to memoize. 0 disables the cache.
+        :type bucket_cache_size: int
+        :param evaluation_cache: Optional cache of evaluation results shared by the clients.
+        :type evaluation_cache: splitio.engine.cache.EvaluationCache
+        :param impressions_manager: Impressions manager shared by the clients.
+        :type impressions_manager: splitio.engine.impressions.ImpressionsManager
+        :param http_client: HTTP client used by the apis, closed when the factory is destroyed.
+        :type http_client: splitio.api.client.HttpClient
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._storages = storages
@@ -94,6 +111,11 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
         self._tasks = tasks if tasks else {}
         self._sdk_ready_flag = sdk_ready_flag
         self._impression_listener = impression_listener
+        self._splitter = Splitter(bucket_cache_size)
+        self._evaluation_cache = evaluation_cache
+        self._impressions_manager = impressions_manager if impressions_manager is not None \
+            else ImpressionsManager()
+        self._http_client = http_client
 
         # If we have a ready flag, it means we have sync tasks that need to finish
         # before the SDK client becomes ready.
@@ -123,6 +145,28 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
         """
         return self._storages[name]
 
+    @property
+    def splitter(self):
+        """
+        Return the splitter shared by the clients of this factory.
+
+        Its `cache_hits` & `cache_misses` properties report the bucket cache usage.
+
+        :rtype: splitio.engine.splitters.Splitter
+        """
+        return self._splitter
+
+    @property
+    def evaluation_cache(self):
+        """
+        Return the evaluation result cache shared by the clients of this factory, if any.
+
+        Its `hits` & `misses` properties report the cache usage.
+
+        :rtype: splitio.engine.cache.EvaluationCache
+        """
+        return self._evaluation_cache
+
     def client(self):
         """
         Return a new client.
@@ -130,7 +174,14 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
         This client is only a set of references to structures hold by the factory.
         Creating one a fast operation and safe to be used anywhere.
         """
-        return Client(self, self._labels_enabled, self._impression_listener)
+        return Client(
+            self,
+            self._labels_enabled,
+            self._impression_listener,
+            self._splitter,
+            self._evaluation_cache,
+            self._impressions_manager
+        )
 
     def manager(self):
         """
@@ -169,7 +220,9 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
         Destroy the factory and render clients unusable.
 
         Destroy frees up storage taken but split data, flushes impressions & events,
-        and invalidates the clients, making them return control.
+        and invalidates the clients, making them return control. Impressions queued for an
+        asynchronous impression listener are dispatched for up to
+        `impressionListenerStopTimeout` seconds.
 
         :param destroyed_event: Event to signal when destroy process has finished.
         :type destroyed_event: threading.Event
@@ -179,6 +232,7 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
             return
 
         try:
+            self._impressions_manager.flush_counts()
             if destroyed_event is not None:
                 stop_events = {name: threading.Event() for name in self._tasks.keys()}
                 for name, task in six.iteritems(self._tasks):
@@ -187,6 +241,10 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
                 def _wait_for_tasks_to_stop():
                     for event in stop_events.values():
                         event.wait()
+                    if self._impression_listener is not None:
+                        self._impression_listener.stop()
+                    if self._http_client is not None:
+                        self._http_client.close()
                     destroyed_event.set()
 
                 wait_thread = threading.Thread(target=_wait_for_tasks_to_stop)
@@ -195,6 +253,10 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
             else:
                 for task in self._tasks.values():
                     task.stop()
+                if self._impression_listener is not None:
+                    self._impression_listener.stop()
+                if self._http_client is not None:
+                    self._http_client.close()
         finally:
             self._status = Status.DESTROYED
 
@@ -209,18 +271,46 @@ class SplitFactory(object):  #pylint: disable=too-many-instance-attributes
         return self._status == Status.DESTROYED
 
 
-def _wrap_impression_listener(listener, metadata):
+def _wrap_impression_listener(cfg, metadata):
     """
     Wrap the impression listener if any.
 
-    :param listener: User supplied impression listener or None
-    :type listener: splitio.client.listener.ImpressionListener | None
+    :param cfg: Factory configuration, including defaults.
+    :type cfg: dict
     :param metadata: SDK Metadata
     :type metadata: splitio.client.util.SdkMetadata
     """
-    if listener is not None:
-        return ImpressionListenerWrapper(listener, metadata)
-    return None
+    listener = cfg['impressionListener']
+    if listener is None:
+        return None
+    if cfg['impressionListenerAsync']:
+        return AsyncImpressionListenerWrapper(
+            listener,
+            metadata,
+            cfg['impressionListenerQueueSize'],
+            cfg['impressionListenerBatchSize'],
+            stop_timeout=cfg['impressionListenerStopTimeout']
+        )
+    return ImpressionListenerWrapper(listener, metadata)
+
+
+def _build_impressions_manager(storage, cfg):
+    """
+    Build the impressions manager for the configured impressions mode.
+
+    :param storage: Impressions storage.
+    :type storage: splitio.storage.ImpressionStorage
+    :param cfg: Factory configuration, including defaults.
+    :type cfg: dict
+
+    :rtype: splitio.engine.impressions.ImpressionsManager
+    """
+    return ImpressionsManager(
+        storage,
+        cfg['impressionsMode'],
+        cfg['impressionsObserverSize'],
+        cfg['impressionsCountsRefreshRate']
+    )
 
 
 def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #pylint: disable=too-many-locals
@@ -233,7 +323,9 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
     http_client = HttpClient(
         sdk_url=sdk_url,
         events_url=events_url,
-        timeout=cfg.get('connectionTimeout')
+        timeout=cfg.get('connectionTimeout'),
+        pool_size=cfg['connectionPoolSize'],
+        compression=cfg['httpCompression']
     )
 
     sdk_metadata = util.get_metadata(config)
@@ -248,11 +340,32 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
     if not input_validator.validate_apikey_type(apis['segments']):
         return None
 
+    segment_writer = True
+    if cfg['segmentStorageDirectory'] is not None:
+        segment_storage = MMapSegmentStorage(cfg['segmentStorageDirectory'])
+        # Processes sharing the directory only read the segments synchronized by the writer.
+        segment_writer = segment_storage.acquire_writer_lock()
+    else:
+        segment_storage = InMemorySegmentStorage(
+            cfg['segmentReverseIndex'],
+            cfg['compactSegmentSize']
+        )
+
     storages = {
         'splits': InMemorySplitStorage(),
-        'segments': InMemorySegmentStorage(),
-        'impressions': InMemoryImpressionStorage(cfg['impressionsQueueSize']),
-        'events': InMemoryEventStorage(cfg['eventsQueueSize']),
+        'segments': segment_storage,
+        'impressions': InMemoryImpressionStorage(
+            cfg['impressionsQueueSize'],
+            cfg['impressionsOverflowPolicy'],
+            cfg['queueBlockTimeout'],
+            cfg['impressionsHighWaterMark']
+        ),
+        'events': InMemoryEventStorage(
+            cfg['eventsQueueSize'],
+            cfg['eventsOverflowPolicy'],
+            cfg['queueBlockTimeout'],
+            cfg['eventsHighWaterMark']
+        ),
         'telemetry': InMemoryTelemetryStorage()
     }
 
@@ -269,14 +382,6 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
             splits_ready_flag
         ),
 
-        'segments': SegmentSynchronizationTask(
-            apis['segments'],
-            storages['segments'],
-            storages['splits'],
-            cfg['segmentsRefreshRate'],
-            segments_ready_flag
-        ),
-
         'impressions': ImpressionsSyncTask(
             apis['impressions'],
             storages['impressions'],
@@ -298,6 +403,27 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
         )
     }
 
+    if segment_writer:
+        tasks['segments'] = SegmentSynchronizationTask(
+            apis['segments'],
+            storages['segments'],
+            storages['splits'],
+            cfg['segmentsRefreshRate'],
+            segments_ready_flag
+        )
+
+    impressions_manager = _build_impressions_manager(storages['impressions'], cfg)
+    if impressions_manager.mode == ImpressionsMode.OPTIMIZED:
+        tasks['impressions_count'] = ImpressionsCountSyncTask(
+            impressions_manager,
+            cfg['impressionsCountsRefreshRate']
+        )
+        tasks['impressions_count'].start()
+
+    # Flush impressions & events as soon as their queues reach the high water mark
+    storages['impressions'].set_queue_full_hook(tasks['impressions'].flush)
+    storages['events'].set_queue_full_hook(tasks['events'].flush)
+
     # Start tasks that have no dependencies
     tasks['splits'].start()
     tasks['impressions'].start()
@@ -307,7 +433,10 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
     def split_ready_task():
         """Wait for splits to be ready and start fetching segments."""
         splits_ready_flag.wait()
-        tasks['segments'].start()
+        if 'segments' in tasks:
+            tasks['segments'].start()
+        else:
+            segments_ready_flag.set()
 
     def segment_ready_task():
         """Wait for segments to be ready and set the main ready flag."""
@@ -326,7 +455,16 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
         apis,
         tasks,
         sdk_ready_flag,
-        impression_listener=_wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+        impression_listener=_wrap_impression_listener(cfg, sdk_metadata),
+        bucket_cache_size=cfg['bucketCacheSize'],
+        evaluation_cache=EvaluationCache(
+            storages['splits'],
+            storages['segments'],
+            cfg['evaluationCacheSize'],
+            cfg['evaluationCacheTTL']
+        ) if cfg['evaluationCacheSize'] > 0 else None,
+        impressions_manager=impressions_manager,
+        http_client=http_client
     )
 
 
@@ -337,16 +475,50 @@ def _build_redis_factory(config):
     sdk_metadata = util.get_metadata(config)
     redis_adapter = redis.build(config)
     storages = {
-        'splits': RedisSplitStorage(redis_adapter),
+        'splits': RedisSplitStorage(redis_adapter, cfg['redisSplitCacheInterval']),
         'segments': RedisSegmentStorage(redis_adapter),
-        'impressions': RedisImpressionsStorage(redis_adapter, sdk_metadata),
+        'impressions': RedisImpressionsStorage(
+            redis_adapter,
+            sdk_metadata,
+            cfg['redisImpressionsQueueSize'],
+            cfg['impressionsBulkSize']
+        ),
         'events': RedisEventsStorage(redis_adapter, sdk_metadata),
-        'telemetry': RedisTelemetryStorage(redis_adapter, sdk_metadata)
+        'telemetry': RedisTelemetryStorage(
+            redis_adapter,
+            sdk_metadata,
+            cfg['redisTelemetryFlushInterval'] > 0
+        )
     }
+
+    tasks = {}
+    if cfg['redisImpressionsQueueSize'] > 0:
+        tasks['impressions'] = StorageFlushTask(
+            storages['impressions'],
+            cfg['redisImpressionsFlushInterval']
+        )
+        storages['impressions'].set_queue_full_hook(tasks['impressions'].flush)
+    if cfg['redisTelemetryFlushInterval'] > 0:
+        tasks['telemetry'] = StorageFlushTask(
+            storages['telemetry'],
+            cfg['redisTelemetryFlushInterval']
+        )
+    impressions_manager = _build_impressions_manager(storages['impressions'], cfg)
+    if impressions_manager.mode == ImpressionsMode.OPTIMIZED:
+        tasks['impressions_count'] = ImpressionsCountSyncTask(
+            impressions_manager,
+            cfg['impressionsCountsRefreshRate']
+        )
+    for task in tasks.values():
+        task.start()
+
     return SplitFactory(
         storages,
         cfg['labelsEnabled'],
-        impression_listener=_wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+        tasks=tasks,
+        impression_listener=_wrap_impression_listener(cfg, sdk_metadata),
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_manager=impressions_manager
     )
 
 
@@ -366,7 +538,9 @@ def _build_uwsgi_factory(config):
     return SplitFactory(
         storages,
         cfg['labelsEnabled'],
-        impression_listener=_wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+        impression_listener=_wrap_impression_listener(cfg, sdk_metadata),
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_manager=_build_impressions_manager(storages['impressions'], cfg)
     )
 
 
@@ -11,7 +11,6 @@ import six
 
 from splitio.api import APIException
 from splitio.client.key import Key
-from splitio.client.util import get_calls
 from splitio.engine.evaluator import CONTROL
 
 
@@ -20,22 +19,6 @@ MAX_LENGTH = 250
 EVENT_TYPE_PATTERN = r'^[a-zA-Z0-9][-_.:a-zA-Z0-9]{0,79}$'
 
 
-def _get_first_split_sdk_call():
-    """
-    Get the method name of the original call on the SplitClient methods.
-
-    :return: Name of the method called by the user.
-    :rtype: str
-    """
-    unknown_method = 'unknown-method'
-    try:
-        calls = get_calls(['Client', 'SplitManager'])
-        if calls:
-            return calls[-1]
-        return unknown_method
-    except Exception:  #pylint: disable=broad-except
-        return unknown_method
-
 def _check_not_null(value, name, operation):
     """
     Check if value is null.
@@ -215,7 +198,7 @@ def _remove_empty_spaces(value, operation):
     return strip_value
 
 
-def validate_key(key):
+def validate_key(key, operation):
     """
     Validate Key parameter for get_treatment/s.
 
@@ -228,7 +211,6 @@ def validate_key(key):
     :return: The tuple key
     :rtype: (matching_key,bucketing_key)
     """
-    operation = _get_first_split_sdk_call()
     matching_key_result = None
     bucketing_key_result = None
     if key is None:
@@ -252,16 +234,17 @@ def validate_key(key):
     return matching_key_result, bucketing_key_result
 
 
-def validate_feature_name(feature_name):
+def validate_feature_name(feature_name, operation):
     """
     Check if feature_name is valid for get_treatment.
 
     :param feature_name: feature_name to be checked
     :type feature_name: str
+    :param operation: user operation
+    :type operation: str
     :return: feature_name
     :rtype: str|None
     """
-    operation = _get_first_split_sdk_call()
     if (not _check_not_null(feature_name, 'feature_name', operation)) or \
        (not _check_is_string(feature_name, 'feature_name', operation)) or \
        (not _check_string_not_empty(feature_name, 'feature_name', operation)):
@@ -358,16 +341,17 @@ def validate_manager_feature_name(feature_name):
     return feature_name
 
 
-def validate_features_get_treatments(features):  #pylint: disable=invalid-name
+def validate_features_get_treatments(features, operation):  #pylint: disable=invalid-name
     """
     Check if features is valid for get_treatments.
 
     :param features: array of features
     :type features: list
+    :param operation: user operation
+    :type operation: str
     :return: filtered_features
     :rtype: list|None
     """
-    operation = _get_first_split_sdk_call()
     if features is None or not isinstance(features, list):
         _LOGGER.error("%s: feature_names must be a non-empty array.", operation)
         return None
@@ -386,19 +370,24 @@ def validate_features_get_treatments(features):  #pylint: disable=invalid-name
     return filtered_features
 
 
-def generate_control_treatments(features):
+def generate_control_treatments(features, operation):
     """
     Generate valid features to control.
 
     :param features: array of features
     :type features: list
+    :param operation: user operation
+    :type operation: str
     :return: dict
     :rtype: dict|None
     """
-    return {feature: (CONTROL, None) for feature in validate_features_get_treatments(features)}
+    return {
+        feature: (CONTROL, None)
+        for feature in validate_features_get_treatments(features, operation)
+    }
 
 
-def validate_attributes(attributes):
+def validate_attributes(attributes, operation):
     """
     Check if attributes is valid.
 
@@ -409,7 +398,6 @@ def validate_attributes(attributes):
     :return: bool
     :rtype: True|False
     """
-    operation = _get_first_split_sdk_call()
     if attributes is None:
         return True
     if not isinstance(attributes, dict):
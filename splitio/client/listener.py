@@ -1,10 +1,14 @@
 """Impression listener module."""
 
 import abc
+import logging
+import threading
 
 from six import add_metaclass
 from future.utils import raise_from
 
+from splitio.storage.inmemmory import BoundedQueue
+
 
 class ImpressionListenerException(Exception):
     """Custom Exception for Impression Listener."""
@@ -43,19 +47,199 @@ class ImpressionListenerWrapper(object):  #pylint: disable=too-few-public-method
         :param attributes: User provided attributes when calling get_treatment(s)
         :type attributes: dict
         """
-        data = {}
-        data['impression'] = impression
-        data['attributes'] = attributes
-        data['sdk-language-version'] = self._metadata.sdk_version
-        data['instance-id'] = self._metadata.instance_name
+        data = self._build_data(impression, attributes)
         try:
-            self.impression_listener.log_impression(data)
+            if isinstance(self.impression_listener, BatchImpressionListener):
+                self.impression_listener.log_impressions([data])
+            else:
+                self.impression_listener.log_impression(data)
         except Exception as exc:  #pylint: disable=broad-except
             raise_from(
                 ImpressionListenerException('Error in log_impression user\'s method is throwing exceptions'),
                 exc
             )
 
+    def _build_data(self, impression, attributes):
+        """
+        Build the data handed to the user-provided listener.
+
+        :param impression: Imression data
+        :type impression: dict
+        :param attributes: User provided attributes when calling get_treatment(s)
+        :type attributes: dict
+
+        :rtype: dict
+        """
+        return {
+            'impression': impression,
+            'attributes': attributes,
+            'sdk-language-version': self._metadata.sdk_version,
+            'instance-id': self._metadata.instance_name
+        }
+
+    def stop(self, timeout=None):  #pylint: disable=unused-argument
+        """
+        Stop dispatching impressions. Nothing to do when dispatching synchronously.
+
+        :param timeout: Maximum number of seconds to wait for pending impressions.
+        :type timeout: float
+        """
+        pass
+
+
+class AsyncImpressionListenerWrapper(ImpressionListenerWrapper):
+    """
+    Impression listener wrapper that dispatches impressions from a background thread.
+
+    Impressions are queued by the evaluating thread and handed to the user-provided listener
+    in batches, whenever `batch_size` impressions are queued or every `flush_interval` seconds.
+    Impressions that don't fit in the queue are discarded and counted.
+    """
+
+    def __init__(  #pylint: disable=too-many-arguments
+            self,
+            impression_listener,
+            sdk_metadata,
+            queue_size=10000,
+            batch_size=100,
+            flush_interval=1,
+            stop_timeout=5
+    ):
+        """
+        Class Constructor.
+
+        :param impression_listener: User provided impression listener.
+        :type impression_listener: ImpressionListener | BatchImpressionListener
+        :param sdk_metadata: SDK version, instance name & IP
+        :type sdk_metadata: splitio.client.util.SdkMetadata
+        :param queue_size: Maximum number of impressions waiting to be dispatched.
+        :type queue_size: int
+        :param batch_size: Maximum number of impressions handed to the listener at once.
+        :type batch_size: int
+        :param flush_interval: Maximum number of seconds impressions wait to be dispatched.
+        :type flush_interval: float
+        :param stop_timeout: Default number of seconds `stop` waits for queued impressions.
+        :type stop_timeout: float
+        """
+        ImpressionListenerWrapper.__init__(self, impression_listener, sdk_metadata)
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._queue = BoundedQueue(queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._stop_timeout = stop_timeout
+        self._wake_up = threading.Event()
+        self._stopped = False
+        self._dispatched = 0
+        self._failed = 0
+        self._worker = threading.Thread(target=self._run)
+        self._worker.setDaemon(True)
+        self._worker.start()
+
+    def log_impression(self, impression, attributes=None):
+        """
+        Queue an impression to be sent to the user-provided listener.
+
+        :param impression: Imression data
+        :type impression: dict
+        :param attributes: User provided attributes when calling get_treatment(s)
+        :type attributes: dict
+        """
+        if self._stopped:
+            return
+        self._queue.put_many([self._build_data(impression, attributes)])
+        if len(self._queue) >= self._batch_size:
+            self._wake_up.set()
+
+    def _dispatch(self, batch):
+        """
+        Hand a batch of impressions to the user-provided listener.
+
+        :param batch: Impression data.
+        :type batch: list(dict)
+        """
+        if isinstance(self.impression_listener, BatchImpressionListener):
+            try:
+                self.impression_listener.log_impressions(batch)
+                self._dispatched += len(batch)
+            except Exception:  #pylint: disable=broad-except
+                self._failed += len(batch)
+                self._log_failure()
+            return
+
+        for data in batch:
+            try:
+                self.impression_listener.log_impression(data)
+                self._dispatched += 1
+            except Exception:  #pylint: disable=broad-except
+                self._failed += 1
+                self._log_failure()
+
+    def _log_failure(self):
+        """Log an exception raised by the user-provided listener."""
+        self._logger.error(
+            'An exception was raised while calling user-custom impression listener'
+        )
+        self._logger.debug('Error', exc_info=True)
+
+    def _flush(self):
+        """Dispatch every queued impression."""
+        batch = self._queue.pop_many(self._batch_size)
+        while batch:
+            self._dispatch(batch)
+            batch = self._queue.pop_many(self._batch_size)
+
+    def _run(self):
+        """Dispatch queued impressions until stopped."""
+        while not self._stopped:
+            self._wake_up.wait(self._flush_interval)
+            self._wake_up.clear()
+            self._flush()
+        self._flush()
+
+    def stop(self, timeout=None):
+        """
+        Stop the worker, after dispatching the queued impressions.
+
+        Impressions still queued when the timeout expires are logged as lost, since the
+        worker thread won't keep the process alive to dispatch them.
+
+        :param timeout: Maximum number of seconds to wait for queued impressions to be
+            dispatched. Defaults to the `stop_timeout` supplied when building the wrapper.
+        :type timeout: float
+        """
+        self._stopped = True
+        self._wake_up.set()
+        self._worker.join(timeout if timeout is not None else self._stop_timeout)
+        if self._worker.is_alive():
+            self._logger.warning(
+                'Impression listener did not finish dispatching impressions in time. '
+                '%d queued impressions may be lost.',
+                len(self._queue)
+            )
+        if self.dropped:
+            self._logger.warning(
+                '%d impressions were discarded because the impression listener queue was '
+                'full. Consider increasing parameter `impressionListenerQueueSize` in '
+                'configuration.',
+                self.dropped
+            )
+
+    @property
+    def dispatched(self):
+        """Return the number of impressions handed to the listener."""
+        return self._dispatched
+
+    @property
+    def dropped(self):
+        """Return the number of impressions discarded because the queue was full."""
+        return self._queue.dropped
+
+    @property
+    def failed(self):
+        """Return the number of impressions whose dispatch raised an exception."""
+        return self._failed
+
+
 @add_metaclass(abc.ABCMeta)  #pylint: disable=too-few-public-methods
 class ImpressionListener(object):
     """Impression listener interface."""
@@ -69,3 +253,18 @@ class ImpressionListener(object):
         :type data: dict
         """
         pass
+
+
+@add_metaclass(abc.ABCMeta)  #pylint: disable=too-few-public-methods
+class BatchImpressionListener(object):
+    """Impression listener interface receiving many impressions at once."""
+
+    @abc.abstractmethod
+    def log_impressions(self, data):
+        """
+        Accept impressions generated after evaluations for custom user handling.
+
+        :param data: Impression data, each one in a dictionary format.
+        :type data: list(dict)
+        """
+        pass
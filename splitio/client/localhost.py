@@ -30,6 +30,14 @@ class LocalhostImpressionsStorage(ImpressionStorage):
         """Accept any arguments and do nothing."""
         pass
 
+    def put_counts(self, *_, **__):  #pylint: disable=arguments-differ
+        """Accept any arguments and do nothing."""
+        pass
+
+    def pop_counts(self, *_, **__):  #pylint: disable=arguments-differ
+        """Accept any arguments and return no counts."""
+        return []
+
 
 class LocalhostEventsStorage(EventStorage):
     """Impression storage that doesn't cache anything."""
@@ -248,11 +256,11 @@ class LocalhostSplitSynchronizationTask(BaseSynchronizationTask):
         else:
             fetched = self._read_splits_from_legacy_file(self._filename)
         to_delete = [name for name in self._storage.get_split_names() if name not in fetched.keys()]
-        for split in fetched.values():
-            self._storage.put(split)
-
-        for split in to_delete:
-            self._storage.remove(split)
+        self._storage.apply_changes(
+            list(fetched.values()),
+            to_delete,
+            self._storage.get_change_number()
+        )
 
     def is_running(self):
         """Return whether the task is running."""
@@ -1,6 +1,5 @@
 """General purpose SDK utilities."""
 
-import inspect
 import socket
 from collections import namedtuple
 from splitio.version import __version__
@@ -44,24 +43,3 @@ def get_metadata(config):
     ip_address = ip_from_config if ip_from_config is not None else _get_ip()
     hostname = machine_from_config if machine_from_config is not None else _get_hostname(ip_address)
     return SdkMetadata(version, hostname, ip_address)
-
-
-def get_calls(classes_filter=None):
-    """
-    Inspect the stack and retrieve an ordered list of caller functions.
-
-    :param class_filter: If not None, only methods from that classes will be returned.
-    :type class: list(str)
-
-    :return: list of callers ordered by most recent first.
-    :rtype: list(tuple(str, str))
-    """
-    try:
-        return [
-            inspect.getframeinfo(frame[0]).function
-            for frame in inspect.stack()
-            if classes_filter is None
-            or 'self' in frame[0].f_locals and frame[0].f_locals['self'].__class__.__name__ in classes_filter  #pylint: disable=line-too-long
-        ]
-    except Exception:  #pylint: disable=broad-except
-        return []
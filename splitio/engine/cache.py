@@ -0,0 +1,156 @@
+"""Evaluation result cache module."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from collections import OrderedDict
+import threading
+import time
+
+import six
+
+
+def _freeze(value):
+    """
+    Build a hashable equivalent of an attribute value.
+
+    Scalars are tagged with their type so that values comparing equal across types
+    (ie: True & 1) don't share cache entries.
+
+    :param value: Attribute value.
+    :type value: object
+
+    :return: Hashable representation of the value.
+    :rtype: object
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in six.iteritems(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value.__class__, value
+
+
+class EvaluationCache(object):
+    """
+    Bounded, thread-safe LRU cache of evaluation results.
+
+    Entries are tied to the versions of the split & segment storages at the time they were
+    computed, and are discarded as soon as either storage applies a change.
+    """
+
+    def __init__(self, split_storage, segment_storage, max_size, ttl=None):
+        """
+        Class constructor.
+
+        :param split_storage: Split storage. Must implement `get_version()`.
+        :type split_storage: splitio.storage.inmemmory.InMemorySplitStorage
+        :param segment_storage: Segment storage. Must implement `get_version()`.
+        :type segment_storage: splitio.storage.inmemmory.InMemorySegmentStorage
+        :param max_size: Maximum number of results to keep.
+        :type max_size: int
+        :param ttl: Seconds a result is kept for. None to keep results until invalidated.
+        :type ttl: int
+        """
+        self._split_storage = split_storage
+        self._segment_storage = segment_storage
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._version = None
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def build_key(feature, matching_key, bucketing_key, attributes):
+        """
+        Build the cache key for an evaluation.
+
+        :param feature: Feature name.
+        :type feature: str
+        :param matching_key: Matching key.
+        :type matching_key: str
+        :param bucketing_key: Bucketing key.
+        :type bucketing_key: str
+        :param attributes: Evaluation attributes.
+        :type attributes: dict
+
+        :return: Cache key, or None if the attributes can't be hashed.
+        :rtype: tuple
+        """
+        try:
+            key = (feature, matching_key, bucketing_key, _freeze(attributes or {}))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get_version(self):
+        """
+        Return the current version of the data results depend on.
+
+        :rtype: tuple
+        """
+        return self._split_storage.get_version(), self._segment_storage.get_version()
+
+    def get(self, cache_key, version):
+        """
+        Return a cached result, marking it as the most recently used.
+
+        :param cache_key: Key built with `build_key`.
+        :type cache_key: tuple
+        :param version: Current version, as returned by `get_version`.
+        :type version: tuple
+
+        :return: Cached result or None if there's no valid one.
+        :rtype: dict
+        """
+        with self._lock:
+            if version != self._version:
+                self._data.clear()
+                self._version = version
+
+            entry = self._data.pop(cache_key, None)
+            if entry is None or (entry[1] is not None and entry[1] < time.time()):
+                self._misses += 1
+                return None
+
+            self._data[cache_key] = entry
+            self._hits += 1
+            return entry[0]
+
+    def put(self, cache_key, version, result):
+        """
+        Store a result computed at a given version.
+
+        Results computed before the latest known change are discarded.
+
+        :param cache_key: Key built with `build_key`.
+        :type cache_key: tuple
+        :param version: Version read before evaluating.
+        :type version: tuple
+        :param result: Evaluation result.
+        :type result: dict
+        """
+        expires_at = time.time() + self._ttl if self._ttl else None
+        with self._lock:
+            if version != self._version:
+                return
+            self._data.pop(cache_key, None)
+            self._data[cache_key] = (result, expires_at)
+            if len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    @property
+    def hits(self):
+        """Return the number of lookups that found a valid result."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Return the number of lookups that didn't find a valid result."""
+        return self._misses
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self._data)
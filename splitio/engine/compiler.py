@@ -0,0 +1,111 @@
+"""
+Split compiler module.
+
+Turns a parsed split into a flat evaluation plan that the evaluator can run without walking
+the condition/matcher object graph on every call.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from collections import namedtuple
+
+from splitio.engine.hashfns import get_hash_fn
+from splitio.models.grammar.condition import ConditionType
+from splitio.models.grammar.matchers import AllKeysMatcher, UserDefinedSegmentMatcher, \
+    DependencyMatcher
+
+
+CompiledCondition = namedtuple(
+    'CompiledCondition',
+    ['matchers', 'bucket_treatments', 'label', 'treatment', 'check_allocation']
+)
+
+EvaluationPlan = namedtuple(
+    'EvaluationPlan',
+    ['conditions', 'seed', 'algo', 'hash_fn', 'traffic_allocation', 'traffic_allocation_seed',
+     'needs_context']
+)
+
+_CONTEXT_MATCHERS = (UserDefinedSegmentMatcher, DependencyMatcher)
+
+
+def _resolve_constant_treatment(bucket_treatments):
+    """
+    Return the treatment a condition yields for every bucket, if there is one.
+
+    :param bucket_treatments: Condition treatment per bucket.
+    :type bucket_treatments: tuple(str)
+
+    :return: The treatment if it doesn't depend on the bucket. None otherwise.
+    :rtype: str
+    """
+    first = bucket_treatments[0]
+    return first if all(treatment == first for treatment in bucket_treatments) else None
+
+
+def _compile_matchers(matchers):
+    """
+    Return the tuple of matcher evaluation functions that need to be run for a condition.
+
+    Non-negated ALL_KEYS matchers are dropped since keys reaching the evaluator are never None.
+
+    :param matchers: Condition matchers.
+    :type matchers: list(splitio.models.grammar.matchers.base.Matcher)
+
+    :return: Evaluation functions.
+    :rtype: tuple(callable)
+    """
+    #pylint: disable=protected-access
+    return tuple(
+        matcher.evaluate for matcher in matchers
+        if not (isinstance(matcher, AllKeysMatcher) and not matcher._negate)
+    )
+
+
+def compile_split(split):
+    """
+    Build the evaluation plan for a split.
+
+    Traffic allocation is attached to the first ROLLOUT condition (only when it's below 100%),
+    conditions with a bucket-independent outcome carry their treatment precomputed, and
+    conditions following one that always matches are discarded since they can't be reached.
+    The hash function of the split is resolved once and kept in the plan.
+
+    :param split: Split to compile.
+    :type split: splitio.models.splits.Split
+
+    :return: Evaluation plan.
+    :rtype: EvaluationPlan
+    """
+    compiled = []
+    needs_context = False
+    roll_out = False
+    for condition in split.conditions:
+        check_allocation = False
+        if not roll_out and condition.condition_type == ConditionType.ROLLOUT:
+            check_allocation = split.traffic_allocation < 100
+            roll_out = True
+
+        needs_context = needs_context or any(
+            isinstance(matcher, _CONTEXT_MATCHERS) for matcher in condition.matchers
+        )
+        matchers = _compile_matchers(condition.matchers)
+        compiled.append(CompiledCondition(
+            matchers,
+            condition.bucket_treatments,
+            condition.label,
+            _resolve_constant_treatment(condition.bucket_treatments),
+            check_allocation
+        ))
+
+        if not matchers:
+            break
+
+    return EvaluationPlan(
+        tuple(compiled),
+        split.seed,
+        split.algo,
+        get_hash_fn(split.algo),
+        split.traffic_allocation,
+        split.traffic_allocation_seed,
+        needs_context
+    )
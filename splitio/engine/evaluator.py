@@ -1,16 +1,13 @@
 """Split evaluator module."""
 import logging
-from splitio.models.grammar.condition import ConditionType
 from splitio.models.impressions import Label
-
-
-CONTROL = 'control'
+from splitio.models.treatments import CONTROL
 
 
 class Evaluator(object):  #pylint: disable=too-few-public-methods
     """Split Evaluator class."""
 
-    def __init__(self, split_storage, segment_storage, splitter):
+    def __init__(self, split_storage, segment_storage, splitter, cache=None):
         """
         Construct a Evaluator instance.
 
@@ -19,14 +16,24 @@ class Evaluator(object):  #pylint: disable=too-few-public-methods
 
         :param split_storage: Storage storage.
         :type split_storage: splitio.storage.SegmentStorage
+
+        :param cache: Optional cache for the results of `evaluate_treatment`.
+        :type cache: splitio.engine.cache.EvaluationCache
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._split_storage = split_storage
         self._segment_storage = segment_storage
         self._splitter = splitter
+        self._cache = cache
 
-    def evaluate_treatment(self, feature, matching_key,
-                           bucketing_key, attributes=None):
+    def evaluate_treatment(  #pylint: disable=too-many-arguments
+            self,
+            feature,
+            matching_key,
+            bucketing_key,
+            attributes=None,
+            context=None
+    ):
         """
         Evaluate the user submitted data against a feature and return the resulting treatment.
 
@@ -42,6 +49,530 @@ class Evaluator(object):  #pylint: disable=too-few-public-methods
         :param attributes: An optional dictionary of attributes
         :type attributes: dict
 
+        :param context: Optional context shared with other evaluations for the same key &
+            attributes, as returned by `build_context`.
+        :type context: dict
+
+        :return: The treatment for the key and split
+        :rtype: object
+        """
+        if context is not None:
+            return self.evaluate_dependency(feature, matching_key, attributes, context)
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache.build_key(feature, matching_key, bucketing_key, attributes)
+
+        if cache_key is None:
+            return self._evaluate_treatment(
+                feature,
+                self._split_storage.get(feature),
+                matching_key,
+                bucketing_key,
+                attributes
+            )
+
+        version = self._cache.get_version()
+        result = self._cache.get(cache_key, version)
+        if result is None:
+            result = self._evaluate_treatment(
+                feature,
+                self._split_storage.get(feature),
+                matching_key,
+                bucketing_key,
+                attributes
+            )
+            self._cache.put(cache_key, version, result)
+        return result
+
+    def evaluate_treatments(  #pylint: disable=too-many-arguments
+            self,
+            features,
+            matching_key,
+            bucketing_key,
+            attributes=None,
+            context=None
+    ):
+        """
+        Evaluate the user submitted data against many features.
+
+        Features are evaluated parents-first and each feature is evaluated at most once,
+        regardless of how many of the other features depend on it.
+
+        :param features: The features for which to get the treatments
+        :type features: list
+
+        :param matching_key: The matching_key for which to get the treatments
+        :type matching_key: str
+
+        :param bucketing_key: The bucketing_key for which to get the treatments
+        :type bucketing_key: str
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :param context: Optional context shared with other evaluations for the same key &
+            attributes, as returned by `build_context`.
+        :type context: dict
+
+        :return: Mapping of features to their evaluation results
+        :rtype: dict
+        """
+        splits = self._get_evaluation_order(features)
+        if context is None:
+            context = self._build_context(matching_key, bucketing_key, splits=splits)
+        else:
+            for feature, split in splits.items():
+                context['splits'].setdefault(feature, split)
+            self._update_memberships(context, splits, matching_key)
+        return self._evaluate_requested(
+            features,
+            splits,
+            matching_key,
+            bucketing_key,
+            attributes,
+            context
+        )
+
+    def evaluate_dependency(self, feature, matching_key, attributes, context):
+        """
+        Evaluate a feature another feature being evaluated depends on.
+
+        Results are memoized in the evaluation context, so that a feature is evaluated only once
+        per key. Circular dependencies evaluate to CONTROL.
+
+        :param feature: The feature for which to get the treatment
+        :type feature:  str
+
+        :param matching_key: The matching_key for which to get the treatment
+        :type matching_key: str
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :param context: Context of the ongoing evaluation
+        :type context: dict
+
+        :return: The treatment for the key and split
+        :rtype: object
+        """
+        splits = context['splits']
+        if feature not in splits:
+            splits[feature] = self._split_storage.get(feature)
+
+        return self._evaluate_treatment(
+            feature,
+            splits[feature],
+            matching_key,
+            context['bucketing_key'],
+            attributes,
+            context
+        )
+
+    def evaluate_treatments_for_keys(self, features, keys, attributes=None, batch_size=1000):
+        """
+        Evaluate a set of features for many keys, yielding results as they're computed.
+
+        Splits are fetched once for the whole stream. Keys are consumed in batches of
+        `batch_size`, and the membership of each batch in every segment referenced by the
+        features is resolved with a single storage call per segment. The buckets of each batch
+        are computed at once for every seed the features use.
+
+        :param features: The features for which to get the treatments
+        :type features: list
+
+        :param keys: Iterable of (matching_key, bucketing_key) tuples
+        :type keys: iterable
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :param batch_size: How many keys to resolve segment memberships for at once.
+        :type batch_size: int
+
+        :return: Generator of (matching_key, bucketing_key, {feature: result}) tuples.
+        :rtype: generator
+        """
+        splits = self._get_evaluation_order(features)
+        segment_names = set(
+            name for split in splits.values() if split is not None
+            for name in split.get_segment_names()
+        )
+
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= batch_size:
+                for result in self._evaluate_batch(features, splits, segment_names, batch,
+                                                   attributes):
+                    yield result
+                batch = []
+
+        for result in self._evaluate_batch(features, splits, segment_names, batch, attributes):
+            yield result
+
+    def _get_evaluation_order(self, features):
+        """
+        Fetch the splits for a set of features and the ones they depend on, parents-first.
+
+        :param features: The features for which to fetch the splits
+        :type features: list
+
+        :return: Ordered mapping of feature names to splits (None if not found).
+        :rtype: collections.OrderedDict
+        """
+        splits, cyclic = self._split_storage.get_evaluation_order(features)
+        if cyclic:
+            self._logger.warning(
+                'Circular dependencies found between features: %s',
+                ', '.join(sorted(cyclic))
+            )
+        return splits
+
+    def build_context(self, matching_key, bucketing_key):
+        """
+        Build a context to be shared by many evaluations for the same key & attributes.
+
+        Fetched splits, evaluation results & segment memberships are memoized in the context, so
+        it must not outlive the unit of work it was built for (ie: a request).
+
+        :param matching_key: The matching_key being evaluated
+        :type matching_key: str
+
+        :param bucketing_key: The bucketing_key being evaluated
+        :type bucketing_key: str
+
+        :return: Evaluation context
+        :rtype: dict
+        """
+        context = self._build_context(matching_key, bucketing_key)
+        context['segment_memberships'] = {}
+        return context
+
+    def _update_memberships(self, context, splits, matching_key):
+        """
+        Resolve at once the memberships a shared context is missing for a set of splits.
+
+        :param context: Evaluation context, as returned by `build_context`.
+        :type context: dict
+
+        :param splits: Mapping of feature names to splits (or None if not found).
+        :type splits: dict
+
+        :param matching_key: The matching_key being evaluated
+        :type matching_key: str
+        """
+        memberships = context['segment_memberships']
+        if memberships is None or context['key_segments'] is not None:
+            return
+        memberships.update(
+            self._prefetch_memberships(splits, matching_key, exclude=memberships) or {}
+        )
+
+    def _build_context(self, matching_key, bucketing_key, segment_memberships=None, splits=None):
+        """
+        Build the context shared by the matchers while evaluating features for a key.
+
+        :param matching_key: The matching_key being evaluated
+        :type matching_key: str
+
+        :param bucketing_key: The bucketing_key being evaluated
+        :type bucketing_key: str
+
+        :param segment_memberships: Optional mapping of segment names to whether the
+            matching key belongs to them. If not supplied, the names of all the segments the
+            key belongs to are fetched from the storage when it keeps a reverse index.
+            Otherwise, the key's membership in every segment referenced by the splits is
+            resolved at once when the storage supports it.
+        :type segment_memberships: dict
+
+        :param splits: Optional mapping of already fetched splits.
+        :type splits: dict
+
+        :return: Evaluation context
+        :rtype: dict
+        """
+        splits = splits if splits is not None else {}
+        key_segments = None
+        if segment_memberships is None:
+            key_segments = self._segment_storage.get_key_segments(matching_key)
+            if key_segments is None:
+                segment_memberships = self._prefetch_memberships(splits, matching_key)
+
+        return {
+            'segment_storage': self._segment_storage,
+            'evaluator': self,
+            'bucketing_key': bucketing_key if bucketing_key is not None else matching_key,
+            'segment_memberships': segment_memberships,
+            'key_segments': key_segments,
+            'evaluations': {},
+            'splits': splits,
+            'buckets': None
+        }
+
+    def _prefetch_memberships(self, splits, matching_key, exclude=None):
+        """
+        Resolve a key's membership in all the segments referenced by a set of splits.
+
+        :param splits: Mapping of feature names to splits (or None if not found).
+        :type splits: dict
+
+        :param matching_key: The matching_key being evaluated
+        :type matching_key: str
+
+        :param exclude: Optional names of the segments already resolved.
+        :type exclude: dict
+
+        :return: Mapping of segment names to whether the key belongs to them, or None if the
+            storage can't resolve many memberships at once.
+        :rtype: dict
+        """
+        segment_names = set(
+            name for split in splits.values() if split is not None
+            for name in split.get_segment_names() if exclude is None or name not in exclude
+        )
+        if not segment_names:
+            return None
+        return self._segment_storage.get_segment_memberships(segment_names, matching_key)
+
+    def _evaluate_batch(  #pylint: disable=too-many-arguments
+            self,
+            features,
+            splits,
+            segment_names,
+            keys,
+            attributes
+    ):
+        """
+        Evaluate pre-fetched splits for a batch of keys.
+
+        :param features: The features for which to get the treatments
+        :type features: list
+
+        :param splits: Mapping of feature names to splits (or None if not found), parents-first.
+        :type splits: dict
+
+        :param segment_names: Names of the segments referenced by the splits.
+        :type segment_names: set
+
+        :param keys: List of (matching_key, bucketing_key) tuples.
+        :type keys: list
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :return: Generator of (matching_key, bucketing_key, {feature: result}) tuples.
+        :rtype: generator
+        """
+        if not keys:
+            return
+
+        matching_keys = [matching_key for matching_key, _ in keys]
+        members = {
+            name: self._segment_storage.segment_contains_keys(name, matching_keys)
+            for name in segment_names
+        }
+
+        bucketing_keys = [
+            bucketing_key if bucketing_key is not None else matching_key
+            for matching_key, bucketing_key in keys
+        ]
+        buckets = {
+            (seed, algo): self._splitter.get_buckets(bucketing_keys, seed, algo)
+            for seed, algo in self._get_bucketing_seeds(splits)
+        }
+
+        for index, (matching_key, bucketing_key) in enumerate(keys):
+            memberships = {name: matching_key in contained for name, contained in members.items()}
+            context = self._build_context(matching_key, bucketing_key, memberships, splits)
+            context['buckets'] = {seed: values[index] for seed, values in buckets.items()}
+            yield matching_key, bucketing_key, self._evaluate_requested(
+                features,
+                splits,
+                matching_key,
+                bucketing_key,
+                attributes,
+                context
+            )
+
+    @staticmethod
+    def _get_bucketing_seeds(splits):
+        """
+        Return the (seed, algo) pairs the conditions of a set of splits may bucket keys with.
+
+        :param splits: Mapping of feature names to splits (or None if not found).
+        :type splits: dict
+
+        :return: Set of (seed, algo) tuples.
+        :rtype: set
+        """
+        seeds = set()
+        for split in splits.values():
+            if split is None:
+                continue
+            plan = split.plan
+            for condition in plan.conditions:
+                if condition.check_allocation:
+                    seeds.add((plan.traffic_allocation_seed, plan.algo))
+                if condition.treatment is None:
+                    seeds.add((plan.seed, plan.algo))
+        return seeds
+
+    def _evaluate_requested(  #pylint: disable=too-many-arguments
+            self,
+            features,
+            splits,
+            matching_key,
+            bucketing_key,
+            attributes,
+            context
+    ):
+        """
+        Evaluate the requested features out of a set of pre-fetched splits, parents-first.
+
+        An error evaluating a feature only turns that feature into CONTROL.
+
+        :param features: The features for which to get the treatments
+        :type features: list
+
+        :param splits: Mapping of feature names to splits (or None if not found), parents-first.
+        :type splits: dict
+
+        :param matching_key: The matching_key for which to get the treatments
+        :type matching_key: str
+
+        :param bucketing_key: The bucketing_key for which to get the treatments
+        :type bucketing_key: str
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :param context: Context shared with other evaluations for the same key.
+        :type context: dict
+
+        :return: Mapping of features to their evaluation results
+        :rtype: dict
+        """
+        requested = set(features)
+        results = {}
+        for feature, split in list(splits.items()):
+            if feature not in requested:
+                continue
+            try:
+                results[feature] = self._evaluate_treatment(
+                    feature,
+                    split,
+                    matching_key,
+                    bucketing_key,
+                    attributes,
+                    context
+                )
+            except Exception:  #pylint: disable=broad-except
+                self._logger.error('An exception occured when evaluating feature %s, '
+                                   'returning CONTROL.', feature)
+                self._logger.debug('Error: ', exc_info=True)
+                results[feature] = {
+                    'treatment': CONTROL,
+                    'configurations': None,
+                    'impression': {'label': Label.EXCEPTION, 'change_number': -1}
+                }
+        return {feature: results[feature] for feature in features}
+
+    def _evaluate_treatment(  #pylint: disable=too-many-arguments
+            self,
+            feature,
+            split,
+            matching_key,
+            bucketing_key,
+            attributes,
+            context=None
+    ):
+        """
+        Evaluate an already fetched split.
+
+        :param feature: The feature for which to get the treatment
+        :type feature:  str
+
+        :param split: The split definition, None if not found.
+        :type split: splitio.models.splits.Split
+
+        :param matching_key: The matching_key for which to get the treatment
+        :type matching_key: str
+
+        :param bucketing_key: The bucketing_key for which to get the treatment
+        :type bucketing_key: str
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :param context: Optional context shared with other evaluations for the same key.
+        :type context: dict
+
+        :return: The treatment for the key and split
+        :rtype: object
+        """
+        if context is not None:
+            memo_key = (feature, matching_key)
+            evaluations = context['evaluations']
+            if memo_key in evaluations:
+                if evaluations[memo_key] is None:
+                    self._logger.warning('Circular dependency found evaluating feature %s', feature)
+                    return {
+                        'treatment': CONTROL,
+                        'configurations': None,
+                        'impression': {'label': Label.EXCEPTION, 'change_number': -1}
+                    }
+                return evaluations[memo_key]
+            evaluations[memo_key] = None
+            try:
+                result = self._evaluate_split(
+                    feature,
+                    split,
+                    matching_key,
+                    bucketing_key,
+                    attributes,
+                    context
+                )
+            except Exception:
+                # Drop the in-progress marker so that later evaluations don't mistake this
+                # feature for a circular dependency.
+                del evaluations[memo_key]
+                raise
+            evaluations[memo_key] = result
+            return result
+
+        return self._evaluate_split(feature, split, matching_key, bucketing_key, attributes)
+
+    def _evaluate_split(  #pylint: disable=too-many-arguments
+            self,
+            feature,
+            split,
+            matching_key,
+            bucketing_key,
+            attributes,
+            context=None
+    ):
+        """
+        Evaluate an already fetched split, without memoizing the result.
+
+        :param feature: The feature for which to get the treatment
+        :type feature:  str
+
+        :param split: The split definition, None if not found.
+        :type split: splitio.models.splits.Split
+
+        :param matching_key: The matching_key for which to get the treatment
+        :type matching_key: str
+
+        :param bucketing_key: The bucketing_key for which to get the treatment
+        :type bucketing_key: str
+
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+
+        :param context: Optional context shared with other evaluations for the same key.
+        :type context: dict
+
         :return: The treatment for the key and split
         :rtype: object
         """
@@ -49,9 +580,6 @@ class Evaluator(object):  #pylint: disable=too-few-public-methods
         _treatment = CONTROL
         _change_number = -1
 
-        # Fetching Split definition
-        split = self._split_storage.get(feature)
-
         if split is None:
             self._logger.warning('Unknown or invalid feature: %s', feature)
             label = Label.SPLIT_NOT_FOUND
@@ -66,7 +594,8 @@ class Evaluator(object):  #pylint: disable=too-few-public-methods
                     split,
                     matching_key,
                     bucketing_key,
-                    attributes
+                    attributes,
+                    context
                 )
                 if treatment is None:
                     label = Label.NO_CONDITION_MATCHED
@@ -83,7 +612,14 @@ class Evaluator(object):  #pylint: disable=too-few-public-methods
             }
         }
 
-    def _get_treatment_for_split(self, split, matching_key, bucketing_key, attributes=None):
+    def _get_treatment_for_split(  #pylint: disable=too-many-arguments
+            self,
+            split,
+            matching_key,
+            bucketing_key,
+            attributes=None,
+            context=None
+    ):
         """
         Evaluate the feature considering the conditions.
 
@@ -102,45 +638,49 @@ class Evaluator(object):  #pylint: disable=too-few-public-methods
         :param attributes: An optional dictionary of attributes
         :type attributes: dict
 
+        :param context: Optional context shared with other evaluations for the same key.
+        :type context: dict
+
         :return: The resulting treatment and label
         :rtype: tuple
         """
         if bucketing_key is None:
             bucketing_key = matching_key
 
-        roll_out = False
-
-        context = {
-            'segment_storage': self._segment_storage,
-            'evaluator': self,
-            'bucketing_key': bucketing_key
-        }
+        plan = split.plan
+        if context is None and plan.needs_context:
+            context = self._build_context(matching_key, bucketing_key, splits={split.name: split})
 
-        for condition in split.conditions:
-            if (not roll_out and
-                    condition.condition_type == ConditionType.ROLLOUT):
-                if split.traffic_allocation < 100:
+        buckets = context['buckets'] if context is not None else None
+        for condition in plan.conditions:
+            if condition.check_allocation:
+                bucket = buckets.get((plan.traffic_allocation_seed, plan.algo)) \
+                    if buckets is not None else None
+                if bucket is None:
                     bucket = self._splitter.get_bucket(
                         bucketing_key,
-                        split.traffic_allocation_seed,
-                        split.algo
+                        plan.traffic_allocation_seed,
+                        plan.algo,
+                        plan.hash_fn
                     )
-                    if bucket > split.traffic_allocation:
-                        return split.default_treatment, Label.NOT_IN_SPLIT
-                roll_out = True
-
-            condition_matches = condition.matches(
-                matching_key,
-                attributes=attributes,
-                context=context
-            )
+                if bucket > plan.traffic_allocation:
+                    return split.default_treatment, Label.NOT_IN_SPLIT
 
-            if condition_matches:
-                return self._splitter.get_treatment(
+            for evaluate in condition.matchers:
+                if not evaluate(matching_key, attributes, context):
+                    break
+            else:
+                if condition.treatment is not None:
+                    return condition.treatment, condition.label
+                bucket = buckets.get((plan.seed, plan.algo)) if buckets is not None else None
+                if bucket is not None:
+                    return condition.bucket_treatments[bucket - 1], condition.label
+                return self._splitter.get_treatment_for_table(
                     bucketing_key,
-                    split.seed,
-                    condition.partitions,
-                    split.algo
+                    plan.seed,
+                    condition.bucket_treatments,
+                    plan.algo,
+                    plan.hash_fn
                 ), condition.label
 
         # No condition matches
@@ -3,14 +3,24 @@ Hash functions module.
 
 This module contains hash functions implemented in pure python
 as well as the optional import (if installed) of a C compiled murmur hash
-function with python bindings.
+function with python bindings, and of numpy based versions of both hash functions
+that work on many keys at once.
 """
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 
-from splitio.models.splits import HashAlgorithm
+from enum import Enum
+
 from splitio.engine.hashfns import legacy
 
+
+class HashAlgorithm(Enum):
+    """Hash algorithm names."""
+
+    LEGACY = 1
+    MURMUR = 2
+
+
 try:
     # First attempt to import module with C++ core (faster)
     import mmh3cffi
@@ -22,6 +32,16 @@ except ImportError:
     from splitio.engine.hashfns import murmur3py  #pylint: disable=ungrouped-imports
     _murmur_hash = murmur3py.murmur32_py  #pylint: disable=invalid-name
 
+try:
+    # Vectorized hash functions for arrays of keys (requires numpy)
+    from splitio.engine.hashfns import vectorized
+    _VECTORIZED_HASH_ALGORITHMS = {
+        HashAlgorithm.LEGACY: vectorized.legacy_hash,
+        HashAlgorithm.MURMUR: vectorized.murmur32
+    }
+except ImportError:
+    vectorized = None  #pylint: disable=invalid-name
+
 
 _HASH_ALGORITHMS = {
     HashAlgorithm.LEGACY: legacy.legacy_hash,
@@ -39,3 +59,27 @@ def get_hash_fn(algo):
     :rtype: function
     """
     return _HASH_ALGORITHMS.get(algo, legacy.legacy_hash)
+
+
+def get_buckets(keys, seed, algo):
+    """
+    Return the buckets for a list of keys.
+
+    Keys are hashed all at once with numpy if it's installed, otherwise one by one.
+
+    :param keys: Keys to bucket
+    :type keys: list(str)
+    :param seed: The feature seed
+    :type seed: int
+    :param algo: Algoritm to use
+    :type algo: int
+
+    :return: The buckets (1-100) of the keys, in the same order
+    :rtype: list(int)
+    """
+    if vectorized is not None:
+        hashfn = _VECTORIZED_HASH_ALGORITHMS.get(algo, vectorized.legacy_hash)
+        return (abs(hashfn(keys, seed)) % 100 + 1).tolist()
+
+    hashfn = get_hash_fn(algo)
+    return [abs(hashfn(key, seed)) % 100 + 1 for key in keys]
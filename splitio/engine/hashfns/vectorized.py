@@ -0,0 +1,110 @@
+"""
+Vectorized hash functions module.
+
+NumPy implementations of the murmur3 & legacy hash functions that operate on whole arrays of
+keys at once. Results are bit-for-bit identical to the scalar implementations.
+
+Importing this module requires numpy to be installed.
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import numpy as np
+
+
+_INT32_MIN = -2147483648
+_UINT32_RANGE = 4294967296
+
+
+def _as_int32(values):
+    """Vectorized version of `splitio.engine.hashfns.legacy.as_int32`."""
+    overflow = (values < -2147483649) | (values > 2147483648)
+    return np.where(overflow, (values - _INT32_MIN) % _UINT32_RANGE + _INT32_MIN, values)
+
+
+def legacy_hash(keys, seed):
+    """
+    Generate the legacy hash for an array of keys and a feature seed.
+
+    :param keys: Keys to hash
+    :type keys: list(str)
+    :param seed: The feature seed
+    :type seed: int
+
+    :return: The hashes for the keys
+    :rtype: numpy.ndarray
+    """
+    lengths = np.fromiter((len(key) for key in keys), dtype=np.int64, count=len(keys))
+    # Fixed width unicode arrays hold one UCS4 code point per character, zero padded.
+    # Trailing '\x00' characters are indistinguishable from padding, which is why the
+    # length of each key is taken from the original strings.
+    chars = np.array(keys, dtype='U')
+    chars = chars.view(np.uint32).reshape(len(keys), chars.dtype.itemsize // 4)
+
+    current_hash = np.zeros(len(keys), dtype=np.int64)
+    for index in range(chars.shape[1]):
+        char = chars[:, index].astype(np.int64)
+        updated = _as_int32(_as_int32(31 * _as_int32(current_hash)) + char)
+        current_hash = np.where(index < lengths, updated, current_hash)
+
+    return _as_int32(_as_int32(current_hash) ^ int(_as_int32(np.int64(seed))))
+
+
+def _rotl32(values, bits):
+    """Rotate 32 bit unsigned integers left."""
+    return (values << np.uint32(bits)) | (values >> np.uint32(32 - bits))
+
+
+def _read_uint32(chunks):
+    """Assemble little endian 32 bit unsigned integers from rows of 4 bytes."""
+    chunks = chunks.astype(np.uint32)
+    return chunks[:, 0] | chunks[:, 1] << np.uint32(8) | chunks[:, 2] << np.uint32(16) | \
+        chunks[:, 3] << np.uint32(24)
+
+
+def murmur32(keys, seed=0x0):
+    """
+    Generate the murmur3 (32 bits, x86) hash for an array of keys and a feature seed.
+
+    :param keys: Keys to hash
+    :type keys: list(str)
+    :param seed: Seed to use when hashing
+    :type seed: int
+
+    :return: The hashes for the keys
+    :rtype: numpy.ndarray
+    """
+    encoded = [key.encode('utf-8') for key in keys]
+    lengths = np.fromiter((len(key) for key in encoded), dtype=np.int64, count=len(encoded))
+    width = (int(lengths.max()) // 4 + 1) * 4 if len(encoded) else 4
+    data = np.array(encoded, dtype='S%d' % width).view(np.uint8).reshape(len(encoded), width)
+
+    calc1 = np.uint32(0xcc9e2d51)
+    calc2 = np.uint32(0x1b873593)
+
+    hash1 = np.full(len(encoded), seed & 0xFFFFFFFF, dtype=np.uint32)
+    nblocks = lengths // 4
+
+    # body
+    for block in range(width // 4 - 1):
+        start = block * 4
+        key1 = _read_uint32(data[:, start:start + 4])
+        key1 = _rotl32(key1 * calc1, 15) * calc2
+        updated = _rotl32(hash1 ^ key1, 13) * np.uint32(5) + np.uint32(0xe6546b64)
+        hash1 = np.where(block < nblocks, updated, hash1)
+
+    # tail, bytes past the end of each key are zero padding.
+    rows = np.arange(len(encoded))
+    tail_index = nblocks * 4
+    key1 = _read_uint32(data[rows[:, None], tail_index[:, None] + np.arange(4)])
+    key1 = _rotl32(key1 * calc1, 15) * calc2
+    hash1 = np.where(lengths & 3 > 0, hash1 ^ key1, hash1)
+
+    # finalization
+    hash1 ^= lengths.astype(np.uint32)
+    hash1 ^= hash1 >> np.uint32(16)
+    hash1 *= np.uint32(0x85ebca6b)
+    hash1 ^= hash1 >> np.uint32(13)
+    hash1 *= np.uint32(0xc2b2ae35)
+    hash1 ^= hash1 >> np.uint32(16)
+    return hash1.astype(np.int64)
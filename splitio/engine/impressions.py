@@ -0,0 +1,198 @@
+"""Impressions deduplication module."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from collections import defaultdict, namedtuple, OrderedDict
+import threading
+import time
+
+import six
+
+
+_TIME_INTERVAL_MS = 3600 * 1000
+
+
+CountPerFeature = namedtuple('CountPerFeature', ['feature', 'timeframe', 'count'])
+
+
+class ImpressionsMode(object):  #pylint: disable=too-few-public-methods
+    """Impressions modes."""
+
+    # Every impression is stored & sent.
+    DEBUG = 'DEBUG'
+
+    # Only the first impression of each key, feature & treatment per hour is stored & sent.
+    # The total number of impressions is reported as hourly counts per feature.
+    OPTIMIZED = 'OPTIMIZED'
+
+
+def truncate_time_frame(timestamp_ms):
+    """
+    Return the start of the hour a timestamp belongs to.
+
+    :param timestamp_ms: Timestamp in milliseconds.
+    :type timestamp_ms: int
+
+    :rtype: int
+    """
+    return timestamp_ms - (timestamp_ms % _TIME_INTERVAL_MS)
+
+
+class ImpressionObserver(object):
+    """Bounded LRU cache holding the last time each impression was seen."""
+
+    def __init__(self, size):
+        """
+        Class constructor.
+
+        :param size: Maximum number of impressions to remember.
+        :type size: int
+        """
+        self._size = size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def _hash(impression):
+        """
+        Build the hash identifying equivalent impressions.
+
+        :param impression: Impression.
+        :type impression: splitio.models.impressions.Impression
+
+        :rtype: int
+        """
+        return hash((
+            impression.matching_key,
+            impression.feature_name,
+            impression.treatment,
+            impression.label,
+            impression.change_number
+        ))
+
+    def test_and_set(self, impression):
+        """
+        Record an impression, returning the last time an equivalent one was seen.
+
+        :param impression: Impression.
+        :type impression: splitio.models.impressions.Impression
+
+        :return: Time of the previous equivalent impression, or None if it wasn't seen.
+        :rtype: int
+        """
+        impression_hash = self._hash(impression)
+        with self._lock:
+            previous = self._cache.pop(impression_hash, None)
+            self._cache[impression_hash] = impression.time
+            if len(self._cache) > self._size:
+                self._cache.popitem(last=False)
+            return previous
+
+    def __len__(self):
+        """Return the number of impressions remembered."""
+        return len(self._cache)
+
+
+class ImpressionsCounter(object):
+    """Thread-safe counter of impressions per feature & hour."""
+
+    def __init__(self):
+        """Class constructor."""
+        self._lock = threading.Lock()
+        self._data = defaultdict(int)
+
+    def track(self, impressions):
+        """
+        Count impressions.
+
+        :param impressions: Impressions to count.
+        :type impressions: list(splitio.models.impressions.Impression)
+        """
+        with self._lock:
+            for impression in impressions:
+                self._data[(impression.feature_name, truncate_time_frame(impression.time))] += 1
+
+    def pop_all(self):
+        """
+        Return the counts tracked so far & reset them.
+
+        :rtype: list(CountPerFeature)
+        """
+        with self._lock:
+            data, self._data = self._data, defaultdict(int)
+        return [
+            CountPerFeature(feature, timeframe, count)
+            for (feature, timeframe), count in six.iteritems(data)
+        ]
+
+
+class ImpressionsManager(object):
+    """
+    Decides which impressions are stored according to the impressions mode.
+
+    In optimized mode, impressions are stored only the first time they're seen in an hour, and
+    all of them are counted per feature & hour. Counts are handed to the impressions storage
+    whenever `flush_counts` is called (periodically, by an `ImpressionsCountSyncTask`), and by
+    `process_impressions` when `counts_refresh_rate` seconds went by since the last hand-off.
+    """
+
+    def __init__(self, storage=None, mode=ImpressionsMode.DEBUG, observer_size=500000,
+                 counts_refresh_rate=60):
+        """
+        Class constructor.
+
+        :param storage: Impressions storage counts are put into. Must implement `put_counts`.
+        :type storage: splitio.storage.ImpressionStorage
+        :param mode: Impressions mode. One of ImpressionsMode.
+        :type mode: str
+        :param observer_size: Number of recently seen impressions to remember.
+        :type observer_size: int
+        :param counts_refresh_rate: Seconds between hand-offs of counts to storage.
+        :type counts_refresh_rate: int
+        """
+        if mode not in (ImpressionsMode.DEBUG, ImpressionsMode.OPTIMIZED):
+            raise ValueError('Invalid impressions mode: %s' % mode)
+        self._storage = storage
+        self._mode = mode
+        self._observer = ImpressionObserver(observer_size)
+        self._counter = ImpressionsCounter()
+        self._counts_refresh_rate = counts_refresh_rate
+        self._last_counts_flush = time.time()
+
+    @property
+    def mode(self):
+        """Return the impressions mode."""
+        return self._mode
+
+    def process_impressions(self, impressions):
+        """
+        Select the impressions to be stored.
+
+        :param impressions: Impressions generated by an evaluation.
+        :type impressions: list(splitio.models.impressions.Impression)
+
+        :return: Impressions to store.
+        :rtype: list(splitio.models.impressions.Impression)
+        """
+        if self._mode == ImpressionsMode.DEBUG:
+            return impressions
+
+        self._counter.track(impressions)
+        to_store = []
+        for impression in impressions:
+            previous = self._observer.test_and_set(impression)
+            if previous is None or \
+                    truncate_time_frame(previous) != truncate_time_frame(impression.time):
+                to_store.append(impression)
+
+        if time.time() - self._last_counts_flush >= self._counts_refresh_rate:
+            self.flush_counts()
+        return to_store
+
+    def flush_counts(self):
+        """Hand the counts tracked so far to the impressions storage."""
+        self._last_counts_flush = time.time()
+        if self._storage is None:
+            return
+        counts = self._counter.pop_all()
+        if counts:
+            self._storage.put_counts(counts)
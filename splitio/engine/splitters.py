@@ -1,70 +1,156 @@
 """A module for implementation of the Splitter engine."""
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from collections import OrderedDict
+import threading
 
-from splitio.engine.evaluator import CONTROL
-from splitio.engine.hashfns import get_hash_fn
+from splitio.engine.hashfns import get_hash_fn, get_buckets
+
+
+class BucketCache(object):
+    """Bounded, thread-safe LRU cache of (key, seed, algo) -> bucket."""
+
+    def __init__(self, max_size):
+        """
+        Class constructor.
+
+        :param max_size: Maximum number of buckets to keep.
+        :type max_size: int
+        """
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, cache_key):
+        """
+        Return a cached bucket, marking it as the most recently used.
+
+        :param cache_key: (key, seed, algo) tuple.
+        :type cache_key: tuple
+
+        :return: Cached bucket or None if it's not there.
+        :rtype: int
+        """
+        with self._lock:
+            bucket = self._data.pop(cache_key, None)
+            if bucket is None:
+                self._misses += 1
+                return None
+            self._data[cache_key] = bucket
+            self._hits += 1
+            return bucket
+
+    def put(self, cache_key, bucket):
+        """
+        Store a bucket, evicting the least recently used one if the cache is full.
+
+        :param cache_key: (key, seed, algo) tuple.
+        :type cache_key: tuple
+        :param bucket: Bucket for the key.
+        :type bucket: int
+        """
+        with self._lock:
+            self._data.pop(cache_key, None)
+            self._data[cache_key] = bucket
+            if len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    @property
+    def hits(self):
+        """Return the number of lookups that found a cached bucket."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Return the number of lookups that didn't find a cached bucket."""
+        return self._misses
+
+    def __len__(self):
+        """Return the number of cached buckets."""
+        return len(self._data)
 
 
 class Splitter(object):
     """Class responsible for choosing the right partition."""
 
-    def get_treatment(self, key, seed, partitions, algo):
+    def __init__(self, bucket_cache_size=0):
         """
-        Return the appropriate treatment or CONTROL if no partitions are found.
+        Class constructor.
+
+        :param bucket_cache_size: Number of buckets to memoize. 0 disables the cache.
+        :type bucket_cache_size: int
+        """
+        self._cache = BucketCache(bucket_cache_size) if bucket_cache_size > 0 else None
+
+    @property
+    def cache_hits(self):
+        """Return the number of buckets served from the cache."""
+        return self._cache.hits if self._cache is not None else 0
+
+    @property
+    def cache_misses(self):
+        """Return the number of buckets that had to be computed with the cache enabled."""
+        return self._cache.misses if self._cache is not None else 0
+
+    def get_treatment_for_table(  #pylint: disable=too-many-arguments
+            self, key, seed, bucket_treatments, algo, hashfn=None
+    ):
+        """
+        Return the treatment for a key using a precomputed bucket to treatment table.
 
         :param key: The key for which to determine the treatment
         :type key: str
         :param seed: The feature seed
         :type seed: int
-        :param partitions: The condition partitions
-        :type partitions: list
+        :param bucket_treatments: Treatment of each bucket (bucket `n` at position `n - 1`)
+        :type bucket_treatments: tuple(str)
+        :param algo: The hash algorithm
+        :type algo: int
+        :param hashfn: Hash function for `algo`, if already resolved by the caller
+        :type hashfn: function
         :return: The treatment
         :rtype: str
         """
-        if not partitions:
-            return CONTROL
-
-        if len(partitions) == 1 and partitions[0].size == 100:
-            return partitions[0].treatment
-
-        return self.get_treatment_for_bucket(
-            self.get_bucket(key, seed, algo),
-            partitions
-        )
+        return bucket_treatments[self.get_bucket(key, seed, algo, hashfn) - 1]
 
-    @staticmethod
-    def get_bucket(key, seed, algo):
+    def get_bucket(self, key, seed, algo, hashfn=None):
         """
         Get the bucket for a key hash.
 
         :param key_hash: The hash for a key
         :type key_hash: int
+        :param hashfn: Hash function for `algo`, if already resolved by the caller
+        :type hashfn: function
         :return: The bucked for a hash
         :rtype: int
         """
-        hashfn = get_hash_fn(algo)
-        key_hash = hashfn(key, seed)
-        return abs(key_hash) % 100 + 1
+        if hashfn is None:
+            hashfn = get_hash_fn(algo)
+
+        if self._cache is None:
+            return abs(hashfn(key, seed)) % 100 + 1
+
+        cache_key = (key, seed, algo)
+        bucket = self._cache.get(cache_key)
+        if bucket is None:
+            bucket = abs(hashfn(key, seed)) % 100 + 1
+            self._cache.put(cache_key, bucket)
+        return bucket
 
     @staticmethod
-    def get_treatment_for_bucket(bucket, partitions):
+    def get_buckets(keys, seed, algo):
         """
-        Get the treatment for a given bucket and partitions.
+        Get the buckets for many keys at once.
 
-        :param bucket: The bucket number generated by get_bucket
-        :type bucket: int
-        :param partitions: The condition partitions
-        :type partitions: list
-        :return: The treatment
-        :rtype: str
+        :param keys: The keys to bucket
+        :type keys: list(str)
+        :param seed: The feature seed
+        :type seed: int
+        :param algo: The hash algorithm
+        :type algo: int
+        :return: The buckets for the keys, in the same order
+        :rtype: list(int)
         """
-        covered_buckets = 0
-
-        for partition in partitions:
-            covered_buckets += partition.size
-
-            if covered_buckets >= bucket:
-                return partition.treatment
-
-        return CONTROL
+        return get_buckets(keys, seed, algo)
@@ -4,6 +4,7 @@ from enum import Enum
 from future.utils import python_2_unicode_compatible
 import six
 
+from splitio.models.treatments import CONTROL
 from splitio.models.grammar import matchers
 from splitio.models.grammar import partitions
 
@@ -39,6 +40,7 @@ class Condition(object):
         self._matchers = matcher_list
         self._combiner = combiner
         self._partitions = tuple(parts)
+        self._bucket_treatments = _build_bucket_treatments(self._partitions)
         self._label = label
         self._condition_type = condition_type
 
@@ -52,6 +54,11 @@ class Condition(object):
         """Return the list of partitions associated with the condition."""
         return self._partitions
 
+    @property
+    def bucket_treatments(self):
+        """Return the treatment for each bucket, where bucket `n` is at position `n - 1`."""
+        return self._bucket_treatments
+
     @property
     def label(self):
         """Return the label of this condition."""
@@ -87,6 +94,18 @@ class Condition(object):
             if isinstance(matcher, matchers.UserDefinedSegmentMatcher)
         ]
 
+    def get_dependency_names(self):
+        """
+        Fetch the names of the splits referenced by IN_SPLIT_TREATMENT matchers.
+
+        :return: List of split names
+        :rtype: list(str)
+        """
+        return [
+            matcher._split_name for matcher in self.matchers  #pylint: disable=protected-access
+            if isinstance(matcher, matchers.DependencyMatcher)
+        ]
+
     @python_2_unicode_compatible
     def __str__(self):
         """Return the string representation of the condition."""
@@ -111,6 +130,28 @@ class Condition(object):
         }
 
 
+def _build_bucket_treatments(parts):
+    """
+    Build a lookup table with the treatment assigned to each of the 100 buckets.
+
+    Buckets not covered by the partitions get CONTROL.
+
+    :param parts: Condition partitions.
+    :type parts: tuple(splitio.models.grammar.partitions.Partition)
+
+    :return: Treatments for buckets 1 to 100.
+    :rtype: tuple(str)
+    """
+    treatments = []
+    covered_buckets = 0
+    for partition in parts:
+        covered_buckets += partition.size
+        while len(treatments) < 100 and len(treatments) + 1 <= covered_buckets:
+            treatments.append(partition.treatment)
+    treatments.extend([CONTROL] * (100 - len(treatments)))
+    return tuple(treatments)
+
+
 def from_raw(raw_condition):
     """
     Parse a condition from a JSON portion of splitChanges.
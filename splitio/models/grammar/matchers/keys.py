@@ -74,6 +74,22 @@ class UserDefinedSegmentMatcher(Matcher):
         matching_data = self._get_matcher_input(key, attributes)
         if matching_data is None:
             return False
+
+        # Memberships resolved ahead of time only apply when matching against the key.
+        if self._attribute_name is None:
+            memberships = context.get('segment_memberships')
+            if memberships is not None and self._segment_name in memberships:
+                return memberships[self._segment_name]
+
+            key_segments = context.get('key_segments')
+            if key_segments is not None:
+                return self._segment_name in key_segments
+
+            if memberships is not None:
+                contained = segment_storage.segment_contains(self._segment_name, matching_data)
+                memberships[self._segment_name] = contained
+                return contained
+
         return segment_storage.segment_contains(self._segment_name, matching_data)
 
     def _add_matcher_specific_properties_to_json(self):
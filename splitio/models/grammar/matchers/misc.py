@@ -39,9 +39,7 @@ class DependencyMatcher(Matcher):
         evaluator = context.get('evaluator')
         assert evaluator is not None
 
-        bucketing_key = context.get('bucketing_key')
-
-        result = evaluator.evaluate_treatment(self._split_name, key, bucketing_key, attributes)
+        result = evaluator.evaluate_dependency(self._split_name, key, attributes, context)
         return result['treatment'] in self._treatments
 
     def _add_matcher_specific_properties_to_json(self):
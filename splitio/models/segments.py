@@ -1,4 +1,11 @@
 """Segment module."""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from array import array
+import heapq
+
+import six
 
 
 class Segment(object):
@@ -71,6 +78,171 @@ class Segment(object):
         """
         self._change_number = new_value
 
+    def __len__(self):
+        """Return the number of keys in the segment."""
+        return len(self._keys)
+
+    def __iter__(self):
+        """Return an iterator over the segment keys."""
+        return iter(self._keys)
+
+
+def _encode(key):
+    """Return the UTF-8 representation of a key."""
+    return key.encode('utf-8') if isinstance(key, six.text_type) else key
+
+
+class CompactSegment(Segment):
+    """
+    Segment keeping its keys as sorted UTF-8 strings packed in a single buffer.
+
+    Lookups are binary searches over the buffer. Keys added or removed by updates are kept in
+    small sets, which are merged into the buffer once they grow past a fraction of its size.
+
+    Memory is traded for latency: lookups are roughly 90 times slower than on a set.
+    """
+
+    _MIN_PENDING_CHANGES = 1024
+    _PENDING_CHANGES_RATIO = 16
+
+    def __init__(self, name, keys, change_number):  #pylint: disable=super-init-not-called
+        """
+        Class constructor.
+
+        :param name: Segment name.
+        :type name: str
+
+        :param keys: List of keys belonging to the segment.
+        :type keys: List
+        """
+        self._name = name
+        self._change_number = change_number
+        self._added = set()
+        self._removed = set()
+        self._pack(sorted(set(_encode(key) for key in keys)))
+
+    def _pack(self, encoded_keys):
+        """
+        Replace the packed buffer with a sorted list of UTF-8 keys.
+
+        :param encoded_keys: Sorted and unique UTF-8 encoded keys.
+        :type encoded_keys: iterable(bytes)
+        """
+        data = bytearray()
+        offsets = [0]
+        for key in encoded_keys:
+            data.extend(key)
+            offsets.append(len(data))
+        self._data = bytes(data)
+        self._offsets = array('I' if len(data) < 2 ** 32 else 'L', offsets)
+
+    def _packed_keys(self):
+        """Return a generator of the UTF-8 keys in the packed buffer, sorted."""
+        offsets = self._offsets
+        return (self._data[offsets[index]:offsets[index + 1]] for index in range(len(offsets) - 1))
+
+    def _packed_contains(self, encoded_key):
+        """
+        Return whether the packed buffer holds a key.
+
+        :param encoded_key: UTF-8 encoded key.
+        :type encoded_key: bytes
+
+        :rtype: bool
+        """
+        data = self._data
+        offsets = self._offsets
+        low = 0
+        high = len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            current = data[offsets[middle]:offsets[middle + 1]]
+            if current < encoded_key:
+                low = middle + 1
+            elif current > encoded_key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def contains(self, key):
+        """
+        Return whether the supplied key belongs to the segment.
+
+        :param key: User key.
+        :type key: str
+
+        :return: True if the user is in the segment. False otherwise.
+        :rtype: bool
+        """
+        encoded = _encode(key)
+        if encoded in self._added:
+            return True
+        if encoded in self._removed:
+            return False
+        return self._packed_contains(encoded)
+
+    def update(self, to_add, to_remove):
+        """
+        Add supplied keys to the segment.
+
+        :param to_add: List of keys to add.
+        :type to_add: list
+        :param to_remove: List of keys to remove.
+        :type to_remove: list
+        """
+        for key in to_add:
+            encoded = _encode(key)
+            if self._packed_contains(encoded):
+                self._removed.discard(encoded)
+            else:
+                self._added.add(encoded)
+        for key in to_remove:
+            encoded = _encode(key)
+            self._added.discard(encoded)
+            if self._packed_contains(encoded):
+                self._removed.add(encoded)
+
+        pending = len(self._added) + len(self._removed)
+        allowed = max(self._MIN_PENDING_CHANGES, len(self._offsets) // self._PENDING_CHANGES_RATIO)
+        if pending > allowed:
+            self._compact()
+
+    def _compact(self):
+        """Merge pending changes into the packed buffer."""
+        removed = self._removed
+        self._pack(heapq.merge(
+            (key for key in self._packed_keys() if key not in removed),
+            sorted(self._added)
+        ))
+        self._added = set()
+        self._removed = set()
+
+    @property
+    def keys(self):
+        """
+        Return the segment keys.
+
+        The set is built on every call, which is expensive for large segments.
+
+        :return: A set of the segment keys
+        :rtype: set
+        """
+        return set(self)
+
+    def __len__(self):
+        """Return the number of keys in the segment."""
+        return len(self._offsets) - 1 - len(self._removed) + len(self._added)
+
+    def __iter__(self):
+        """Return an iterator over the segment keys, without building a set."""
+        removed = self._removed
+        for key in self._packed_keys():
+            if key not in removed:
+                yield key.decode('utf-8')
+        for key in list(self._added):
+            yield key.decode('utf-8')
+
 
 def from_raw(raw_segment):
     """
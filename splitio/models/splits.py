@@ -6,6 +6,8 @@ from collections import namedtuple
 from future.utils import python_2_unicode_compatible
 
 from splitio.models.grammar import condition
+from splitio.engine import compiler
+from splitio.engine.hashfns import HashAlgorithm
 
 
 SplitView = namedtuple(
@@ -21,13 +23,6 @@ class Status(Enum):
     ARCHIVED = "ARCHIVED"
 
 
-class HashAlgorithm(Enum):
-    """Hash algorithm names."""
-
-    LEGACY = 1
-    MURMUR = 2
-
-
 class Split(object):  #pylint: disable=too-many-instance-attributes
     """Split model object."""
 
@@ -93,6 +88,7 @@ class Split(object):  #pylint: disable=too-many-instance-attributes
             self._algo = HashAlgorithm.LEGACY
 
         self._configurations = configurations
+        self._plan = None
 
     @property
     def name(self):
@@ -149,6 +145,13 @@ class Split(object):  #pylint: disable=too-many-instance-attributes
         """Return the traffic allocation seed of the split."""
         return self._traffic_allocation_seed
 
+    @property
+    def plan(self):
+        """Return the evaluation plan of the split, compiling it on first access."""
+        if self._plan is None:
+            self._plan = compiler.compile_split(self)
+        return self._plan
+
     def get_configurations_for(self, treatment):
         """Return the mapping of treatments to configurations."""
         return self._configurations.get(treatment) if self._configurations else None
@@ -162,6 +165,15 @@ class Split(object):  #pylint: disable=too-many-instance-attributes
         """
         return [name for cond in self.conditions for name in cond.get_segment_names()]
 
+    def get_dependency_names(self):
+        """
+        Return a list of the names of the splits this split depends on.
+
+        :return: List of split names.
+        :rtype: list(string)
+        """
+        return [name for cond in self.conditions for name in cond.get_dependency_names()]
+
     def to_json(self):
         """Return a JSON representation of this split."""
         return {
@@ -0,0 +1,4 @@
+"""Treatments module."""
+
+
+CONTROL = 'control'
@@ -2,9 +2,52 @@
 from __future__ import absolute_import
 
 import abc
+from collections import OrderedDict
 
 from six import add_metaclass
 
+
+def sort_by_dependencies(split_names, fetch):
+    """
+    Fetch splits along with the splits they depend on, ordered parents-first.
+
+    :param split_names: Names of the splits to fetch.
+    :type split_names: list(str)
+    :param fetch: Callable returning the split for a name, or None if not found.
+    :type fetch: callable
+
+    :return: Tuple of an ordered mapping of split names to splits (None if not found)
+        and the set of split names involved in dependency cycles.
+    :rtype: tuple(collections.OrderedDict, set(str))
+    """
+    ordered = OrderedDict()
+    cyclic = set()
+    for root in split_names:
+        if root in ordered:
+            continue
+        # Depth first walk keeping the current path as a stack of (name, split, parents).
+        path = []
+        pending = root
+        while pending is not None or path:
+            if pending is not None:
+                split = fetch(pending)
+                parents = split.get_dependency_names() if split is not None else []
+                path.append((pending, split, iter(parents)))
+            name, split, parents = path[-1]
+            pending = next(parents, None)
+            if pending is None:
+                path.pop()
+                ordered[name] = split
+                continue
+            names = [item[0] for item in path]
+            if pending in names:
+                cyclic.update(names[names.index(pending):])
+                pending = None
+            elif pending in ordered:
+                pending = None
+    return ordered, cyclic
+
+
 @add_metaclass(abc.ABCMeta)
 class SplitStorage(object):
     """Split storage interface implemented as an abstract class."""
@@ -53,6 +96,26 @@ class SplitStorage(object):
         """
         pass
 
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Store & remove a set of splits and update the change number as a single operation.
+
+        Implementations should make the whole set of changes visible at once. This default
+        implementation applies them one by one.
+
+        :param to_put: Splits to store.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: New change number.
+        :type change_number: int
+        """
+        for split in to_put:
+            self.put(split)
+        for split_name in to_remove:
+            self.remove(split_name)
+        self.set_change_number(change_number)
+
     @abc.abstractmethod
     def set_change_number(self, new_change_number):
         """
@@ -83,6 +146,21 @@ class SplitStorage(object):
         """
         pass
 
+    def fetch_many(self, split_names):
+        """
+        Retrieve many splits at once.
+
+        Storages capable of fetching many splits in a single operation should override this
+        method.
+
+        :param split_names: Names of the features to fetch.
+        :type split_names: list(str)
+
+        :return: Mapping of split names to splits (None if not found).
+        :rtype: dict
+        """
+        return {split_name: self.get(split_name) for split_name in split_names}
+
     def get_segment_names(self):
         """
         Return a set of all segments referenced by splits in storage.
@@ -92,6 +170,32 @@ class SplitStorage(object):
         """
         return set([name for spl in self.get_all_splits() for name in spl.get_segment_names()])
 
+    def get_evaluation_order(self, split_names):
+        """
+        Fetch splits along with the splits they depend on, ordered parents-first.
+
+        Dependencies are followed transitively, so evaluating the splits in the returned order
+        guarantees that a split is evaluated after every split it depends on, unless they're
+        part of a dependency cycle. Splits are fetched with `fetch_many`, one call per level of
+        dependencies.
+
+        :param split_names: Names of the splits to fetch.
+        :type split_names: list(str)
+
+        :return: Tuple of an ordered mapping of split names to splits (None if not found)
+            and the set of split names involved in dependency cycles.
+        :rtype: tuple(collections.OrderedDict, set(str))
+        """
+        fetched = {}
+        pending = set(split_names)
+        while pending:
+            fetched.update(self.fetch_many(list(pending)))
+            pending = set(
+                name for split in fetched.values() if split is not None
+                for name in split.get_dependency_names() if name not in fetched
+            )
+        return sort_by_dependencies(split_names, fetched.get)
+
 
 @add_metaclass(abc.ABCMeta)
 class SegmentStorage(object):
@@ -172,6 +276,56 @@ class SegmentStorage(object):
         """
         pass
 
+    def get_key_segments(self, key):  #pylint: disable=unused-argument,no-self-use
+        """
+        Return the names of all the segments a key belongs to, if the storage can index them.
+
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Names of the segments containing the key, or None if not supported.
+        :rtype: frozenset(str)
+        """
+        return None
+
+    def get_segment_memberships(  #pylint: disable=unused-argument,no-self-use
+            self,
+            segment_names,
+            key
+    ):
+        """
+        Return whether a key belongs to each of many segments, if supported by the storage.
+
+        Storages where every lookup is expensive (ie: a network round-trip) should override this
+        method, so that memberships are resolved before evaluating instead of once per matcher.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: iterable(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Mapping of segment names to whether they contain the key, or None if not
+            supported.
+        :rtype: dict
+        """
+        return None
+
+    def segment_contains_keys(self, segment_name, keys):
+        """
+        Return which of the supplied keys belong to a segment in storage.
+
+        Storages capable of answering for many keys at once should override this method.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param keys: Keys to search for.
+        :type keys: list(str)
+
+        :return: Set of keys contained in the segment.
+        :rtype: set(str)
+        """
+        return set(key for key in keys if self.segment_contains(segment_name, key))
+
 
 @add_metaclass(abc.ABCMeta)
 class ImpressionStorage(object):
@@ -197,6 +351,26 @@ class ImpressionStorage(object):
         """
         pass
 
+    def put_counts(self, counts):
+        """
+        Add impression counts per feature & hour.
+
+        Storages supporting the optimized impressions mode should override this method.
+        Counts are discarded otherwise.
+
+        :param counts: Impression counts.
+        :type counts: list(splitio.engine.impressions.CountPerFeature)
+        """
+        pass
+
+    def pop_counts(self):  #pylint: disable=no-self-use
+        """
+        Pop all impression counts in storage.
+
+        :rtype: list(splitio.engine.impressions.CountPerFeature)
+        """
+        return []
+
 
 @add_metaclass(abc.ABCMeta)
 class EventStorage(object):
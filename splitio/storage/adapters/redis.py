@@ -138,6 +138,19 @@ class RedisAdapter(object):  #pylint: disable=too-many-public-methods
         except RedisError as exc:
             raise_from(RedisAdapterException('Failed to execute keys operation'), exc)
 
+    def scan_iter(self, pattern, count=None):
+        """
+        Mimic original redis function but using user custom prefix.
+
+        Keys are yielded as they're found by successive SCAN calls, so errors are raised
+        while iterating.
+        """
+        try:
+            for key in self._decorated.scan_iter(match=self._add_prefix(pattern), count=count):
+                yield self._remove_prefix(_bytes_to_string(key))
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Failed to execute scan operation'), exc)
+
     def set(self, name, value, *args, **kwargs):
         """Mimic original redis function but using user custom prefix."""
         try:
@@ -244,6 +257,13 @@ class RedisAdapter(object):  #pylint: disable=too-many-public-methods
         except RedisError as exc:
             raise_from(RedisAdapterException('Error executing hget operation'), exc)
 
+    def hincrby(self, name, key, amount=1):
+        """Mimic original redis function but using user custom prefix."""
+        try:
+            return self._decorated.hincrby(self._add_prefix(name), key, amount)
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Error executing hincrby operation'), exc)
+
     def incr(self, name, amount=1):
         """Mimic original redis function but using user custom prefix."""
         try:
@@ -293,6 +313,57 @@ class RedisAdapter(object):  #pylint: disable=too-many-public-methods
         except RedisError as exc:
             raise_from(RedisAdapterException('Error executing lpop operation'), exc)
 
+    def pipeline(self, transaction=True):
+        """
+        Build a pipeline that sends many commands in a single round-trip.
+
+        :param transaction: Whether to wrap the commands in a MULTI/EXEC block.
+        :type transaction: bool
+
+        :rtype: RedisPipelineAdapter
+        """
+        try:
+            return RedisPipelineAdapter(
+                self._decorated.pipeline(transaction=transaction),
+                self._prefix
+            )
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Error creating pipeline'), exc)
+
+
+class RedisPipelineAdapter(RedisAdapter):
+    """
+    Instance decorator for Redis pipelines.
+
+    Commands are queued with the user prefix applied to their keys, and their results are
+    returned in order by `execute`. Commands that post-process their keys (ie: `keys`) are
+    not supported.
+    """
+
+    def mget(self, names):
+        """Mimic original redis function but using user custom prefix."""
+        return self._decorated.mget(self._add_prefix(names))
+
+    def smembers(self, name):
+        """Mimic original redis function but using user custom prefix."""
+        return self._decorated.smembers(self._add_prefix(name))
+
+    def execute(self):
+        """
+        Send the queued commands and return their results.
+
+        :return: Results of the queued commands, in order.
+        :rtype: list
+        """
+        try:
+            return [
+                [_bytes_to_string(item) for item in result]
+                if isinstance(result, (list, set)) else _bytes_to_string(result)
+                for result in self._decorated.execute()
+            ]
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Error executing pipeline'), exc)
+
 
 def _build_default_client(config):  #pylint: disable=too-many-locals
     """
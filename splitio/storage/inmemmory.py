@@ -2,22 +2,35 @@
 from __future__ import absolute_import
 
 import logging
+import random
 import threading
-from six.moves import queue
-from splitio.models.segments import Segment
+import time
+from collections import namedtuple, deque, defaultdict
+
+import six
+
+from splitio.engine.impressions import CountPerFeature
+from splitio.models.segments import Segment, CompactSegment
 from splitio.storage import SplitStorage, SegmentStorage, ImpressionStorage, EventStorage, \
-    TelemetryStorage
+    TelemetryStorage, sort_by_dependencies
+
+
+SplitsSnapshot = namedtuple('SplitsSnapshot', ['splits', 'change_number', 'version'])
 
 
 class InMemorySplitStorage(SplitStorage):
-    """InMemory implementation of a split storage."""
+    """
+    InMemory implementation of a split storage.
+
+    Splits are published as immutable snapshots that writers replace as a whole, so that
+    reads never take a lock.
+    """
 
     def __init__(self):
         """Constructor."""
         self._logger = logging.getLogger(self.__class__.__name__)
-        self._lock = threading.RLock()
-        self._splits = {}
-        self._change_number = -1
+        self._lock = threading.Lock()
+        self._snapshot = SplitsSnapshot({}, -1, 0)
 
     def get(self, split_name):
         """
@@ -28,8 +41,17 @@ class InMemorySplitStorage(SplitStorage):
 
         :rtype: splitio.models.splits.Split
         """
-        with self._lock:
-            return self._splits.get(split_name)
+        return self._snapshot.splits.get(split_name)
+
+    def get_snapshot(self):
+        """
+        Return the current splits, change number & version as a consistent snapshot.
+
+        The mapping of split names to splits in the snapshot must not be modified.
+
+        :rtype: SplitsSnapshot
+        """
+        return self._snapshot
 
     def put(self, split):
         """
@@ -39,7 +61,9 @@ class InMemorySplitStorage(SplitStorage):
         :type split: splitio.models.split.Split
         """
         with self._lock:
-            self._splits[split.name] = split
+            splits = dict(self._snapshot.splits)
+            splits[split.name] = split
+            self._publish(splits, self._snapshot.change_number, self._snapshot.version + 1)
 
     def remove(self, split_name):
         """
@@ -52,12 +76,36 @@ class InMemorySplitStorage(SplitStorage):
         :rtype: bool
         """
         with self._lock:
-            try:
-                self._splits.pop(split_name)
-                return True
-            except KeyError:
+            if split_name not in self._snapshot.splits:
                 self._logger.warning("Tried to delete nonexistant split %s. Skipping", split_name)
                 return False
+            splits = dict(self._snapshot.splits)
+            splits.pop(split_name)
+            self._publish(splits, self._snapshot.change_number, self._snapshot.version + 1)
+            return True
+
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Store & remove a set of splits and update the change number as a single operation.
+
+        :param to_put: Splits to store.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: New change number.
+        :type change_number: int
+        """
+        with self._lock:
+            splits = dict(self._snapshot.splits)
+            for split in to_put:
+                splits[split.name] = split
+            removed = [splits.pop(split_name, None) for split_name in to_remove]
+            changed = bool(to_put) or any(split is not None for split in removed)
+            self._publish(
+                splits,
+                change_number,
+                self._snapshot.version + 1 if changed else self._snapshot.version
+            )
 
     def get_change_number(self):
         """
@@ -65,8 +113,7 @@ class InMemorySplitStorage(SplitStorage):
 
         :rtype: int
         """
-        with self._lock:
-            return self._change_number
+        return self._snapshot.change_number
 
     def set_change_number(self, new_change_number):
         """
@@ -76,7 +123,15 @@ class InMemorySplitStorage(SplitStorage):
         :type new_change_number: int
         """
         with self._lock:
-            self._change_number = new_change_number
+            self._publish(self._snapshot.splits, new_change_number, self._snapshot.version)
+
+    def get_version(self):
+        """
+        Return a number that increases every time splits are added, updated or removed.
+
+        :rtype: int
+        """
+        return self._snapshot.version
 
     def get_split_names(self):
         """
@@ -85,8 +140,7 @@ class InMemorySplitStorage(SplitStorage):
         :return: List of split names.
         :rtype: list(str)
         """
-        with self._lock:
-            return list(self._splits.keys())
+        return list(self._snapshot.splits.keys())
 
     def get_all_splits(self):
         """
@@ -95,19 +149,61 @@ class InMemorySplitStorage(SplitStorage):
         :return: List of all the splits.
         :rtype: list
         """
-        with self._lock:
-            return list(self._splits.values())
+        return list(self._snapshot.splits.values())
+
+    def get_evaluation_order(self, split_names):
+        """
+        Fetch splits along with the splits they depend on, ordered parents-first.
+
+        All the splits are read from the same snapshot.
+
+        :param split_names: Names of the splits to fetch.
+        :type split_names: list(str)
+
+        :return: Tuple of an ordered mapping of split names to splits (None if not found)
+            and the set of split names involved in dependency cycles.
+        :rtype: tuple(collections.OrderedDict, set(str))
+        """
+        return sort_by_dependencies(split_names, self._snapshot.splits.get)
+
+    def _publish(self, splits, change_number, version):
+        """
+        Replace the current snapshot. Must be called with the lock held.
+
+        :param splits: New mapping of split names to splits. Must not be modified afterwards.
+        :type splits: dict
+        :param change_number: New change number.
+        :type change_number: int
+        :param version: New version.
+        :type version: int
+        """
+        self._snapshot = SplitsSnapshot(splits, change_number, version)
 
 
 class InMemorySegmentStorage(SegmentStorage):
     """In-memory implementation of a segment storage."""
 
-    def __init__(self):
-        """Constructor."""
+    def __init__(self, reverse_index=False, compact_segment_size=0):
+        """
+        Constructor.
+
+        :param reverse_index: Whether to keep track of the segments each key belongs to.
+        :type reverse_index: bool
+        :param compact_segment_size: Number of keys from which segments are stored in a compact
+            representation. 0 (the default) disables it: per benchmarks/bench_segments.py, a
+            1M keys compact segment takes about 34MB instead of 109MB, but lookups take about
+            9us instead of 0.1us, and each update page rebuilds the packed buffer (about 6-11ms
+            instead of 0.05ms). Only worth enabling, with a threshold in the hundreds of
+            thousands of keys, when memory matters more than evaluation latency.
+        :type compact_segment_size: int
+        """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._segments = {}
         self._change_numbers = {}
         self._lock = threading.RLock()
+        self._version = 0
+        self._key_segments = {} if reverse_index else None
+        self._compact_segment_size = compact_segment_size
 
     def get(self, segment_name):
         """
@@ -135,7 +231,19 @@ class InMemorySegmentStorage(SegmentStorage):
         :type segment: splitio.models.segment.Segment
         """
         with self._lock:
-            self._segments[segment.name] = segment
+            if self._key_segments is not None:
+                current = self._segments.get(segment.name)
+                if current is None:
+                    self._index(segment.name, segment, ())
+                else:
+                    # Membership tests & iteration don't expand compact segments into sets.
+                    self._index(
+                        segment.name,
+                        [key for key in segment if not current.contains(key)],
+                        [key for key in current if not segment.contains(key)]
+                    )
+            self._segments[segment.name] = self._compact(segment)
+            self._version += 1
 
     def update(self, segment_name, to_add, to_remove, change_number=None):
         """
@@ -150,12 +258,25 @@ class InMemorySegmentStorage(SegmentStorage):
         """
         with self._lock:
             if not segment_name in self._segments:
-                self._segments[segment_name] = Segment(segment_name, to_add, change_number)
+                segment = self._compact(Segment(segment_name, to_add, change_number))
+                self._segments[segment_name] = segment
+                self._version += 1
+                if self._key_segments is not None:
+                    self._index(segment_name, segment, ())
                 return
 
-            self._segments[segment_name].update(to_add, to_remove)
+            segment = self._segments[segment_name]
+            if to_add or to_remove or \
+                    (change_number is not None and change_number != segment.change_number):
+                self._version += 1
+            if self._key_segments is not None:
+                removed = set(key for key in to_remove if segment.contains(key))
+                added = set(key for key in to_add if not segment.contains(key)) - set(to_remove)
+                self._index(segment_name, added, removed)
+            segment.update(to_add, to_remove)
             if change_number is not None:
-                self._segments[segment_name].change_number = change_number
+                segment.change_number = change_number
+            self._segments[segment_name] = self._compact(segment)
 
     def get_change_number(self, segment_name):
         """
@@ -183,8 +304,19 @@ class InMemorySegmentStorage(SegmentStorage):
         with self._lock:
             if not segment_name in self._segments:
                 return
+            if self._segments[segment_name].change_number != new_change_number:
+                self._version += 1
             self._segments[segment_name].change_number = new_change_number
 
+    def get_version(self):
+        """
+        Return a number that increases every time segments are added or updated.
+
+        :rtype: int
+        """
+        with self._lock:
+            return self._version
+
     def segment_contains(self, segment_name, key):
         """
         Check whether a specific key belongs to a segment in storage.
@@ -206,25 +338,274 @@ class InMemorySegmentStorage(SegmentStorage):
                 return False
             return self._segments[segment_name].contains(key)
 
+    def segment_contains_keys(self, segment_name, keys):
+        """
+        Return which of the supplied keys belong to a segment in storage.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param keys: Keys to search for.
+        :type keys: list(str)
+
+        :return: Set of keys contained in the segment.
+        :rtype: set(str)
+        """
+        with self._lock:
+            segment = self._segments.get(segment_name)
+            if segment is None:
+                self._logger.warning(
+                    "Tried to query members for nonexistant segment %s. Returning False",
+                    segment_name
+                )
+                return set()
+            return set(key for key in keys if segment.contains(key))
+
+    def _compact(self, segment):
+        """
+        Return a compact copy of a segment if it's large enough, or the segment itself.
+
+        :param segment: Segment to store.
+        :type segment: splitio.models.segments.Segment
+
+        :rtype: splitio.models.segments.Segment
+        """
+        if not self._compact_segment_size or isinstance(segment, CompactSegment) \
+                or len(segment) < self._compact_segment_size:
+            return segment
+        return CompactSegment(segment.name, segment.keys, segment.change_number)
+
+    def get_key_segments(self, key):
+        """
+        Return the names of all the segments a key belongs to, if the reverse index is enabled.
+
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Names of the segments containing the key, or None if there's no index.
+        :rtype: frozenset(str)
+        """
+        if self._key_segments is None:
+            return None
+        with self._lock:
+            return self._key_segments.get(key, frozenset())
+
+    def _index(self, segment_name, added, removed):
+        """
+        Update the reverse index with the keys added to & removed from a segment.
+
+        Must be called with the lock held.
+
+        :param segment_name: Name of the updated segment.
+        :type segment_name: str
+        :param added: Keys that now belong to the segment.
+        :type added: iterable
+        :param removed: Keys that no longer belong to the segment.
+        :type removed: iterable
+        """
+        for key in added:
+            self._key_segments[key] = self._key_segments.get(key, frozenset()) | {segment_name}
+        for key in removed:
+            remaining = self._key_segments.get(key, frozenset()) - {segment_name}
+            if remaining:
+                self._key_segments[key] = remaining
+            else:
+                self._key_segments.pop(key, None)
+
+
+class BoundedQueue(object):  #pylint: disable=too-many-instance-attributes
+    """
+    Thread-safe FIFO queue backed by a deque, supporting bulk puts & pops.
+
+    When full, incoming items are handled according to an overflow policy:
+        - `drop_newest`: Incoming items are discarded.
+        - `drop_oldest`: The oldest queued items are discarded to make room.
+        - `sample`: Queued items are replaced at random (reservoir sampling), so that every
+          item offered since the last pop has the same chance of being kept.
+        - `block`: Callers wait for items to be popped, up to `block_timeout` seconds,
+          discarding whatever didn't fit after that.
+    """
+
+    OVERFLOW_DROP_NEWEST = 'drop_newest'
+    OVERFLOW_DROP_OLDEST = 'drop_oldest'
+    OVERFLOW_SAMPLE = 'sample'
+    OVERFLOW_BLOCK = 'block'
+
+    OVERFLOW_POLICIES = frozenset([
+        OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_SAMPLE, OVERFLOW_BLOCK
+    ])
+
+    def __init__(self, max_size, overflow_policy=OVERFLOW_DROP_NEWEST, block_timeout=None):
+        """
+        Class constructor.
+
+        :param max_size: Maximum number of items held. 0 or less for no limit.
+        :type max_size: int
+        :param overflow_policy: What to do with items that don't fit. One of OVERFLOW_POLICIES.
+        :type overflow_policy: str
+        :param block_timeout: Seconds to wait for room when using the `block` policy.
+            None to wait indefinitely.
+        :type block_timeout: float
+        """
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy: %s' % overflow_policy)
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._items = deque()
+        self._max_size = max_size
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self._random = random.Random()
+        self._offered = 0
+        self._dropped = 0
+
+    def _put_blocking(self, items):
+        """
+        Append items, waiting for room. Must be called with the lock acquired.
+
+        :param items: Items to append, in order.
+        :type items: list
+
+        :return: Number of items that didn't fit before the timeout expired.
+        :rtype: int
+        """
+        deadline = time.time() + self._block_timeout if self._block_timeout is not None \
+            else None
+        position = 0
+        while True:
+            available = self._max_size - len(self._items)
+            self._items.extend(items[position:position + available])
+            position += max(available, 0)
+            if position >= len(items):
+                return 0
+            remaining = deadline - time.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return len(items) - position
+            self._not_full.wait(remaining)
+
+    def _put_sampling(self, items):
+        """
+        Append items, sampling the ones that don't fit. Must be called with the lock acquired.
+
+        :param items: Items to append, in order.
+        :type items: list
+
+        :return: Number of items discarded.
+        :rtype: int
+        """
+        dropped = 0
+        for item in items:
+            self._offered += 1
+            if len(self._items) < self._max_size:
+                self._items.append(item)
+                continue
+            dropped += 1
+            index = self._random.randrange(self._offered)
+            if index < self._max_size:
+                self._items[index] = item
+        return dropped
+
+    def put_many(self, items):
+        """
+        Append items to the queue, applying the overflow policy to those that don't fit.
+
+        :param items: Items to append, in order.
+        :type items: list
+
+        :return: True if all the items were appended without discarding any. False otherwise.
+        :rtype: bool
+        """
+        with self._lock:
+            if self._max_size <= 0:
+                self._items.extend(items)
+                return True
+
+            if self._overflow_policy == self.OVERFLOW_BLOCK:
+                dropped = self._put_blocking(items)
+            elif self._overflow_policy == self.OVERFLOW_SAMPLE:
+                dropped = self._put_sampling(items)
+            elif self._overflow_policy == self.OVERFLOW_DROP_OLDEST:
+                self._items.extend(items)
+                dropped = max(len(self._items) - self._max_size, 0)
+                for _ in range(dropped):
+                    self._items.popleft()
+            else:
+                available = self._max_size - len(self._items)
+                self._items.extend(items[:available] if available > 0 else [])
+                dropped = len(items) - max(available, 0) if len(items) > available else 0
+
+            self._dropped += dropped
+            return dropped == 0
+
+    def pop_many(self, count):
+        """
+        Pop the oldest items from the queue.
+
+        :param count: Maximum number of items to pop.
+        :type count: int
+
+        :return: Popped items, oldest first.
+        :rtype: list
+        """
+        with self._lock:
+            if count >= len(self._items):
+                items, self._items = list(self._items), deque()
+            else:
+                popleft = self._items.popleft
+                items = [popleft() for _ in range(count)]
+            self._offered = len(self._items)
+            if items:
+                self._not_full.notify_all()
+            return items
+
+    @property
+    def maxsize(self):
+        """Return the maximum number of items held, as queue.Queue does."""
+        return self._max_size
+
+    @property
+    def dropped(self):
+        """Return the number of items discarded because the queue was full."""
+        return self._dropped
+
+    def __len__(self):
+        """Return the number of items in the queue."""
+        return len(self._items)
+
 
 class InMemoryImpressionStorage(ImpressionStorage):
     """In memory implementation of an impressions storage."""
 
-    def __init__(self, queue_size):
+    def __init__(self, queue_size, overflow_policy=BoundedQueue.OVERFLOW_DROP_NEWEST,
+                 block_timeout=None, high_water_mark=None):
         """
         Construct an instance.
 
-        :param eventsQueueSize: How many events to queue before forcing a submission
+        :param queue_size: How many impressions to queue before applying the overflow policy.
+        :type queue_size: int
+        :param overflow_policy: What to do with impressions that don't fit in the queue.
+        :type overflow_policy: str
+        :param block_timeout: Seconds to wait for room when using the `block` policy.
+        :type block_timeout: float
+        :param high_water_mark: Number of queued impressions that triggers the queue full hook.
+            None to trigger it only when the queue is full.
+        :type high_water_mark: int
         """
         self._logger = logging.getLogger(self.__class__.__name__)
-        self._impressions = queue.Queue(maxsize=queue_size)
-        self._lock = threading.Lock()
+        self._impressions = BoundedQueue(queue_size, overflow_policy, block_timeout)
+        self._counts = defaultdict(int)
+        self._counts_lock = threading.Lock()
+        self._high_water_mark = high_water_mark if high_water_mark is not None else queue_size
         self._queue_full_hook = None
+        self._hook_called = False
+        self._overflowing = False
 
     def set_queue_full_hook(self, hook):
         """
         Set a hook to be called when the queue is full.
 
+        The hook is called once each time the queue reaches its high water mark, until
+        impressions are popped.
+
         :param h: Hook to be called when the queue is full
         """
         if callable(hook):
@@ -237,19 +618,22 @@ class InMemoryImpressionStorage(ImpressionStorage):
         :param impressions: List of one or more impressions to store.
         :type impressions: list
         """
-        try:
-            with self._lock:
-                for impression in impressions:
-                    self._impressions.put(impression, False)
+        if self._queue_full_hook is not None and not self._hook_called and \
+                0 < self._high_water_mark <= len(self._impressions) + len(impressions):
+            self._hook_called = True
+            self._queue_full_hook()
+
+        if self._impressions.put_many(impressions):
+            self._overflowing = False
             return True
-        except queue.Full:
-            if self._queue_full_hook is not None and callable(self._queue_full_hook):
-                self._queue_full_hook()
+
+        if not self._overflowing:
+            self._overflowing = True
             self._logger.warning(
-                'Event queue is full, failing to add more events. \n'
-                'Consider increasing parameter `eventQueueSize` in configuration'
+                'Impressions queue is full, discarding impressions. \n'
+                'Consider increasing parameter `impressionsQueueSize` in configuration'
             )
-            return False
+        return False
 
     def pop_many(self, count):
         """
@@ -258,12 +642,37 @@ class InMemoryImpressionStorage(ImpressionStorage):
         :param count: Number of impressions to pop.
         :type count: int
         """
-        impressions = []
-        with self._lock:
-            while not self._impressions.empty() and count > 0:
-                impressions.append(self._impressions.get(False))
-                count -= 1
-        return impressions
+        self._hook_called = False
+        return self._impressions.pop_many(count)
+
+    def put_counts(self, counts):
+        """
+        Add impression counts per feature & hour.
+
+        :param counts: Impression counts.
+        :type counts: list(splitio.engine.impressions.CountPerFeature)
+        """
+        with self._counts_lock:
+            for count in counts:
+                self._counts[(count.feature, count.timeframe)] += count.count
+
+    def pop_counts(self):
+        """
+        Pop all impression counts in storage.
+
+        :rtype: list(splitio.engine.impressions.CountPerFeature)
+        """
+        with self._counts_lock:
+            counts, self._counts = self._counts, defaultdict(int)
+        return [
+            CountPerFeature(feature, timeframe, count)
+            for (feature, timeframe), count in six.iteritems(counts)
+        ]
+
+    @property
+    def dropped(self):
+        """Return the number of impressions discarded because the queue was full."""
+        return self._impressions.dropped
 
 
 class InMemoryEventStorage(EventStorage):
@@ -273,21 +682,36 @@ class InMemoryEventStorage(EventStorage):
     Supports adding and popping events.
     """
 
-    def __init__(self, eventsQueueSize):
+    def __init__(self, eventsQueueSize, overflow_policy=BoundedQueue.OVERFLOW_DROP_NEWEST,
+                 block_timeout=None, high_water_mark=None):
         """
         Construct an instance.
 
-        :param eventsQueueSize: How many events to queue before forcing a submission
+        :param eventsQueueSize: How many events to queue before applying the overflow policy.
+        :type eventsQueueSize: int
+        :param overflow_policy: What to do with events that don't fit in the queue.
+        :type overflow_policy: str
+        :param block_timeout: Seconds to wait for room when using the `block` policy.
+        :type block_timeout: float
+        :param high_water_mark: Number of queued events that triggers the queue full hook.
+            None to trigger it only when the queue is full.
+        :type high_water_mark: int
         """
         self._logger = logging.getLogger(self.__class__.__name__)
-        self._lock = threading.Lock()
-        self._events = queue.Queue(maxsize=eventsQueueSize)
+        self._events = BoundedQueue(eventsQueueSize, overflow_policy, block_timeout)
+        self._high_water_mark = high_water_mark if high_water_mark is not None \
+            else eventsQueueSize
         self._queue_full_hook = None
+        self._hook_called = False
+        self._overflowing = False
 
     def set_queue_full_hook(self, hook):
         """
         Set a hook to be called when the queue is full.
 
+        The hook is called once each time the queue reaches its high water mark, until
+        events are popped.
+
         :param h: Hook to be called when the queue is full
         """
         if callable(hook):
@@ -299,19 +723,22 @@ class InMemoryEventStorage(EventStorage):
 
         :param event: Event to be added in the storage
         """
-        try:
-            with self._lock:
-                for event in events:
-                    self._events.put(event, False)
+        if self._queue_full_hook is not None and not self._hook_called and \
+                0 < self._high_water_mark <= len(self._events) + len(events):
+            self._hook_called = True
+            self._queue_full_hook()
+
+        if self._events.put_many(events):
+            self._overflowing = False
             return True
-        except queue.Full:
-            if self._queue_full_hook is not None and callable(self._queue_full_hook):
-                self._queue_full_hook()
+
+        if not self._overflowing:
+            self._overflowing = True
             self._logger.warning(
-                'Events queue is full, failing to add more events. \n'
-                'Consider increasing parameter `impressionsQueueSize` in configuration'
+                'Events queue is full, discarding events. \n'
+                'Consider increasing parameter `eventsQueueSize` in configuration'
             )
-            return False
+        return False
 
     def pop_many(self, count):
         """
@@ -319,12 +746,13 @@ class InMemoryEventStorage(EventStorage):
 
         :param count: number of items to be retrieved and removed from the queue.
         """
-        events = []
-        with self._lock:
-            while not self._events.empty() and count > 0:
-                events.append(self._events.get(False))
-                count -= 1
-        return events
+        self._hook_called = False
+        return self._events.pop_many(count)
+
+    @property
+    def dropped(self):
+        """Return the number of events discarded because the queue was full."""
+        return self._events.dropped
 
 
 class InMemoryTelemetryStorage(TelemetryStorage):
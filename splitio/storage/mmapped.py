@@ -0,0 +1,402 @@
+"""
+Memory mapped segment storage module.
+
+Segments are kept in immutable files, one per segment, holding a sorted block of UTF-8 keys.
+Files are replaced atomically (written to a temporary file and renamed), so every process
+sharing the directory reads the same page-cached copy of each segment.
+
+File layout (little endian):
+    header: magic (8 bytes), change number (int64), number of keys (uint64)
+    offsets: number of keys + 1 uint32 offsets of each key within the key block
+    keys: sorted UTF-8 keys, concatenated
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from array import array
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+from six.moves.urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  #pylint: disable=invalid-name
+
+from splitio.models.segments import Segment
+from splitio.storage import SegmentStorage
+
+
+_MAGIC = b'SPLITSEG'
+_HEADER = struct.Struct('<8sqQ')
+_OFFSET = struct.Struct('<I')
+_MAX_DATA_SIZE = 2 ** 32 - 1
+
+_replace = getattr(os, 'replace', os.rename)  #pylint: disable=invalid-name
+
+
+def _encode(key):
+    """Return the UTF-8 representation of a key."""
+    return key.encode('utf-8') if not isinstance(key, bytes) else key
+
+
+class MappedSegment(object):
+    """Read-only view of a segment file."""
+
+    def __init__(self, path):
+        """
+        Class constructor.
+
+        :param path: Path of the segment file.
+        :type path: str
+        """
+        with open(path, 'rb') as flo:
+            self._stat = os.fstat(flo.fileno())
+            self._mmap = mmap.mmap(flo.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._change_number, self._count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError('%s is not a segment file' % path)
+        self._data_start = _HEADER.size + (self._count + 1) * _OFFSET.size
+
+    @property
+    def change_number(self):
+        """Return segment change number."""
+        return self._change_number
+
+    def is_current(self, path):
+        """
+        Return whether the file at a path is still the one mapped.
+
+        :param path: Path of the segment file.
+        :type path: str
+
+        :rtype: bool
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return (stat.st_ino, stat.st_dev, stat.st_mtime) == \
+            (self._stat.st_ino, self._stat.st_dev, self._stat.st_mtime)
+
+    def _key_at(self, index):
+        """Return the UTF-8 key at a position."""
+        position = _HEADER.size + index * _OFFSET.size
+        start = _OFFSET.unpack_from(self._mmap, position)[0]
+        end = _OFFSET.unpack_from(self._mmap, position + _OFFSET.size)[0]
+        return self._mmap[self._data_start + start:self._data_start + end]
+
+    def contains(self, key):
+        """
+        Return whether the supplied key belongs to the segment.
+
+        :param key: User key.
+        :type key: str
+
+        :rtype: bool
+        """
+        encoded = _encode(key)
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            current = self._key_at(middle)
+            if current < encoded:
+                low = middle + 1
+            elif current > encoded:
+                high = middle
+            else:
+                return True
+        return False
+
+    def encoded_keys(self):
+        """Return a generator of the UTF-8 keys in the segment, sorted."""
+        return (self._key_at(index) for index in range(self._count))
+
+
+def write_segment_file(path, encoded_keys, change_number):
+    """
+    Write a segment file, atomically replacing any previous one.
+
+    :param path: Path of the segment file.
+    :type path: str
+    :param encoded_keys: Sorted and unique UTF-8 encoded keys.
+    :type encoded_keys: iterable(bytes)
+    :param change_number: Segment change number.
+    :type change_number: int
+    """
+    data = bytearray()
+    offsets = array('I', [0])
+    for key in encoded_keys:
+        data.extend(key)
+        if len(data) > _MAX_DATA_SIZE:
+            raise ValueError('Segment too large to be stored in %s' % path)
+        offsets.append(len(data))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    directory = os.path.dirname(path)
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as flo:
+            flo.write(_HEADER.pack(_MAGIC, change_number, len(offsets) - 1))
+            flo.write(offsets.tobytes() if hasattr(offsets, 'tobytes') else offsets.tostring())
+            flo.write(bytes(data))
+        _replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+
+class MMapSegmentStorage(SegmentStorage):
+    """
+    Segment storage keeping each segment in a memory mapped file.
+
+    Many processes can share a directory. Files replaced by other processes are picked up
+    within `refresh_interval` seconds. Relies on POSIX rename semantics to replace files that
+    are mapped by other processes. Only the process holding the writer lock is expected to
+    write to the directory.
+    """
+
+    _FILE_SUFFIX = '.segment'
+    _WRITER_LOCK_FILE = '.writer.lock'
+
+    def __init__(self, directory, refresh_interval=1):
+        """
+        Class constructor.
+
+        :param directory: Directory holding the segment files. Created if it doesn't exist.
+        :type directory: str
+        :param refresh_interval: Seconds between checks for segment files replaced by other
+            processes.
+        :type refresh_interval: int
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._directory = directory
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._mapped = {}
+        self._version = 0
+        self._version_checked_at = 0
+        self._writer_lock_file = None
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _get_path(self, segment_name):
+        """
+        Build the path of the file holding a segment.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+
+        :rtype: str
+        """
+        return os.path.join(self._directory, quote(segment_name, safe='') + self._FILE_SUFFIX)
+
+    def _get_mapped(self, segment_name, force=False):
+        """
+        Return the current mapping of a segment file.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param force: Whether to check for a replaced file even if it was checked recently.
+        :type force: bool
+
+        :return: Mapped segment, or None if the segment isn't stored.
+        :rtype: MappedSegment
+        """
+        mapped, checked_at = self._mapped.get(segment_name, (None, 0))
+        now = time.time()
+        if not force and now - checked_at < self._refresh_interval:
+            return mapped
+
+        path = self._get_path(segment_name)
+        with self._lock:
+            if mapped is None or not mapped.is_current(path):
+                previous = mapped
+                try:
+                    mapped = MappedSegment(path)
+                except (IOError, OSError):
+                    mapped = None
+                except ValueError:
+                    self._logger.error('Invalid file for segment %s', segment_name)
+                    mapped = None
+                if mapped is not None or previous is not None:
+                    self._version += 1
+            # Replaced mappings are left to be unmapped when garbage collected, as lookups
+            # from other threads may still be using them.
+            self._mapped[segment_name] = (mapped, now)
+        return mapped
+
+    def _write(self, segment_name, encoded_keys, change_number):
+        """
+        Store a segment file and map it.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param encoded_keys: Sorted and unique UTF-8 encoded keys.
+        :type encoded_keys: iterable(bytes)
+        :param change_number: Segment change number.
+        :type change_number: int
+        """
+        path = self._get_path(segment_name)
+        write_segment_file(path, encoded_keys, change_number)
+        with self._lock:
+            self._mapped[segment_name] = (MappedSegment(path), time.time())
+            self._version += 1
+
+    def get_version(self):
+        """
+        Return a number that increases every time a segment file is mapped again.
+
+        Files replaced by other processes are looked for at most once every `refresh_interval`
+        seconds, so results memoized against a version may be that much out of date.
+
+        :rtype: int
+        """
+        if time.time() - self._version_checked_at >= self._refresh_interval:
+            self.refresh()
+        return self._version
+
+    def refresh(self):
+        """Map again the segment files replaced by other processes, without waiting."""
+        self._version_checked_at = time.time()
+        for segment_name in list(self._mapped.keys()):
+            self._get_mapped(segment_name, True)
+
+    def acquire_writer_lock(self):
+        """
+        Try to become the only process writing segments to the directory.
+
+        The lock is held until the process exits, after which another process can take it.
+        Platforms without `fcntl` can't coordinate, so every process is allowed to write.
+
+        :return: Whether this storage is the writer.
+        :rtype: bool
+        """
+        if fcntl is None or self._writer_lock_file is not None:
+            return True
+        flo = open(os.path.join(self._directory, self._WRITER_LOCK_FILE), 'a')
+        try:
+            fcntl.flock(flo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError):
+            flo.close()
+            return False
+        self._writer_lock_file = flo
+        return True
+
+    def get(self, segment_name):
+        """
+        Retrieve a segment.
+
+        :param segment_name: Name of the segment to fetch.
+        :type segment_name: str
+
+        :return: Segment object if stored. None otherwise.
+        :rtype: splitio.models.segments.Segment
+        """
+        mapped = self._get_mapped(segment_name)
+        if mapped is None:
+            self._logger.warning("Tried to retrieve nonexistant segment %s. Skipping", segment_name)
+            return None
+        return Segment(
+            segment_name,
+            [key.decode('utf-8') for key in mapped.encoded_keys()],
+            mapped.change_number
+        )
+
+    def put(self, segment):
+        """
+        Store a segment.
+
+        :param segment: Segment to store.
+        :type segment: splitio.models.segments.Segment
+        """
+        self._write(
+            segment.name,
+            sorted(_encode(key) for key in segment.keys),
+            segment.change_number
+        )
+
+    def update(self, segment_name, to_add, to_remove, change_number=None):
+        """
+        Update a segment, rewriting its file. Create it if it doesn't exist.
+
+        :param segment_name: Name of the segment to update.
+        :type segment_name: str
+        :param to_add: Set of members to add to the segment.
+        :type to_add: set
+        :param to_remove: List of members to remove from the segment.
+        :type to_remove: Set
+        """
+        mapped = self._get_mapped(segment_name)
+        if mapped is None:
+            self.put(Segment(segment_name, to_add, change_number))
+            return
+
+        removed = set(_encode(key) for key in to_remove)
+        added = set(_encode(key) for key in to_add) - removed
+        self._write(
+            segment_name,
+            heapq.merge(
+                (key for key in mapped.encoded_keys() if key not in removed and key not in added),
+                sorted(added)
+            ),
+            change_number if change_number is not None else mapped.change_number
+        )
+
+    def get_change_number(self, segment_name):
+        """
+        Retrieve latest change number for a segment.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+
+        :rtype: int
+        """
+        mapped = self._get_mapped(segment_name)
+        return mapped.change_number if mapped is not None else None
+
+    def set_change_number(self, segment_name, new_change_number):
+        """
+        Set the latest change number, rewriting the segment file.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param new_change_number: New change number.
+        :type new_change_number: int
+        """
+        mapped = self._get_mapped(segment_name)
+        if mapped is None or mapped.change_number == new_change_number:
+            return
+        self._write(segment_name, mapped.encoded_keys(), new_change_number)
+
+    def segment_contains(self, segment_name, key):
+        """
+        Check whether a specific key belongs to a segment in storage.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param key: Key to search for.
+        :type key: str
+
+        :return: True if the segment contains the key. False otherwise.
+        :rtype: bool
+        """
+        mapped = self._get_mapped(segment_name)
+        if mapped is None:
+            self._logger.warning(
+                "Tried to query members for nonexistant segment %s. Returning False",
+                segment_name
+            )
+            return False
+        return mapped.contains(key)
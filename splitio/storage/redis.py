@@ -4,10 +4,16 @@ from __future__ import absolute_import, division, print_function, \
 
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
+
+import six
 
 from splitio.models.impressions import Impression
 from splitio.models import splits, segments
 from splitio.storage import SplitStorage, SegmentStorage, ImpressionStorage, EventStorage
+from splitio.storage.inmemmory import BoundedQueue
 from splitio.storage.adapters.redis import RedisAdapterException
 
 
@@ -16,16 +22,47 @@ class RedisSplitStorage(SplitStorage):
 
     _SPLIT_KEY = 'SPLITIO.split.{split_name}'
     _SPLIT_TILL_KEY = 'SPLITIO.splits.till'
+    _SPLIT_NAMES_KEY = 'SPLITIO.splits.names'
+    _SCAN_COUNT = 1000
+    _MGET_CHUNK_SIZE = 500
 
-    def __init__(self, redis_client):
+    def __init__(self, redis_client, cache_validation_interval=0):
         """
         Class constructor.
 
+        Parsed splits can be kept in process, in which case the cache is dropped as soon as the
+        change number in redis advances. The change number is checked at most once every
+        `cache_validation_interval` milliseconds, so cached splits may be that much out of date.
+
         :param redis_client: Redis client or compliant interface.
         :type redis_client: splitio.storage.adapters.redis.RedisAdapter
+        :param cache_validation_interval: Milliseconds between change number checks. 0 disables
+            the cache.
+        :type cache_validation_interval: int
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._redis = redis_client
+        self._cache_validation_interval = cache_validation_interval / 1000.0
+        self._cache = {}
+        self._cache_change_number = None
+        self._cache_validated_at = 0
+
+    def _get_cache(self):
+        """
+        Return the cache of parsed splits, dropping it if the change number has advanced.
+
+        :return: Mapping of split names to splits.
+        :rtype: dict
+        """
+        now = time.time()
+        if now - self._cache_validated_at >= self._cache_validation_interval:
+            change_number = self.get_change_number()
+            if change_number is None or change_number != self._cache_change_number:
+                # Splits being fetched while replacing the cache are stored in the old one.
+                self._cache = {}
+                self._cache_change_number = change_number
+            self._cache_validated_at = now
+        return self._cache
 
     def _get_key(self, split_name):
         """
@@ -49,14 +86,64 @@ class RedisSplitStorage(SplitStorage):
         :return: A split object parsed from redis if the key exists. None otherwise
         :rtype: splitio.models.splits.Split
         """
+        cache = None
+        if self._cache_validation_interval > 0:
+            cache = self._get_cache()
+            split = cache.get(split_name)
+            if split is not None:
+                return split
+
         try:
             raw = self._redis.get(self._get_key(split_name))
-            return splits.from_raw(json.loads(raw)) if raw is not None else None
+            split = splits.from_raw(json.loads(raw)) if raw is not None else None
+            if cache is not None and split is not None:
+                cache[split_name] = split
+            return split
         except RedisAdapterException:
             self._logger.error('Error fetching split from storage')
             self._logger.debug('Error: ', exc_info=True)
             return None
 
+    def fetch_many(self, split_names):
+        """
+        Retrieve many splits with a single MGET.
+
+        :param split_names: Names of the features to fetch.
+        :type split_names: list(str)
+
+        :return: Mapping of split names to splits (None if not found).
+        :rtype: dict
+        """
+        cache = None
+        to_return = {}
+        to_fetch = list(split_names)
+        if self._cache_validation_interval > 0:
+            cache = self._get_cache()
+            for split_name in split_names:
+                to_return[split_name] = cache.get(split_name)
+            to_fetch = [name for name, split in to_return.items() if split is None]
+
+        if not to_fetch:
+            return to_return
+
+        try:
+            raw_splits = self._redis.mget([self._get_key(name) for name in to_fetch])
+        except RedisAdapterException:
+            self._logger.error('Error fetching splits from storage')
+            self._logger.debug('Error: ', exc_info=True)
+            raw_splits = [None] * len(to_fetch)
+
+        for split_name, raw in zip(to_fetch, raw_splits):
+            try:
+                split = splits.from_raw(json.loads(raw)) if raw is not None else None
+            except ValueError:
+                self._logger.error('Could not parse split %s. Skipping', split_name)
+                split = None
+            if cache is not None and split is not None:
+                cache[split_name] = split
+            to_return[split_name] = split
+        return to_return
+
     def put(self, split):
         """
         Store a split.
@@ -78,6 +165,38 @@ class RedisSplitStorage(SplitStorage):
         """
         raise NotImplementedError('Only redis-consumer mode is supported.')
 
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Store & remove a set of splits and update the change number in a single transaction.
+
+        The split names index read by `get_split_names` is kept up to date as well. The sdk only
+        reads from redis, so this is meant for the process populating it (ie: a synchronizer
+        built on this storage) and for tests.
+
+        :param to_put: Splits to store.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: New change number.
+        :type change_number: int
+        """
+        pipe = self._redis.pipeline()
+        for split in to_put:
+            pipe.set(self._get_key(split.name), json.dumps(split.to_json()))
+        if to_put:
+            pipe.sadd(self._SPLIT_NAMES_KEY, *[split.name for split in to_put])
+        if to_remove:
+            pipe.delete(*[self._get_key(split_name) for split_name in to_remove])
+            pipe.srem(self._SPLIT_NAMES_KEY, *to_remove)
+        pipe.set(self._SPLIT_TILL_KEY, change_number)
+        try:
+            pipe.execute()
+        except RedisAdapterException:
+            # Re-raised so that callers don't assume the change number advanced.
+            self._logger.error('Error applying split changes to storage')
+            self._logger.debug('Error: ', exc_info=True)
+            raise
+
     def get_change_number(self):
         """
         Retrieve latest split change number.
@@ -105,12 +224,21 @@ class RedisSplitStorage(SplitStorage):
         """
         Retrieve a list of all split names.
 
+        Names are read from the split names index when the producer maintains it. Otherwise,
+        split keys are found with SCAN, which doesn't block redis like KEYS does.
+
         :return: List of split names.
         :rtype: list(str)
         """
         try:
-            keys = self._redis.keys(self._get_key('*'))
-            return [key.replace(self._get_key(''), '') for key in keys]
+            names = self._redis.smembers(self._SPLIT_NAMES_KEY)
+            if names:
+                return list(names)
+            prefix = self._get_key('')
+            return [
+                key[len(prefix):]
+                for key in self._redis.scan_iter(self._get_key('*'), self._SCAN_COUNT)
+            ]
         except RedisAdapterException:
             self._logger.error('Error fetching split names from storage')
             self._logger.debug('Error: ', exc_info=True)
@@ -120,18 +248,26 @@ class RedisSplitStorage(SplitStorage):
         """
         Return all the splits in cache.
 
+        Splits are fetched with a single pipeline of MGETs of up to `_MGET_CHUNK_SIZE` keys.
+
         :return: List of all splits in cache.
         :rtype: list(splitio.models.splits.Split)
         """
-        keys = self._redis.keys(self._get_key('*'))
+        keys = [self._get_key(split_name) for split_name in self.get_split_names()]
         to_return = []
         try:
-            raw_splits = self._redis.mget(keys)
-            for raw in raw_splits:
-                try:
-                    to_return.append(splits.from_raw(json.loads(raw)))
-                except ValueError:
-                    self._logger.error('Could not parse split. Skipping')
+            pipe = self._redis.pipeline(transaction=False)
+            for index in range(0, len(keys), self._MGET_CHUNK_SIZE):
+                pipe.mget(keys[index:index + self._MGET_CHUNK_SIZE])
+            for raw_splits in pipe.execute():
+                for raw in raw_splits:
+                    # Splits removed since the names were read are skipped.
+                    if raw is None:
+                        continue
+                    try:
+                        to_return.append(splits.from_raw(json.loads(raw)))
+                    except ValueError:
+                        self._logger.error('Could not parse split. Skipping')
         except RedisAdapterException:
             self._logger.error('Error fetching all splits from storage')
             self._logger.debug('Error: ', exc_info=True)
@@ -143,6 +279,7 @@ class RedisSegmentStorage(SegmentStorage):
 
     _SEGMENTS_KEY = 'SPLITIO.segment.{segment_name}'
     _SEGMENTS_TILL_KEY = 'SPLITIO.segment.{segment_name}.till'
+    _SISMEMBER_CHUNK_SIZE = 1000
 
     def __init__(self, redis_client):
         """
@@ -240,6 +377,31 @@ class RedisSegmentStorage(SegmentStorage):
         """
         raise NotImplementedError('Only redis-consumer mode is supported.')
 
+    def get_segment_memberships(self, segment_names, key):
+        """
+        Return whether a key belongs to each of many segments, with a single pipelined batch.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: iterable(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Mapping of segment names to whether they contain the key, or None if the
+            memberships couldn't be fetched.
+        :rtype: dict
+        """
+        segment_names = list(segment_names)
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for segment_name in segment_names:
+                pipe.sismember(self._get_key(segment_name), key)
+            results = pipe.execute()
+        except RedisAdapterException:
+            self._logger.error('Error fetching segment memberships from storage')
+            self._logger.debug('Error: ', exc_info=True)
+            return None
+        return {name: bool(result) for name, result in zip(segment_names, results)}
+
     def put(self, segment):
         """
         Store a segment.
@@ -268,14 +430,51 @@ class RedisSegmentStorage(SegmentStorage):
             self._logger.debug('Error: ', exc_info=True)
             return None
 
+    def segment_contains_keys(self, segment_name, keys):
+        """
+        Return which of the supplied keys belong to a segment in storage.
+
+        Keys are tested with a single pipeline of SISMEMBERs, sent in chunks of
+        `_SISMEMBER_CHUNK_SIZE` keys.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param keys: Keys to search for.
+        :type keys: list(str)
+
+        :return: Set of keys contained in the segment.
+        :rtype: set(str)
+        """
+        keys = list(keys)
+        segment_key = self._get_key(segment_name)
+        contained = set()
+        try:
+            for index in range(0, len(keys), self._SISMEMBER_CHUNK_SIZE):
+                chunk = keys[index:index + self._SISMEMBER_CHUNK_SIZE]
+                pipe = self._redis.pipeline(transaction=False)
+                for key in chunk:
+                    pipe.sismember(segment_key, key)
+                contained.update(key for key, result in zip(chunk, pipe.execute()) if result)
+        except RedisAdapterException:
+            self._logger.error('Error testing members in segment stored in redis')
+            self._logger.debug('Error: ', exc_info=True)
+        return contained
+
 
 class RedisImpressionsStorage(ImpressionStorage):
-    """Redis based event storage class."""
+    """
+    Redis based impressions storage class.
+
+    Impressions are pushed to redis as they're put, unless a queue size is supplied. In that
+    case they're queued in memory and pushed in bulk by `flush`, which is meant to be called
+    periodically by a `splitio.tasks.storage_flush.StorageFlushTask`.
+    """
 
     IMPRESSIONS_QUEUE_KEY = 'SPLITIO.impressions'
     IMPRESSIONS_KEY_DEFAULT_TTL = 3600
+    IMPRESSIONS_COUNT_KEY = 'SPLITIO.impressions.count'
 
-    def __init__(self, redis_client, sdk_metadata):
+    def __init__(self, redis_client, sdk_metadata, queue_size=0, bulk_size=5000):
         """
         Class constructor.
 
@@ -283,44 +482,76 @@ class RedisImpressionsStorage(ImpressionStorage):
         :type redis_client: splitio.storage.adapters.redis.RedisAdapter
         :param sdk_metadata: SDK & Machine information.
         :type sdk_metadata: splitio.client.util.SdkMetadata
+        :param queue_size: How many impressions to queue in memory before discarding them.
+            0 to push impressions to redis as they're put.
+        :type queue_size: int
+        :param bulk_size: Maximum number of impressions pushed by a single RPUSH when flushing.
+        :type bulk_size: int
         """
         self._redis = redis_client
         self._sdk_metadata = sdk_metadata
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._metadata_fragment = '{"m": %s, "i": ' % json.dumps({
+            's': sdk_metadata.sdk_version,
+            'n': sdk_metadata.instance_name,
+            'i': sdk_metadata.instance_ip,
+        })
+        self._queue = BoundedQueue(queue_size) if queue_size > 0 else None
+        self._queue_size = queue_size
+        self._bulk_size = bulk_size
+        self._queue_full_hook = None
+        self._hook_called = False
+        self._overflowing = False
 
-    def put(self, impressions):
+    def set_queue_full_hook(self, hook):
         """
-        Add an event to the redis storage.
+        Set a hook to be called when the in-memory queue is full.
 
-        :param event: Event to add to the queue.
-        :type event: splitio.models.events.Event
+        The hook is called once each time the queue fills up, until impressions are flushed.
 
-        :return: Whether the event has been added or not.
+        :param h: Hook to be called when the queue is full
+        """
+        if callable(hook):
+            self._queue_full_hook = hook
+
+    def _serialize(self, impression):
+        """
+        Build the JSON representation of an impression, including the SDK metadata.
+
+        :param impression: Impression to serialize.
+        :type impression: splitio.models.impressions.Impression
+
+        :rtype: str
+        """
+        return self._metadata_fragment + json.dumps({
+            'k': impression.matching_key,
+            'b': impression.bucketing_key,
+            'f': impression.feature_name,
+            't': impression.treatment,
+            'r': impression.label,
+            'c': impression.change_number,
+            'm': impression.time,
+        }) + '}'
+
+    def _push(self, bulks):
+        """
+        Push serialized impressions in a single round-trip.
+
+        The queue key TTL is only set when the push created the queue, so that a steady flow
+        of writes doesn't keep an unconsumed queue alive forever.
+
+        :param bulks: Lists of serialized impressions, each one sent with a single RPUSH.
+        :type bulks: list(list(str))
+
+        :return: Whether the impressions have been pushed or not.
         :rtype: bool
         """
-        bulk_impressions = []
-        for impression in impressions:
-            if isinstance(impression, Impression):
-                to_store = {
-                    'm': {  # METADATA PORTION
-                        's': self._sdk_metadata.sdk_version,
-                        'n': self._sdk_metadata.instance_name,
-                        'i': self._sdk_metadata.instance_ip,
-                    },
-                    'i': {  # IMPRESSION PORTION
-                        'k': impression.matching_key,
-                        'b': impression.bucketing_key,
-                        'f': impression.feature_name,
-                        't': impression.treatment,
-                        'r': impression.label,
-                        'c': impression.change_number,
-                        'm': impression.time,
-                    }
-                }
-                bulk_impressions.append(json.dumps(to_store))
         try:
-            inserted = self._redis.rpush(self.IMPRESSIONS_QUEUE_KEY, *bulk_impressions)
-            if inserted == len(bulk_impressions):
+            pipe = self._redis.pipeline(transaction=False)
+            for bulk in bulks:
+                pipe.rpush(self.IMPRESSIONS_QUEUE_KEY, *bulk)
+            inserted = pipe.execute()[-1]
+            if inserted == sum(len(bulk) for bulk in bulks):
                 self._logger.debug("SET EXPIRE KEY FOR QUEUE")
                 self._redis.expire(self.IMPRESSIONS_QUEUE_KEY, self.IMPRESSIONS_KEY_DEFAULT_TTL)
             return True
@@ -329,6 +560,63 @@ class RedisImpressionsStorage(ImpressionStorage):
             self._logger.error('Error: ', exc_info=True)
             return False
 
+    def put(self, impressions):
+        """
+        Add impressions to the redis storage, or to the in-memory queue if there's one.
+
+        :param impressions: Impressions to add.
+        :type impressions: list(splitio.models.impressions.Impression)
+
+        :return: Whether the impressions have been added or not.
+        :rtype: bool
+        """
+        bulk_impressions = [
+            self._serialize(impression) for impression in impressions
+            if isinstance(impression, Impression)
+        ]
+        if not bulk_impressions:
+            return True
+
+        if self._queue is None:
+            return self._push([bulk_impressions])
+
+        if self._queue_full_hook is not None and not self._hook_called and \
+                self._queue_size <= len(self._queue) + len(bulk_impressions):
+            self._hook_called = True
+            self._queue_full_hook()
+
+        if self._queue.put_many(bulk_impressions):
+            self._overflowing = False
+            return True
+
+        if not self._overflowing:
+            self._overflowing = True
+            self._logger.warning(
+                'Impressions queue is full, discarding impressions. \n'
+                'Consider increasing parameter `redisImpressionsQueueSize` in configuration'
+            )
+        return False
+
+    def flush(self):
+        """
+        Push every impression in the in-memory queue to redis.
+
+        :return: Number of impressions pushed.
+        :rtype: int
+        """
+        if self._queue is None:
+            return 0
+
+        self._hook_called = False
+        bulks = []
+        bulk = self._queue.pop_many(self._bulk_size)
+        while bulk:
+            bulks.append(bulk)
+            bulk = self._queue.pop_many(self._bulk_size)
+        if not bulks or not self._push(bulks):
+            return 0
+        return sum(len(bulk) for bulk in bulks)
+
     def pop_many(self, count):
         """
         Pop the oldest N events from storage.
@@ -338,6 +626,46 @@ class RedisImpressionsStorage(ImpressionStorage):
         """
         raise NotImplementedError('Only redis-consumer mode is supported.')
 
+    def put_counts(self, counts):
+        """
+        Add impression counts to a hash with a `<feature>::<timeframe>` field per count.
+
+        As with the impressions queue, the key TTL is only set when the hash is created.
+
+        :param counts: Impression counts.
+        :type counts: list(splitio.engine.impressions.CountPerFeature)
+
+        :return: Whether the counts have been added or not.
+        :rtype: bool
+        """
+        if not counts:
+            return True
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.exists(self.IMPRESSIONS_COUNT_KEY)
+            for count in counts:
+                pipe.hincrby(
+                    self.IMPRESSIONS_COUNT_KEY,
+                    '%s::%d' % (count.feature, count.timeframe),
+                    count.count
+                )
+            if not pipe.execute()[0]:
+                self._redis.expire(self.IMPRESSIONS_COUNT_KEY, self.IMPRESSIONS_KEY_DEFAULT_TTL)
+            return True
+        except RedisAdapterException:
+            self._logger.error('Something went wrong when trying to add impression counts to redis')
+            self._logger.error('Error: ', exc_info=True)
+            return False
+
+    def pop_counts(self):
+        """
+        Pop all impression counts in storage.
+
+        :rtype: list(splitio.engine.impressions.CountPerFeature)
+        """
+        raise NotImplementedError('Only redis-consumer mode is supported.')
+
 
 class RedisEventsStorage(EventStorage):
     """Redis based event storage class."""
@@ -404,13 +732,19 @@ class RedisEventsStorage(EventStorage):
 
 
 class RedisTelemetryStorage(object):
-    """Redis-based Telemetry storage."""
+    """
+    Redis-based Telemetry storage.
+
+    Metrics are written to redis as they're recorded, unless `aggregate` is set. In that case
+    they're accumulated in memory and written in a single pipeline by `flush`, which is meant to
+    be called periodically by a `splitio.tasks.storage_flush.StorageFlushTask`.
+    """
 
     _LATENCY_KEY_TEMPLATE = "SPLITIO/{sdk}/{instance}/latency.{name}.bucket.{bucket}"
     _COUNTER_KEY_TEMPLATE = "SPLITIO/{sdk}/{instance}/count.{name}"
     _GAUGE_KEY_TEMPLATE = "SPLITIO/{sdk}/{instance}/gauge.{name}"
 
-    def __init__(self, redis_client, sdk_metadata):
+    def __init__(self, redis_client, sdk_metadata, aggregate=False):
         """
         Class constructor.
 
@@ -418,10 +752,38 @@ class RedisTelemetryStorage(object):
         :type redis_client: splitio.storage.adapters.redis.RedisAdapter
         :param sdk_metadata: SDK & Machine information.
         :type sdk_metadata: splitio.client.util.SdkMetadata
+        :param aggregate: Whether to accumulate metrics in memory until flushed.
+        :type aggregate: bool
         """
         self._redis = redis_client
         self._metadata = sdk_metadata
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._keys = {}
+        self._aggregate = aggregate
+        self._lock = threading.Lock()
+        self._increments = defaultdict(int)
+        self._gauges = {}
+
+    def _get_key(self, template, **kwargs):
+        """
+        Instantiate a key template, memoizing the result.
+
+        :param template: Key template.
+        :type template: str
+
+        :return: Redis key.
+        :rtype: str
+        """
+        memo_key = (template, kwargs.get('name'), kwargs.get('bucket'))
+        key = self._keys.get(memo_key)
+        if key is None:
+            key = template.format(
+                sdk=self._metadata.sdk_version,
+                instance=self._metadata.instance_name,
+                **kwargs
+            )
+            self._keys[memo_key] = key
+        return key
 
     def _get_latency_key(self, name, bucket):
         """
@@ -435,12 +797,7 @@ class RedisTelemetryStorage(object):
         :return: Redis latency key.
         :rtype: str
         """
-        return self._LATENCY_KEY_TEMPLATE.format(
-            sdk=self._metadata.sdk_version,
-            instance=self._metadata.instance_name,
-            name=name,
-            bucket=bucket
-        )
+        return self._get_key(self._LATENCY_KEY_TEMPLATE, name=name, bucket=bucket)
 
     def _get_counter_key(self, name):
         """
@@ -452,11 +809,7 @@ class RedisTelemetryStorage(object):
         :return: Redis counter key.
         :rtype: str
         """
-        return self._COUNTER_KEY_TEMPLATE.format(
-            sdk=self._metadata.sdk_version,
-            instance=self._metadata.instance_name,
-            name=name
-        )
+        return self._get_key(self._COUNTER_KEY_TEMPLATE, name=name)
 
     def _get_gauge_key(self, name):
         """
@@ -468,11 +821,20 @@ class RedisTelemetryStorage(object):
         :return: Redis latency key.
         :rtype: str
         """
-        return self._GAUGE_KEY_TEMPLATE.format(
-            sdk=self._metadata.sdk_version,
-            instance=self._metadata.instance_name,
-            name=name,
-        )
+        return self._get_key(self._GAUGE_KEY_TEMPLATE, name=name)
+
+    def _increment(self, key):
+        """
+        Increment a key, or its in-memory accumulator when aggregating.
+
+        :param key: Redis key.
+        :type key: str
+        """
+        if self._aggregate:
+            with self._lock:
+                self._increments[key] += 1
+            return
+        self._redis.incr(key)
 
     def inc_latency(self, name, bucket):
         """
@@ -489,7 +851,7 @@ class RedisTelemetryStorage(object):
 
         key = self._get_latency_key(name, bucket)
         try:
-            self._redis.incr(key)
+            self._increment(key)
         except RedisAdapterException:
             self._logger.error('Something went wrong when trying to store latency in redis')
             self._logger.debug('Error: ', exc_info=True)
@@ -503,7 +865,7 @@ class RedisTelemetryStorage(object):
         """
         key = self._get_counter_key(name)
         try:
-            self._redis.incr(key)
+            self._increment(key)
         except RedisAdapterException:
             self._logger.error('Something went wrong when trying to increment counter in redis')
             self._logger.debug('Error: ', exc_info=True)
@@ -518,12 +880,42 @@ class RedisTelemetryStorage(object):
         :type value: int
         """
         key = self._get_gauge_key(name)
+        if self._aggregate:
+            with self._lock:
+                self._gauges[key] = value
+            return
         try:
             self._redis.set(key, value)
         except RedisAdapterException:
             self._logger.error('Something went wrong when trying to set gauge in redis')
             self._logger.debug('Error: ', exc_info=True)
 
+    def flush(self):
+        """
+        Write the metrics accumulated in memory to redis with a single pipeline.
+
+        :return: Number of keys written.
+        :rtype: int
+        """
+        with self._lock:
+            increments, self._increments = self._increments, defaultdict(int)
+            gauges, self._gauges = self._gauges, {}
+        if not increments and not gauges:
+            return 0
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, amount in six.iteritems(increments):
+                pipe.incr(key, amount)
+            for key, value in six.iteritems(gauges):
+                pipe.set(key, value)
+            pipe.execute()
+            return len(increments) + len(gauges)
+        except RedisAdapterException:
+            self._logger.error('Something went wrong when trying to store telemetry in redis')
+            self._logger.debug('Error: ', exc_info=True)
+            return 0
+
     def pop_counters(self):
         """
         Get all the counters.
@@ -7,6 +7,7 @@ from splitio.storage import SplitStorage, SegmentStorage, ImpressionStorage, Eve
 from splitio.models import splits, segments
 from splitio.models.impressions import Impression
 from splitio.models.events import Event
+from splitio.engine.impressions import CountPerFeature
 from splitio.storage.adapters.uwsgi_cache import _SPLITIO_CHANGE_NUMBERS, \
     _SPLITIO_EVENTS_CACHE_NAMESPACE, _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE, \
      _SPLITIO_METRICS_CACHE_NAMESPACE, _SPLITIO_MISC_NAMESPACE, UWSGILock, \
@@ -117,6 +118,52 @@ class UWSGISplitStorage(SplitStorage):
             self._logger.warning("Trying to retrieve nonexistant split %s. Ignoring.", split_name)
         return result
 
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Store & remove a set of splits and update the change number.
+
+        The feature list is rewritten once for the whole set of changes.
+
+        :param to_put: Splits to store.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: New change number.
+        :type change_number: int
+        """
+        for split in to_put:
+            self._uwsgi.cache_update(
+                self._KEY_TEMPLATE.format(suffix=split.name),
+                json.dumps(split.to_json()),
+                0,
+                _SPLITIO_SPLITS_CACHE_NAMESPACE
+            )
+
+        if to_put or to_remove:
+            with UWSGILock(self._uwsgi, self._KEY_FEATURE_LIST_LOCK):
+                try:
+                    current = set(json.loads(
+                        self._uwsgi.cache_get(self._KEY_FEATURE_LIST, _SPLITIO_MISC_NAMESPACE)
+                    ))
+                except TypeError:
+                    current = set()
+                current.update(split.name for split in to_put)
+                current.difference_update(to_remove)
+                self._uwsgi.cache_update(
+                    self._KEY_FEATURE_LIST,
+                    json.dumps(list(current)),
+                    0,
+                    _SPLITIO_MISC_NAMESPACE
+                )
+
+        for split_name in to_remove:
+            self._uwsgi.cache_del(
+                self._KEY_TEMPLATE.format(suffix=split_name),
+                _SPLITIO_SPLITS_CACHE_NAMESPACE
+            )
+
+        self.set_change_number(change_number)
+
     def get_change_number(self):
         """
         Retrieve latest split change number.
@@ -295,6 +342,23 @@ class UWSGISegmentStorage(SegmentStorage):
         segment = self.get(segment_name)
         return segment.contains(key)
 
+    def segment_contains_keys(self, segment_name, keys):
+        """
+        Return which of the supplied keys belong to a segment in storage.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param keys: Keys to search for.
+        :type keys: list(str)
+
+        :return: Set of keys contained in the segment.
+        :rtype: set(str)
+        """
+        segment = self.get(segment_name)
+        if segment is None:
+            return set()
+        return set(key for key in keys if segment.contains(key))
+
 
 class UWSGIImpressionStorage(ImpressionStorage):
     """Impressions storage interface."""
@@ -302,6 +366,7 @@ class UWSGIImpressionStorage(ImpressionStorage):
     _IMPRESSIONS_KEY = 'SPLITIO.impressions.'
     _LOCK_IMPRESSION_KEY = 'SPLITIO.impressions_lock'
     _IMPRESSIONS_FLUSH = 'SPLITIO.impressions_flush'
+    _IMPRESSIONS_COUNT_KEY = 'SPLITIO.impressions_count'
     _OVERWRITE_LOCK_SECONDS = 5
 
     def __init__(self, adapter):
@@ -371,6 +436,54 @@ class UWSGIImpressionStorage(ImpressionStorage):
             ) for impression in current[:count]
         ]
 
+    def put_counts(self, counts):
+        """
+        Add impression counts per feature & hour.
+
+        :param counts: Impression counts.
+        :type counts: list(splitio.engine.impressions.CountPerFeature)
+        """
+        with UWSGILock(self._uwsgi, self._LOCK_IMPRESSION_KEY):
+            try:
+                current = json.loads(self._uwsgi.cache_get(
+                    self._IMPRESSIONS_COUNT_KEY, _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
+                ))
+            except TypeError:
+                current = {}
+
+            for count in counts:
+                field = '%s::%d' % (count.feature, count.timeframe)
+                current[field] = current.get(field, 0) + count.count
+
+            self._uwsgi.cache_update(
+                self._IMPRESSIONS_COUNT_KEY,
+                json.dumps(current),
+                0,
+                _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
+            )
+
+    def pop_counts(self):
+        """
+        Pop all impression counts in storage.
+
+        :rtype: list(splitio.engine.impressions.CountPerFeature)
+        """
+        with UWSGILock(self._uwsgi, self._LOCK_IMPRESSION_KEY):
+            try:
+                current = json.loads(self._uwsgi.cache_get(
+                    self._IMPRESSIONS_COUNT_KEY, _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
+                ))
+            except TypeError:
+                return []
+
+            self._uwsgi.cache_del(self._IMPRESSIONS_COUNT_KEY, _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE)
+
+        counts = []
+        for field, count in current.items():
+            feature, timeframe = field.rsplit('::', 1)
+            counts.append(CountPerFeature(feature, int(timeframe), count))
+        return counts
+
     def request_flush(self):
         """Set a marker in the events cache to indicate that a flush has been requested."""
         self._uwsgi.cache_set(self._IMPRESSIONS_FLUSH, 'ok', 0, _SPLITIO_LOCK_CACHE_NAMESPACE)
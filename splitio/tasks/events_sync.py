@@ -32,6 +32,7 @@ class EventsSyncTask(BaseSynchronizationTask):
         self._period = period
         self._failed = queue.Queue()
         self._bulk_size = bulk_size
+        self._flushed = 0
         self._task = AsyncTask(self._send_events, self._period, on_stop=self._send_events)
 
     def _get_failed(self):
@@ -70,6 +71,7 @@ class EventsSyncTask(BaseSynchronizationTask):
 
         try:
             self._events_api.flush_events(to_send)
+            self._flushed += len(to_send)
         except APIException as exc:
             self._logger.error(
                 'Exception raised while reporting events: %s -- %d',
@@ -90,6 +92,11 @@ class EventsSyncTask(BaseSynchronizationTask):
         """Flush events in storage."""
         self._task.force_execution()
 
+    @property
+    def flushed(self):
+        """Return the number of events successfully sent to the backend."""
+        return self._flushed
+
     def is_running(self):
         """
         Return whether the task is running or not.
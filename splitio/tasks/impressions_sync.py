@@ -33,6 +33,7 @@ class ImpressionsSyncTask(BaseSynchronizationTask):
         self._period = period
         self._failed = queue.Queue()
         self._bulk_size = bulk_size
+        self._flushed = 0
         self._task = AsyncTask(self._send_impressions, self._period, on_stop=self._send_impressions)
 
     def _get_failed(self):
@@ -58,8 +59,25 @@ class ImpressionsSyncTask(BaseSynchronizationTask):
         for impression in imps:
             self._failed.put(impression, False)
 
+    def _send_counts(self):
+        """Send the impression counts in storage, putting them back if the push fails."""
+        counts = self._storage.pop_counts()
+        if not counts:
+            return
+
+        try:
+            self._impressions_api.flush_counters(counts)
+        except APIException as exc:
+            self._logger.error(
+                'Exception raised while reporting impression counts: %s -- %d',
+                exc.message,
+                exc.status_code
+            )
+            self._storage.put_counts(counts)
+
     def _send_impressions(self):
         """Send impressions from both the failed and new queues."""
+        self._send_counts()
         to_send = self._get_failed()
         if len(to_send) < self._bulk_size:
             # If the amount of previously failed items is less than the bulk
@@ -71,6 +89,7 @@ class ImpressionsSyncTask(BaseSynchronizationTask):
 
         try:
             self._impressions_api.flush_impressions(to_send)
+            self._flushed += len(to_send)
         except APIException as exc:
             self._logger.error(
                 'Exception raised while reporting impressions: %s -- %d',
@@ -99,3 +118,54 @@ class ImpressionsSyncTask(BaseSynchronizationTask):
     def flush(self):
         """Flush impressions in storage."""
         self._task.force_execution()
+
+    @property
+    def flushed(self):
+        """Return the number of impressions successfully sent to the backend."""
+        return self._flushed
+
+
+class ImpressionsCountSyncTask(BaseSynchronizationTask):
+    """
+    Periodically hands the impression counts tracked in optimized mode to the storage.
+
+    Counts are handed over one last time when the task is stopped.
+    """
+
+    def __init__(self, impressions_manager, period):
+        """
+        Class constructor.
+
+        :param impressions_manager: Impressions manager tracking the counts.
+        :type impressions_manager: splitio.engine.impressions.ImpressionsManager
+        :param period: How many seconds to wait between subsequent hand-offs.
+        :type period: int
+        """
+        self._impressions_manager = impressions_manager
+        self._period = period
+        self._task = AsyncTask(
+            self._impressions_manager.flush_counts,
+            self._period,
+            on_stop=self._impressions_manager.flush_counts
+        )
+
+    def start(self):
+        """Start executing the impression counts synchronization task."""
+        self._task.start()
+
+    def stop(self, event=None):
+        """Stop executing the impression counts synchronization task."""
+        self._task.stop(event)
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._task.running()
+
+    def flush(self):
+        """Hand the counts tracked so far to the storage."""
+        self._task.force_execution()
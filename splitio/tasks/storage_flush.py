@@ -0,0 +1,61 @@
+"""Storage flushing task."""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import logging
+
+from splitio.tasks import BaseSynchronizationTask
+from splitio.tasks.util.asynctask import AsyncTask
+
+
+class StorageFlushTask(BaseSynchronizationTask):
+    """
+    Periodically flushes a storage that buffers writes in memory.
+
+    The storage is flushed one last time when the task is stopped.
+    """
+
+    def __init__(self, storage, period):
+        """
+        Class constructor.
+
+        :param storage: Storage to flush. Must implement `flush`.
+        :type storage: splitio.storage.redis.RedisImpressionsStorage
+        :param period: How many seconds to wait between subsequent flushes.
+        :type period: float
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._storage = storage
+        self._period = period
+        self._flushed = 0
+        self._task = AsyncTask(self._flush_storage, period, on_stop=self._flush_storage)
+
+    def _flush_storage(self):
+        """Flush the storage."""
+        self._flushed += self._storage.flush()
+
+    def start(self):
+        """Start executing the flushing task."""
+        self._task.start()
+
+    def stop(self, event=None):
+        """Stop executing the flushing task. Accept an optional event to set when it finishes."""
+        self._task.stop(event)
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._task.running()
+
+    def flush(self):
+        """Flush the storage now."""
+        self._task.force_execution()
+
+    @property
+    def flushed(self):
+        """Return the number of items flushed so far."""
+        return self._flushed
@@ -39,6 +39,28 @@ def _get_config(user_config):
     return sdk_config
 
 
+def _build_http_client(config):
+    """
+    Build the HTTP client a wrapper reuses for every request it makes.
+
+    Each wrapper runs in its own process, so clients (and their connection pools) can't be
+    shared between wrappers.
+
+    :param config: Calculated configuration.
+    :type config: dict
+
+    :return: HTTP client.
+    :rtype: splitio.api.client.HttpClient
+    """
+    return HttpClient(
+        1500,
+        config.get('sdk_url'),
+        config.get('events_url'),
+        pool_size=config['connectionPoolSize'],
+        compression=config['httpCompression']
+    )
+
+
 def uwsgi_update_splits(user_config):
     """
     Update splits task.
@@ -49,9 +71,7 @@ def uwsgi_update_splits(user_config):
     config = _get_config(user_config)
     seconds = config['featuresRefreshRate']
     split_sync_task = SplitSynchronizationTask(
-        SplitsAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')), config['apikey']
-        ),
+        SplitsAPI(_build_http_client(config), config['apikey']),
         UWSGISplitStorage(get_uwsgi()),
         None, # Time not needed since the task will be triggered manually.
         None  # Ready flag not needed since it will never be set and consumed.
@@ -76,9 +96,7 @@ def uwsgi_update_segments(user_config):
     config = _get_config(user_config)
     seconds = config['segmentsRefreshRate']
     segment_sync_task = SegmentSynchronizationTask(
-        SegmentsAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')), config['apikey']
-        ),
+        SegmentsAPI(_build_http_client(config), config['apikey']),
         UWSGISegmentStorage(get_uwsgi()),
         None, # Split sotrage not needed, segments provided manually,
         None, # Period not needed, task executed manually
@@ -112,7 +130,7 @@ def uwsgi_report_impressions(user_config):
     storage = UWSGIImpressionStorage(get_uwsgi())
     impressions_sync_task = ImpressionsSyncTask(
         ImpressionsAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')),
+            _build_http_client(config),
             config['apikey'],
             metadata
         ),
@@ -133,6 +151,37 @@ def uwsgi_report_impressions(user_config):
             _LOGGER.error('Error posting impressions')
             _LOGGER.debug('Error: ', exc_info=True)
 
+
+def uwsgi_report_impression_counts(user_config):
+    """
+    Flush impression counts task, needed when impressionsMode is OPTIMIZED.
+
+    :param user_config: User-provided configuration.
+    :type user_config: dict
+    """
+    config = _get_config(user_config)
+    metadata = get_metadata(config)
+    seconds = config['impressionsCountsRefreshRate']
+    impressions_sync_task = ImpressionsSyncTask(
+        ImpressionsAPI(
+            _build_http_client(config),
+            config['apikey'],
+            metadata
+        ),
+        UWSGIImpressionStorage(get_uwsgi()),
+        None,  # Period not needed. Task is being triggered manually.
+        config['impressionsBulkSize']
+    )
+
+    while True:
+        try:
+            impressions_sync_task._send_counts()  #pylint: disable=protected-access
+            time.sleep(seconds)
+        except Exception:  #pylint: disable=broad-except
+            _LOGGER.error('Error posting impression counts')
+            _LOGGER.debug('Error: ', exc_info=True)
+
+
 def uwsgi_report_events(user_config):
     """
     Flush events task.
@@ -146,7 +195,7 @@ def uwsgi_report_events(user_config):
     storage = UWSGIEventStorage(get_uwsgi())
     task = EventsSyncTask(
         EventsAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')),
+            _build_http_client(config),
             config['apikey'],
             metadata
         ),
@@ -179,7 +228,7 @@ def uwsgi_report_telemetry(user_config):
     storage = UWSGITelemetryStorage(get_uwsgi())
     task = TelemetrySynchronizationTask(
         TelemetryAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')),
+            _build_http_client(config),
             config['apikey'],
             metadata
         ),
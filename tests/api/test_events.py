@@ -34,6 +34,8 @@ class EventsAPITests(object):
             'SplitSDKMachineName': 'some_machine_name'
         }
 
+        assert call_made[2]['compress'] is True
+
         # validate key-value args (body)
         assert call_made[2]['body'] == [
             {'key': 'k1', 'trafficTypeName': 'user', 'eventTypeId': 'purchase', 'value': 12.50, 'timestamp': 123456},
@@ -1,5 +1,9 @@
 """HTTPClient test module."""
 
+import gzip
+import io
+import json
+
 from splitio.api import client
 
 class HttpClientTests(object):
@@ -12,12 +16,13 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.get', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.get', new=get_mock)
         httpclient = client.HttpClient()
         response = httpclient.get('sdk', '/test1', 'some_api_key', {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
             client.HttpClient.SDK_URL + '/test1',
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -29,7 +34,8 @@ class HttpClientTests(object):
         response = httpclient.get('events', '/test1', 'some_api_key', {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
             client.HttpClient.EVENTS_URL + '/test1',
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -44,12 +50,13 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.get', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.get', new=get_mock)
         httpclient = client.HttpClient(sdk_url='https://sdk.com', events_url='https://events.com')
         response = httpclient.get('sdk', '/test1', 'some_api_key', {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
             'https://sdk.com/test1',
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -61,7 +68,8 @@ class HttpClientTests(object):
         response = httpclient.get('events', '/test1', 'some_api_key', {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
             'https://events.com/test1',
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -77,13 +85,14 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.post', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.post', new=get_mock)
         httpclient = client.HttpClient()
         response = httpclient.post('sdk', '/test1', 'some_api_key', {'p1': 'a'}, {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
             client.HttpClient.SDK_URL + '/test1',
             json={'p1': 'a'},
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -96,7 +105,8 @@ class HttpClientTests(object):
         call = mocker.call(
             client.HttpClient.EVENTS_URL + '/test1',
             json={'p1': 'a'},
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -111,13 +121,14 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.post', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.post', new=get_mock)
         httpclient = client.HttpClient(sdk_url='https://sdk.com', events_url='https://events.com')
         response = httpclient.post('sdk', '/test1', 'some_api_key', {'p1': 'a'}, {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
             'https://sdk.com' + '/test1',
             json={'p1': 'a'},
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
@@ -130,10 +141,51 @@ class HttpClientTests(object):
         call = mocker.call(
             'https://events.com' + '/test1',
             json={'p1': 'a'},
-            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json'},
+            headers={'Authorization': 'Bearer some_api_key', 'h1': 'abc', 'Content-Type': 'application/json',
+                     'Accept-Encoding': 'gzip'},
             params={'param1': 123},
             timeout=None
         )
         assert response.status_code == 200
         assert response.body == 'ok'
         assert get_mock.mock_calls == [call]
+
+    def test_post_compressed(self, mocker):
+        """Test HTTP POST requests with gzipped bodies."""
+        response_mock = mocker.Mock()
+        response_mock.status_code = 200
+        response_mock.text = 'ok'
+        post_mock = mocker.Mock()
+        post_mock.return_value = response_mock
+        mocker.patch('splitio.api.client.requests.Session.post', new=post_mock)
+        httpclient = client.HttpClient(compression=True)
+        response = httpclient.post('events', '/test1', 'some_api_key', {'p1': 'a'}, compress=True)
+        assert response.status_code == 200
+        _, args, kwargs = post_mock.mock_calls[0]
+        assert args == (client.HttpClient.EVENTS_URL + '/test1',)
+        assert kwargs['headers']['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.GzipFile(fileobj=io.BytesIO(kwargs['data'])).read().decode('utf-8')) == {'p1': 'a'}
+        assert 'json' not in kwargs
+
+        # Compression is opt-in
+        post_mock.reset_mock()
+        httpclient = client.HttpClient()
+        httpclient.post('events', '/test1', 'some_api_key', {'p1': 'a'}, compress=True)
+        _, args, kwargs = post_mock.mock_calls[0]
+        assert kwargs['json'] == {'p1': 'a'}
+        assert 'Content-Encoding' not in kwargs['headers']
+
+    def test_session_reused(self, mocker):
+        """Test that all requests go through a single session."""
+        session = mocker.Mock()
+        session.get.return_value = mocker.Mock(status_code=200, text='ok')
+        session.post.return_value = mocker.Mock(status_code=200, text='ok')
+        mocker.patch('splitio.api.client.requests.Session', new=lambda: session)
+        httpclient = client.HttpClient()
+        httpclient.get('sdk', '/test1', 'some_api_key')
+        httpclient.post('events', '/test2', 'some_api_key', {})
+        assert len(session.get.mock_calls) == 1
+        assert len(session.post.mock_calls) == 1
+        assert len(session.mount.mock_calls) == 2
+        httpclient.close()
+        assert session.close.mock_calls == [mocker.call()]
@@ -3,6 +3,7 @@
 import pytest
 from splitio.api import impressions, client, APIException
 from splitio.models.impressions import Impression
+from splitio.engine.impressions import CountPerFeature
 from splitio.client.util import SdkMetadata
 
 class ImpressionsAPITests(object):
@@ -32,6 +33,8 @@ class ImpressionsAPITests(object):
             'SplitSDKMachineName': 'some_machine_name'
         }
 
+        assert call_made[2]['compress'] is True
+
         # validate key-value args (body)
         assert call_made[2]['body'] == [
             {
@@ -61,3 +64,27 @@ class ImpressionsAPITests(object):
             ])
             assert exc_info.type == APIException
             assert exc_info.value.message == 'some_message'
+
+    def test_post_counters(self, mocker):
+        """Test impression counts posting API call."""
+        httpclient = mocker.Mock(spec=client.HttpClient)
+        httpclient.post.return_value = client.HttpResponse(200, '')
+        sdk_metadata = SdkMetadata('python-1.2.3', 'some_machine_name', '123.123.123.123')
+        impressions_api = impressions.ImpressionsAPI(httpclient, 'some_api_key', sdk_metadata)
+        impressions_api.flush_counters([
+            CountPerFeature('f1', 3600000, 10),
+            CountPerFeature('f2', 3600000, 3)
+        ])
+
+        call_made = httpclient.post.mock_calls[0]
+        assert call_made[1] == ('events', '/testImpressions/count', 'some_api_key')
+        assert call_made[2]['body'] == {
+            'pf': [
+                {'f': 'f1', 'm': 3600000, 'rc': 10},
+                {'f': 'f2', 'm': 3600000, 'rc': 3}
+            ]
+        }
+
+        httpclient.post.return_value = client.HttpResponse(500, 'error')
+        with pytest.raises(APIException):
+            impressions_api.flush_counters([CountPerFeature('f1', 3600000, 10)])
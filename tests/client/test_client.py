@@ -3,6 +3,7 @@
 
 import json
 import os
+from splitio.client import input_validator
 from splitio.client.client import Client
 from splitio.client.factory import SplitFactory
 from splitio.engine.evaluator import Evaluator
@@ -170,7 +171,7 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
 
         client = Client(factory, True, None)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        client._evaluator.evaluate_treatment.return_value = {
+        evaluation = {
             'treatment': 'on',
             'configurations': '{"color": "red"}',
             'impression': {
@@ -178,6 +179,10 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
                 'change_number': 123
             }
         }
+        client._evaluator.evaluate_treatments.return_value = {
+            'f1': evaluation,
+            'f2': evaluation
+        }
         client._logger = mocker.Mock()
         client._send_impression_to_listener = mocker.Mock()
         assert client.get_treatments('key', ['f1', 'f2']) == {'f1': 'on', 'f2': 'on'}
@@ -196,13 +201,29 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
             None
         ) in client._send_impression_to_listener.mock_calls
 
+        # Test with an exception evaluating a single feature:
+        impression_storage.reset_mock()
+        client._evaluator.evaluate_treatments.return_value = {
+            'f1': evaluation,
+            'f2': {
+                'treatment': 'control',
+                'configurations': None,
+                'impression': {'label': 'exception', 'change_number': -1}
+            }
+        }
+        assert client.get_treatments('key', ['f1', 'f2']) == {'f1': 'on', 'f2': 'control'}
+        impressions_called = impression_storage.put.mock_calls[0][1][0]
+        assert Impression('key', 'f1', 'on', 'some_label', 123, None, 1000) in impressions_called
+        assert Impression('key', 'f2', 'control', 'exception', -1, None, 1000) in impressions_called
+        assert len(telemetry_storage.inc_latency.mock_calls) == 2
+
         # Test with exception:
         split_storage.get_change_number.return_value = -1
         def _raise(*_):
             raise Exception('something')
-        client._evaluator.evaluate_treatment.side_effect = _raise
+        client._evaluator.evaluate_treatments.side_effect = _raise
         assert client.get_treatments('key', ['f1', 'f2']) == {'f1': 'control', 'f2': 'control'}
-        assert len(telemetry_storage.inc_latency.mock_calls) == 1
+        assert len(telemetry_storage.inc_latency.mock_calls) == 2
 
     def test_get_treatments_with_config(self, mocker):
         """Test get_treatment execution paths."""
@@ -232,7 +253,7 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
 
         client = Client(factory, True, None)
         client._evaluator = mocker.Mock(spec=Evaluator)
-        client._evaluator.evaluate_treatment.return_value = {
+        evaluation = {
             'treatment': 'on',
             'configurations': '{"color": "red"}',
             'impression': {
@@ -240,6 +261,10 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
                 'change_number': 123
             }
         }
+        client._evaluator.evaluate_treatments.return_value = {
+            'f1': evaluation,
+            'f2': evaluation
+        }
         client._logger = mocker.Mock()
         client._send_impression_to_listener = mocker.Mock()
         assert client.get_treatments_with_config('key', ['f1', 'f2']) == {
@@ -265,13 +290,178 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
         split_storage.get_change_number.return_value = -1
         def _raise(*_):
             raise Exception('something')
-        client._evaluator.evaluate_treatment.side_effect = _raise
+        client._evaluator.evaluate_treatments.side_effect = _raise
         assert client.get_treatments_with_config('key', ['f1', 'f2']) == {
             'f1': ('control', None),
             'f2': ('control', None)
         }
         assert len(telemetry_storage.inc_latency.mock_calls) == 1
 
+    def test_get_treatments_for_keys(self, mocker):
+        """Test multi-key bulk evaluation."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        segment_storage = mocker.Mock(spec=SegmentStorage)
+        impression_storage = mocker.Mock(spec=ImpressionStorage)
+        event_storage = mocker.Mock(spec=EventStorage)
+        telemetry_storage = mocker.Mock(spec=TelemetryStorage)
+        def _get_storage_mock(name):
+            return {
+                'splits': split_storage,
+                'segments': segment_storage,
+                'impressions': impression_storage,
+                'events': event_storage,
+                'telemetry': telemetry_storage
+            }[name]
+
+        destroyed_property = mocker.PropertyMock()
+        destroyed_property.return_value = False
+
+        factory = mocker.Mock(spec=SplitFactory)
+        factory._get_storage.side_effect = _get_storage_mock
+        type(factory).destroyed = destroyed_property
+
+        mocker.patch('splitio.client.client.time.time', new=lambda: 1)
+        mocker.patch('splitio.client.client.get_latency_bucket_index', new=lambda x: 5)
+
+        result = {
+            'treatment': 'on',
+            'configurations': '{"color": "red"}',
+            'impression': {'label': 'some_label', 'change_number': 123}
+        }
+        def _evaluate(features, keys, attributes, batch_size):
+            for matching_key, bucketing_key in keys:
+                yield matching_key, bucketing_key, {feature: result for feature in features}
+
+        client = Client(factory, True, None)
+        client._BULK_EVALUATION_SIZE = 2
+        client._evaluator = mocker.Mock(spec=Evaluator)
+        client._evaluator.evaluate_treatments_for_keys.side_effect = _evaluate
+        client._send_impression_to_listener = mocker.Mock()
+
+        results = client.get_treatments_with_config_for_keys(['k1', '', 'k2', 'k3'], ['f1'])
+        assert next(results) == ('k1', {'f1': ('on', '{"color": "red"}')})
+        assert impression_storage.put.mock_calls == []
+        assert list(results) == [
+            ('k2', {'f1': ('on', '{"color": "red"}')}),
+            ('k3', {'f1': ('on', '{"color": "red"}')})
+        ]
+        assert impression_storage.put.mock_calls == [
+            mocker.call([
+                Impression('k1', 'f1', 'on', 'some_label', 123, None, 1000),
+                Impression('k2', 'f1', 'on', 'some_label', 123, None, 1000)
+            ]),
+            mocker.call([Impression('k3', 'f1', 'on', 'some_label', 123, None, 1000)])
+        ]
+        assert telemetry_storage.inc_latency.mock_calls == [
+            mocker.call('sdk.getTreatmentsForKeys', 5),
+            mocker.call('sdk.getTreatmentsForKeys', 5)
+        ]
+        assert len(client._send_impression_to_listener.mock_calls) == 3
+
+        assert list(client.get_treatments_for_keys(['k1', 'k2'], ['f1'])) == [
+            ('k1', {'f1': 'on'}),
+            ('k2', {'f1': 'on'})
+        ]
+
+        # Impressions for the keys already yielded are stored if the consumer stops early.
+        impression_storage.put.reset_mock()
+        results = client.get_treatments_for_keys(['k1', 'k2', 'k3'], ['f1'])
+        assert next(results) == ('k1', {'f1': 'on'})
+        results.close()
+        assert impression_storage.put.mock_calls == [
+            mocker.call([Impression('k1', 'f1', 'on', 'some_label', 123, None, 1000)])
+        ]
+
+        assert list(client.get_treatments_for_keys(['k1'], [])) == []
+        assert list(client.get_treatments_for_keys(['k1'], ['f1'], 'invalid')) == []
+
+    def test_scoped(self, mocker):
+        """Test evaluations in a scope share validation, context & impression storage."""
+        split_storage = InMemorySplitStorage()
+        segment_storage = mocker.Mock(spec=SegmentStorage)
+        segment_storage.get_key_segments.return_value = None
+        segment_storage.segment_contains.return_value = True
+        impression_storage = mocker.Mock(spec=ImpressionStorage)
+        telemetry_storage = mocker.Mock(spec=TelemetryStorage)
+        def _get_storage_mock(name):
+            return {
+                'splits': split_storage,
+                'segments': segment_storage,
+                'impressions': impression_storage,
+                'events': mocker.Mock(spec=EventStorage),
+                'telemetry': telemetry_storage
+            }[name]
+
+        for name in ['f1', 'f2']:
+            split_storage.put(splits.from_raw({
+                'changeNumber': 123,
+                'trafficTypeName': 'user',
+                'name': name,
+                'trafficAllocation': 100,
+                'trafficAllocationSeed': 123456,
+                'seed': 321654,
+                'status': 'ACTIVE',
+                'killed': False,
+                'defaultTreatment': 'off',
+                'algo': 2,
+                'conditions': [{
+                    'conditionType': 'WHITELIST',
+                    'label': 'in segment',
+                    'matcherGroup': {
+                        'combiner': 'AND',
+                        'matchers': [{
+                            'matcherType': 'IN_SEGMENT',
+                            'negate': False,
+                            'userDefinedSegmentMatcherData': {'segmentName': 'employees'}
+                        }]
+                    },
+                    'partitions': [{'treatment': 'on', 'size': 100}]
+                }]
+            }))
+
+        destroyed_property = mocker.PropertyMock()
+        destroyed_property.return_value = False
+        factory = mocker.Mock(spec=SplitFactory)
+        factory._get_storage.side_effect = _get_storage_mock
+        type(factory).destroyed = destroyed_property
+        mocker.patch('splitio.client.client.time.time', new=lambda: 1)
+        validate_key = mocker.spy(input_validator, 'validate_key')
+
+        client = Client(factory, True, None)
+        with client.scoped('key', {'age': 30}) as scope:
+            assert scope.valid
+            assert scope.get_treatment('f1') == 'on'
+            assert scope.get_treatment_with_config('f2') == ('on', None)
+            assert scope.get_treatments(['f1', 'f2', 'f3']) == {
+                'f1': 'on', 'f2': 'on', 'f3': 'control'
+            }
+            assert impression_storage.put.mock_calls == []
+            assert telemetry_storage.inc_latency.mock_calls == [
+                mocker.call('sdk.getTreatment', 0),
+                mocker.call('sdk.getTreatment', 0),
+                mocker.call('sdk.getTreatments', 0)
+            ]
+
+        # Key validated & segment membership fetched once, impressions stored in bulk on close.
+        assert len(validate_key.mock_calls) == 1
+        assert len(segment_storage.segment_contains.mock_calls) == 1
+        assert len(impression_storage.put.mock_calls) == 1
+        assert sorted(impression_storage.put.mock_calls[0][1][0]) == [
+            Impression('key', 'f1', 'on', 'in segment', 123, None, 1000),
+            Impression('key', 'f1', 'on', 'in segment', 123, None, 1000),
+            Impression('key', 'f2', 'on', 'in segment', 123, None, 1000),
+            Impression('key', 'f2', 'on', 'in segment', 123, None, 1000),
+            Impression('key', 'f3', 'control', 'definition not found', -1, None, 1000)
+        ]
+        assert len(telemetry_storage.inc_latency.mock_calls) == 3
+        assert scope.get_treatment('f1') == 'control'
+
+        invalid = client.scoped(None)
+        assert not invalid.valid
+        assert invalid.get_treatments(['f1']) == {'f1': 'control'}
+        invalid.close()
+        assert len(impression_storage.put.mock_calls) == 1
+
     def test_destroy(self, mocker):
         """Test that destroy/destroyed calls are forwarded to the factory."""
         split_storage = mocker.Mock(spec=SplitStorage)
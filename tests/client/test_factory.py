@@ -3,10 +3,13 @@
 
 import time
 import threading
-from splitio.client.listener import ImpressionListenerWrapper
+from splitio.client.listener import ImpressionListenerWrapper, ImpressionListener
 from splitio.client.factory import get_factory
 from splitio.client.config import DEFAULT_CONFIG
+from splitio.models import splits
+from splitio.models.segments import Segment
 from splitio.storage import redis, inmemmory, uwsgi
+from splitio.storage.mmapped import MMapSegmentStorage
 from splitio.tasks import events_sync, impressions_sync, split_sync, segment_sync, telemetry_sync
 from splitio.tasks.util import asynctask, workerpool
 from splitio.api.splits import SplitsAPI
@@ -83,11 +86,124 @@ class SplitFactoryTests(object):
         assert factory._tasks['telemetry']._period == DEFAULT_CONFIG['metricsRefreshRate']
         assert factory._tasks['telemetry']._storage == factory._storages['telemetry']
         assert factory._tasks['telemetry']._api == factory._apis['telemetry']
+        assert 'impressions_count' not in factory._tasks
         assert factory._labels_enabled is True
+        assert factory.evaluation_cache is None
         factory.block_until_ready()
         time.sleep(1) # give a chance for the bg thread to set the ready status
         assert factory.ready
 
+    def test_optimized_impressions_count_task(self, mocker):
+        """Test that impression counts are handed to storage periodically in optimized mode."""
+        def _split_task_init_mock(self, api, storage, period, event):
+            self._task = mocker.Mock()
+            self._api = api
+            self._storage = storage
+            self._period = period
+            self._event = event
+            event.set()
+        mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__', new=_split_task_init_mock)
+        def _segment_task_init_mock(self, api, storage, split_storage, period, event):
+            self._task = mocker.Mock()
+            self._worker_pool = mocker.Mock()
+            self._api = api
+            self._segment_storage = storage
+            self._split_storage = split_storage
+            self._period = period
+            self._event = event
+            event.set()
+        mocker.patch('splitio.client.factory.SegmentSynchronizationTask.__init__', new=_segment_task_init_mock)
+
+        factory = get_factory('some_api_key', config={
+            'impressionsMode': 'OPTIMIZED',
+            'impressionsCountsRefreshRate': 30
+        })
+        task = factory._tasks['impressions_count']
+        assert isinstance(task, impressions_sync.ImpressionsCountSyncTask)
+        assert task._impressions_manager is factory._impressions_manager
+        assert task._period == 30
+        assert task.is_running()
+
+        event = threading.Event()
+        factory.destroy(event)
+        event.wait(5)
+        assert not task.is_running()
+
+    def test_mmapped_segments_with_evaluation_cache(self, mocker, tmpdir):
+        """Test evaluating with memory mapped segments & the evaluation cache enabled."""
+        def _split_task_init_mock(self, api, storage, period, event):
+            self._task = mocker.Mock()
+            self._api = api
+            self._storage = storage
+            self._period = period
+            self._event = event
+            event.set()
+        mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__', new=_split_task_init_mock)
+        def _segment_task_init_mock(self, api, storage, split_storage, period, event):
+            self._task = mocker.Mock()
+            self._worker_pool = mocker.Mock()
+            self._api = api
+            self._segment_storage = storage
+            self._split_storage = split_storage
+            self._period = period
+            self._event = event
+            event.set()
+        mocker.patch('splitio.client.factory.SegmentSynchronizationTask.__init__', new=_segment_task_init_mock)
+
+        factory = get_factory('some_api_key', config={
+            'segmentStorageDirectory': str(tmpdir),
+            'evaluationCacheSize': 100
+        })
+        assert isinstance(factory._storages['segments'], MMapSegmentStorage)
+        assert factory.evaluation_cache is not None
+        factory._storages['splits'].put(splits.from_raw({
+            'changeNumber': 123,
+            'trafficTypeName': 'user',
+            'name': 'some_feature',
+            'trafficAllocation': 100,
+            'trafficAllocationSeed': 123456,
+            'seed': 321654,
+            'status': 'ACTIVE',
+            'killed': False,
+            'defaultTreatment': 'off',
+            'algo': 2,
+            'conditions': [{
+                'conditionType': 'WHITELIST',
+                'label': 'in segment',
+                'matcherGroup': {
+                    'combiner': 'AND',
+                    'matchers': [{
+                        'matcherType': 'IN_SEGMENT',
+                        'negate': False,
+                        'userDefinedSegmentMatcherData': {'segmentName': 'some_segment'}
+                    }]
+                },
+                'partitions': [{'treatment': 'on', 'size': 100}]
+            }]
+        }))
+        factory._storages['segments'].put(Segment('some_segment', ['key1'], 1))
+        factory.block_until_ready()
+
+        client = factory.client()
+        assert client.get_treatment('key1', 'some_feature') == 'on'
+        assert client.get_treatment('key1', 'some_feature') == 'on'
+        assert factory.evaluation_cache.hits == 1
+
+        assert 'segments' in factory._tasks
+
+        # Other processes sharing the directory don't synchronize segments.
+        reader = get_factory('some_api_key', config={'segmentStorageDirectory': str(tmpdir)})
+        assert 'segments' not in reader._tasks
+        reader.block_until_ready(5)
+        assert reader._storages['segments'].segment_contains('some_segment', 'key1')
+
+        # A segment file replaced by another process invalidates cached results.
+        MMapSegmentStorage(str(tmpdir)).update('some_segment', [], ['key1'], 2)
+        factory._storages['segments'].refresh()
+        assert client.get_treatment('key1', 'some_feature') == 'off'
+        factory.destroy()
+        reader.destroy()
+
     def test_redis_client_creation(self, mocker):
         """Test that a client with redis storage is created correctly."""
         strict_redis_mock = mocker.Mock()
@@ -168,7 +284,7 @@ class SplitFactoryTests(object):
 
     def test_uwsgi_client_creation(self):
         """Test that a client with redis storage is created correctly."""
-        factory = get_factory('some_api_key', config={'uwsgiClient': True})
+        factory = get_factory('some_api_key', config={'uwsgiClient': True, 'bucketCacheSize': 10})
         assert isinstance(factory._get_storage('splits'), uwsgi.UWSGISplitStorage)
         assert isinstance(factory._get_storage('segments'), uwsgi.UWSGISegmentStorage)
         assert isinstance(factory._get_storage('impressions'), uwsgi.UWSGIImpressionStorage)
@@ -178,6 +294,8 @@ class SplitFactoryTests(object):
         assert factory._tasks == {}
         assert factory._labels_enabled is True
         assert factory._impression_listener is None
+        assert factory.splitter._cache._max_size == 10
+        assert factory.client()._splitter is factory.splitter
         factory.block_until_ready()
         time.sleep(1) # give a chance for the bg thread to set the ready status
         assert factory.ready
@@ -227,15 +345,24 @@ class SplitFactoryTests(object):
         mocker.patch('splitio.client.factory.EventsSyncTask.__init__', new=_event_task_init_mock)
 
         # Start factory and make assertions
-        factory = get_factory('some_api_key')
+        factory = get_factory('some_api_key', config={
+            'impressionListener': mocker.Mock(spec=ImpressionListener),
+            'impressionListenerAsync': True,
+            'impressionListenerStopTimeout': 2
+        })
         factory.block_until_ready()
         time.sleep(1) # give a chance for the bg thread to set the ready status
         assert factory.ready
         assert factory.destroyed is False
+        assert factory._impression_listener._stop_timeout == 2
+        listener_stop = mocker.spy(factory._impression_listener, 'stop')
+        http_close = mocker.spy(factory._http_client, 'close')
 
         factory.destroy()
         assert imp_async_task_mock.stop.mock_calls == [mocker.call(None)]
         assert evt_async_task_mock.stop.mock_calls == [mocker.call(None)]
+        assert listener_stop.mock_calls == [mocker.call()]
+        assert http_close.mock_calls == [mocker.call()]
         assert factory.destroyed is True
 
     def test_destroy_with_event(self, mocker):
@@ -302,6 +429,7 @@ class SplitFactoryTests(object):
         time.sleep(1) # give a chance for the bg thread to set the ready status
         assert factory.ready
 
+        http_close = mocker.spy(factory._http_client, 'close')
         event = threading.Event()
         factory.destroy(event)
 
@@ -337,4 +465,5 @@ class SplitFactoryTests(object):
                         # a chance to run and set the main event.
 
         assert event.is_set()
+        assert http_close.mock_calls == [mocker.call()]
         assert factory.destroyed
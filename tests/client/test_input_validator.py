@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, print_function, \
     unicode_literals
 
 import logging
+from collections import OrderedDict
 
 from splitio.client.factory import SplitFactory, get_factory
 from splitio.client.client import CONTROL, Client
@@ -611,12 +612,19 @@ class ClientInputValidationTests(object):
         conditions_mock = mocker.PropertyMock()
         conditions_mock.return_value = []
         type(split_mock).conditions = conditions_mock
+        split_mock.get_segment_names.return_value = []
 
         storage_mock = mocker.Mock(spec=SplitStorage)
         storage_mock.get.return_value = split_mock
+        storage_mock.get_evaluation_order.side_effect = lambda names: (
+            OrderedDict((name, split_mock) for name in names), set()
+        )
 
         factory_mock = mocker.Mock(spec=SplitFactory)
-        factory_mock._get_storage.return_value = storage_mock
+        segment_storage_mock = mocker.Mock(spec=SegmentStorage)
+        segment_storage_mock.get_key_segments.return_value = None
+        factory_mock._get_storage.side_effect = lambda name: \
+            segment_storage_mock if name == 'segments' else storage_mock
         factory_destroyed = mocker.PropertyMock()
         factory_destroyed.return_value = False
         type(factory_mock).destroyed = factory_destroyed
@@ -714,12 +722,19 @@ class ClientInputValidationTests(object):
         conditions_mock = mocker.PropertyMock()
         conditions_mock.return_value = []
         type(split_mock).conditions = conditions_mock
+        split_mock.get_segment_names.return_value = []
 
         storage_mock = mocker.Mock(spec=SplitStorage)
         storage_mock.get.return_value = split_mock
+        storage_mock.get_evaluation_order.side_effect = lambda names: (
+            OrderedDict((name, split_mock) for name in names), set()
+        )
 
         factory_mock = mocker.Mock(spec=SplitFactory)
-        factory_mock._get_storage.return_value = storage_mock
+        segment_storage_mock = mocker.Mock(spec=SegmentStorage)
+        segment_storage_mock.get_key_segments.return_value = None
+        factory_mock._get_storage.side_effect = lambda name: \
+            segment_storage_mock if name == 'segments' else storage_mock
         factory_destroyed = mocker.PropertyMock()
         factory_destroyed.return_value = False
         type(factory_mock).destroyed = factory_destroyed
@@ -0,0 +1,130 @@
+"""Impression listener wrappers test module."""
+#pylint: disable=no-self-use,too-few-public-methods
+
+import threading
+
+from splitio.client.listener import ImpressionListenerWrapper, AsyncImpressionListenerWrapper, \
+    ImpressionListener, BatchImpressionListener, ImpressionListenerException
+from splitio.client.util import SdkMetadata
+from splitio.models.impressions import Impression
+
+
+_METADATA = SdkMetadata('python-1.2.3', 'some_machine_name', '123.123.123.123')
+
+
+def _impression(index):
+    """Build an impression for a key index."""
+    return Impression('key%d' % index, 'f1', 'on', 'l1', 123, None, 321)
+
+
+def _data(index):
+    """Build the listener data expected for a key index."""
+    return {
+        'impression': _impression(index),
+        'attributes': {'a': 1},
+        'sdk-language-version': 'python-1.2.3',
+        'instance-id': 'some_machine_name'
+    }
+
+
+class ImpressionListenerWrapperTests(object):
+    """Synchronous impression listener wrapper test cases."""
+
+    def test_log_impression(self, mocker):
+        """Test impressions are handed to plain & batch listeners."""
+        listener = mocker.Mock(spec=ImpressionListener)
+        wrapper = ImpressionListenerWrapper(listener, _METADATA)
+        wrapper.log_impression(_impression(1), {'a': 1})
+        assert listener.log_impression.mock_calls == [mocker.call(_data(1))]
+
+        batch_listener = mocker.Mock(spec=BatchImpressionListener)
+        wrapper = ImpressionListenerWrapper(batch_listener, _METADATA)
+        wrapper.log_impression(_impression(1), {'a': 1})
+        assert batch_listener.log_impressions.mock_calls == [mocker.call([_data(1)])]
+
+        listener.log_impression.side_effect = Exception('something')
+        wrapper = ImpressionListenerWrapper(listener, _METADATA)
+        try:
+            wrapper.log_impression(_impression(1), {'a': 1})
+        except ImpressionListenerException:
+            pass
+        else:
+            assert False
+
+
+class AsyncImpressionListenerWrapperTests(object):
+    """Asynchronous impression listener wrapper test cases."""
+
+    def test_batches(self, mocker):
+        """Test impressions are handed to batch listeners from the worker thread."""
+        batches = []
+        listener = mocker.Mock(spec=BatchImpressionListener)
+        listener.log_impressions.side_effect = lambda data: batches.append(
+            (threading.current_thread(), data)
+        )
+        wrapper = AsyncImpressionListenerWrapper(listener, _METADATA, 100, 2, 10)
+        for index in range(5):
+            wrapper.log_impression(_impression(index), {'a': 1})
+        wrapper.stop(5)
+
+        assert [item for _, data in batches for item in data] == [_data(i) for i in range(5)]
+        assert all(len(data) <= 2 for _, data in batches)
+        assert all(thread is not threading.current_thread() for thread, _ in batches)
+        assert wrapper.dispatched == 5
+        assert wrapper.dropped == 0
+
+        # Impressions logged after stopping are ignored
+        wrapper.log_impression(_impression(6), {'a': 1})
+        assert wrapper.dispatched == 5
+
+    def test_overflow_and_failures(self, mocker):
+        """Test discarded & failed impressions are counted."""
+        release = threading.Event()
+        listener = mocker.Mock(spec=ImpressionListener)
+        listener.log_impression.side_effect = lambda data: release.wait(5)
+        wrapper = AsyncImpressionListenerWrapper(listener, _METADATA, 2, 1, 10)
+        for index in range(10):
+            wrapper.log_impression(_impression(index), {'a': 1})
+        assert wrapper.dropped >= 7
+        release.set()
+        wrapper.stop(5)
+        assert wrapper.dispatched + wrapper.dropped == 10
+
+        listener = mocker.Mock(spec=ImpressionListener)
+        listener.log_impression.side_effect = Exception('something')
+        wrapper = AsyncImpressionListenerWrapper(listener, _METADATA, 100, 10, 10)
+        wrapper.log_impression(_impression(1), {'a': 1})
+        wrapper.stop(5)
+        assert wrapper.failed == 1
+        assert wrapper.dispatched == 0
+
+        # A failing impression doesn't prevent the rest of its batch from being dispatched.
+        def _log_impression(data):
+            if data['impression'].matching_key == 'key1':
+                raise Exception('something')
+        listener = mocker.Mock(spec=ImpressionListener)
+        listener.log_impression.side_effect = _log_impression
+        wrapper = AsyncImpressionListenerWrapper(listener, _METADATA, 100, 10, 10)
+        for index in range(3):
+            wrapper.log_impression(_impression(index), {'a': 1})
+        wrapper.stop(5)
+        assert listener.log_impression.mock_calls == [mocker.call(_data(i)) for i in range(3)]
+        assert wrapper.failed == 1
+        assert wrapper.dispatched == 2
+
+    def test_stop_timeout(self, mocker):
+        """Test stopping waits a bounded time and logs the impressions left behind."""
+        release = threading.Event()
+        listener = mocker.Mock(spec=ImpressionListener)
+        listener.log_impression.side_effect = lambda data: release.wait(5)
+        wrapper = AsyncImpressionListenerWrapper(listener, _METADATA, 100, 1, 10, 0.1)
+        wrapper._logger = mocker.Mock()
+        for index in range(3):
+            wrapper.log_impression(_impression(index), {'a': 1})
+        wrapper.stop()
+        assert wrapper._worker.is_alive()
+        pending = wrapper._logger.warning.mock_calls[0][1]
+        assert pending[1] in (2, 3)
+        release.set()
+        wrapper._worker.join(5)
+        assert wrapper.dispatched == 3
@@ -25,6 +25,8 @@ class LocalHostStoragesTests(object):
         assert imp_storage.pop_many(3) is None
         assert imp_storage.pop_many([2]) is None
         assert imp_storage.pop_many(object) is None
+        assert imp_storage.put_counts([2]) is None
+        assert imp_storage.pop_counts() == []
 
     def test_dummy_event_storage(self):
         """Test that dummy event storage never complains."""
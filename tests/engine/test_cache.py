@@ -0,0 +1,51 @@
+"""Evaluation cache tests module."""
+#pylint: disable=no-self-use,protected-access
+
+from splitio.engine.cache import EvaluationCache
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
+
+
+class EvaluationCacheTests(object):
+    """Evaluation cache test cases."""
+
+    def test_build_key(self):
+        """Test that keys are stable and distinguish attribute types."""
+        key = EvaluationCache.build_key('f1', 'key', None, {'a': [1, 2], 'b': set(['x', 'y'])})
+        assert key == EvaluationCache.build_key('f1', 'key', None, {'b': set(['y', 'x']), 'a': [1, 2]})
+        assert key != EvaluationCache.build_key('f1', 'key', None, {'a': [2, 1], 'b': set(['x', 'y'])})
+        assert EvaluationCache.build_key('f1', 'key', None, {'a': True}) != \
+            EvaluationCache.build_key('f1', 'key', None, {'a': 1})
+        assert EvaluationCache.build_key('f1', 'key', None, None) == \
+            EvaluationCache.build_key('f1', 'key', None, {})
+        assert EvaluationCache.build_key('f1', 'key', None, {'a': object()}) is not None
+        assert EvaluationCache.build_key('f1', 'key', None, {'a': bytearray(b'x')}) is None
+
+    def test_invalidation(self, mocker):
+        """Test that results are dropped when storages change or they expire."""
+        split_storage = InMemorySplitStorage()
+        segment_storage = InMemorySegmentStorage()
+        cache = EvaluationCache(split_storage, segment_storage, 2, 60)
+
+        version = cache.get_version()
+        assert cache.get('k1', version) is None
+        cache.put('k1', version, {'treatment': 'on'})
+        assert cache.get('k1', version) == {'treatment': 'on'}
+
+        segment_storage.update('segment1', set(['key1']), set(), 123)
+        assert cache.get('k1', cache.get_version()) is None
+
+        # Results computed before the change are not stored.
+        cache.put('k1', version, {'treatment': 'on'})
+        assert cache.get('k1', cache.get_version()) is None
+
+        version = cache.get_version()
+        for key in ['k1', 'k2', 'k3']:
+            cache.put(key, version, {'treatment': key})
+        assert len(cache) == 2
+        assert cache.get('k1', version) is None
+        assert cache.get('k3', version) == {'treatment': 'k3'}
+
+        mocker.patch('splitio.engine.cache.time.time', new=lambda: 2 ** 40)
+        assert cache.get('k3', version) is None
+        assert cache.hits == 2
+        assert cache.misses == 5
@@ -0,0 +1,126 @@
+"""Split compiler tests module."""
+#pylint: disable=no-self-use,protected-access
+
+from splitio.engine import compiler
+from splitio.engine.evaluator import CONTROL
+from splitio.engine import hashfns
+from splitio.models import splits
+
+
+def _all_keys_condition(parts, condition_type='ROLLOUT', negate=False):
+    """Build a raw condition with a single ALL_KEYS matcher."""
+    return {
+        'conditionType': condition_type,
+        'label': 'all keys',
+        'matcherGroup': {
+            'combiner': 'AND',
+            'matchers': [{'matcherType': 'ALL_KEYS', 'negate': negate}]
+        },
+        'partitions': [{'treatment': t, 'size': s} for t, s in parts]
+    }
+
+
+def _whitelist_condition(keys):
+    """Build a raw WHITELIST condition."""
+    return {
+        'conditionType': 'WHITELIST',
+        'label': 'whitelisted',
+        'matcherGroup': {
+            'combiner': 'AND',
+            'matchers': [{
+                'matcherType': 'WHITELIST',
+                'negate': False,
+                'whitelistMatcherData': {'whitelist': keys}
+            }]
+        },
+        'partitions': [{'treatment': 'on', 'size': 100}]
+    }
+
+
+def _segment_condition(segment_name):
+    """Build a raw IN_SEGMENT condition."""
+    return {
+        'conditionType': 'ROLLOUT',
+        'label': 'in segment',
+        'matcherGroup': {
+            'combiner': 'AND',
+            'matchers': [{
+                'matcherType': 'IN_SEGMENT',
+                'negate': False,
+                'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+            }]
+        },
+        'partitions': [{'treatment': 'on', 'size': 50}, {'treatment': 'off', 'size': 50}]
+    }
+
+
+def _build_split(conditions, traffic_allocation=100):
+    """Build a split with the supplied raw conditions."""
+    return splits.from_raw({
+        'changeNumber': 123,
+        'trafficTypeName': 'user',
+        'name': 'some_split',
+        'trafficAllocation': traffic_allocation,
+        'trafficAllocationSeed': 123456,
+        'seed': 321654,
+        'status': 'ACTIVE',
+        'killed': False,
+        'defaultTreatment': 'off',
+        'algo': 2,
+        'conditions': conditions
+    })
+
+
+class CompilerTests(object):
+    """Split compiler test cases."""
+
+    def test_constant_treatments(self):
+        """Test that bucket-independent conditions are resolved at compile time."""
+        assert compiler._resolve_constant_treatment((CONTROL,) * 100) == CONTROL
+        assert compiler._resolve_constant_treatment(('on',) * 100) == 'on'
+        assert compiler._resolve_constant_treatment(('on',) * 50 + ('off',) * 50) is None
+
+    def test_all_keys_fast_path(self):
+        """Test that ALL_KEYS conditions need no matching and cut the plan short."""
+        split = _build_split([
+            _whitelist_condition(['key1']),
+            _all_keys_condition([('on', 100), ('off', 0)]),
+            _all_keys_condition([('on', 50), ('off', 50)]),
+        ])
+        plan = split.plan
+        assert plan is split.plan
+        assert len(plan.conditions) == 2
+        assert len(plan.conditions[0].matchers) == 1
+        assert plan.conditions[0].treatment == 'on'
+        assert plan.conditions[1].matchers == ()
+        assert plan.conditions[1].treatment == 'on'
+        assert plan.conditions[1].label == 'all keys'
+        assert not plan.needs_context
+
+    def test_negated_all_keys_is_kept(self):
+        """Test that a negated ALL_KEYS matcher is evaluated."""
+        split = _build_split([
+            _all_keys_condition([('on', 100)], negate=True),
+            _all_keys_condition([('off', 100)]),
+        ])
+        assert len(split.plan.conditions) == 2
+        assert len(split.plan.conditions[0].matchers) == 1
+
+    def test_traffic_allocation(self):
+        """Test that traffic allocation is only checked on the first rollout condition."""
+        split = _build_split([
+            _whitelist_condition(['key1']),
+            _segment_condition('segment1'),
+            _all_keys_condition([('on', 50), ('off', 50)]),
+        ], traffic_allocation=20)
+        plan = split.plan
+        assert [c.check_allocation for c in plan.conditions] == [False, True, False]
+        assert plan.traffic_allocation == 20
+        assert plan.traffic_allocation_seed == 123456
+        assert plan.seed == 321654
+        assert plan.algo == splits.HashAlgorithm.MURMUR
+        assert plan.hash_fn is hashfns.get_hash_fn(splits.HashAlgorithm.MURMUR)
+        assert plan.needs_context
+
+        split = _build_split([_segment_condition('segment1')])
+        assert [c.check_allocation for c in split.plan.conditions] == [False]
@@ -1,11 +1,16 @@
 """Evaluator tests module."""
 import logging
+from collections import OrderedDict
 
+from splitio.models import splits
 from splitio.models.splits import Split
 from splitio.models.grammar.condition import Condition, ConditionType
+from splitio.models.grammar.matchers.base import Matcher
 from splitio.models.impressions import Label
-from splitio.engine import evaluator, splitters
+from splitio.engine import evaluator, splitters, compiler
+from splitio.engine.splitters import Splitter
 from splitio.storage import SplitStorage, SegmentStorage
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
 
 class EvaluatorTests(object):
     """Test evaluator behavior."""
@@ -85,12 +90,13 @@ class EvaluatorTests(object):
     def test_get_gtreatment_for_split_no_condition_matches(self, mocker):
         """Test no condition matches."""
         e = self._build_evaluator_with_mocks(mocker)
-        e._splitter.get_treatment.return_value = 'on'
+        e._splitter.get_treatment_for_table.return_value = 'on'
         conditions_mock = mocker.PropertyMock()
         conditions_mock.return_value = []
         mocked_split = mocker.Mock(spec=Split)
         mocked_split.killed = False
         type(mocked_split).conditions = conditions_mock
+        mocked_split.plan = compiler.compile_split(mocked_split)
         treatment, label = e._get_treatment_for_split(mocked_split, 'some_key', 'some_bucketing', {'attr1': 1})
         assert treatment == None
         assert label == None
@@ -98,28 +104,36 @@ class EvaluatorTests(object):
     def test_get_gtreatment_for_split_non_rollout(self, mocker):
         """Test condition matches."""
         e = self._build_evaluator_with_mocks(mocker)
-        e._splitter.get_treatment.return_value = 'on'
+        e._splitter.get_treatment_for_table.return_value = 'on'
+        mocked_matcher = mocker.Mock(spec=Matcher)
+        mocked_matcher.evaluate.return_value = True
         mocked_condition_1 = mocker.Mock(spec=Condition)
         mocked_condition_1.condition_type = ConditionType.WHITELIST
         mocked_condition_1.label = 'some_label'
-        mocked_condition_1.matches.return_value = True
+        mocked_condition_1.matchers = [mocked_matcher]
+        mocked_condition_1.bucket_treatments = ('on',) * 50 + ('off',) * 50
         conditions_mock = mocker.PropertyMock()
         conditions_mock.return_value = [mocked_condition_1]
         mocked_split = mocker.Mock(spec=Split)
         mocked_split.killed = False
         type(mocked_split).conditions = conditions_mock
+        mocked_split.plan = compiler.compile_split(mocked_split)
         treatment, label = e._get_treatment_for_split(mocked_split, 'some_key', 'some_bucketing', {'attr1': 1})
         assert treatment == 'on'
         assert label == 'some_label'
+        assert mocked_matcher.evaluate.mock_calls == [mocker.call('some_key', {'attr1': 1}, None)]
 
     def test_get_treatment_for_split_rollout(self, mocker):
         """Test rollout condition returns default treatment."""
         e = self._build_evaluator_with_mocks(mocker)
         e._splitter.get_bucket.return_value = 60
+        mocked_matcher = mocker.Mock(spec=Matcher)
+        mocked_matcher.evaluate.return_value = True
         mocked_condition_1 = mocker.Mock(spec=Condition)
         mocked_condition_1.condition_type = ConditionType.ROLLOUT
         mocked_condition_1.label = 'some_label'
-        mocked_condition_1.matches.return_value = True
+        mocked_condition_1.matchers = [mocked_matcher]
+        mocked_condition_1.bucket_treatments = ('on',) * 100
         conditions_mock = mocker.PropertyMock()
         conditions_mock.return_value = [mocked_condition_1]
         mocked_split = mocker.Mock(spec=Split)
@@ -127,6 +141,306 @@ class EvaluatorTests(object):
         mocked_split.default_treatment = 'almost-on'
         mocked_split.killed = False
         type(mocked_split).conditions = conditions_mock
+        mocked_split.plan = compiler.compile_split(mocked_split)
         treatment, label = e._get_treatment_for_split(mocked_split, 'some_key', 'some_bucketing', {'attr1': 1})
         assert treatment == 'almost-on'
         assert label == Label.NOT_IN_SPLIT
+        assert mocked_matcher.evaluate.mock_calls == []
+
+        e._splitter.get_bucket.return_value = 40
+        treatment, label = e._get_treatment_for_split(mocked_split, 'some_key', 'some_bucketing', {'attr1': 1})
+        assert treatment == 'on'
+        assert label == 'some_label'
+
+    def test_evaluate_treatments_for_keys(self, mocker):
+        """Test multi-key evaluation fetches splits once and resolves segments in batches."""
+        e = self._build_evaluator_with_mocks(mocker)
+        mocked_split = mocker.Mock(spec=Split)
+        mocked_split.killed = False
+        mocked_split.change_number = 123
+        mocked_split.get_segment_names.return_value = ['segment1']
+        mocked_split.get_configurations_for.return_value = None
+        mocked_split.plan.conditions = []
+        e._split_storage.get_evaluation_order.return_value = (
+            OrderedDict([('f1', mocked_split), ('f2', None)]),
+            set()
+        )
+        e._segment_storage.segment_contains_keys.side_effect = lambda name, keys: set(['k2'])
+        e._get_treatment_for_split = mocker.Mock()
+        e._get_treatment_for_split.return_value = ('on', 'some_label')
+
+        results = list(e.evaluate_treatments_for_keys(
+            ['f1', 'f2'],
+            [('k1', None), ('k2', 'b2'), ('k3', None)],
+            {'attr1': 1},
+            batch_size=2
+        ))
+        assert [(mk, bk) for mk, bk, _ in results] == [('k1', None), ('k2', 'b2'), ('k3', None)]
+        assert results[0][2]['f1']['treatment'] == 'on'
+        assert results[0][2]['f2']['treatment'] == evaluator.CONTROL
+        assert results[0][2]['f2']['impression']['label'] == Label.SPLIT_NOT_FOUND
+        assert e._split_storage.get_evaluation_order.mock_calls == [mocker.call(['f1', 'f2'])]
+        assert e._segment_storage.segment_contains_keys.mock_calls == [
+            mocker.call('segment1', ['k1', 'k2']),
+            mocker.call('segment1', ['k3'])
+        ]
+        assert [call[1][:4] for call in e._get_treatment_for_split.mock_calls] == [
+            (mocked_split, 'k1', None, {'attr1': 1}),
+            (mocked_split, 'k2', 'b2', {'attr1': 1}),
+            (mocked_split, 'k3', None, {'attr1': 1})
+        ]
+        assert [call[1][4]['segment_memberships'] for call in e._get_treatment_for_split.mock_calls] == [
+            {'segment1': False},
+            {'segment1': True},
+            {'segment1': False}
+        ]
+
+    def test_evaluate_treatments_for_keys_buckets(self, mocker):
+        """Test that the buckets of each batch are computed at once per seed."""
+        split_storage = InMemorySplitStorage()
+        split_storage.put(splits.from_raw({
+            'changeNumber': 123,
+            'trafficTypeName': 'user',
+            'name': 'f1',
+            'trafficAllocation': 50,
+            'trafficAllocationSeed': 123456,
+            'seed': 321654,
+            'status': 'ACTIVE',
+            'killed': False,
+            'defaultTreatment': 'off',
+            'algo': 2,
+            'conditions': [{
+                'conditionType': 'ROLLOUT',
+                'label': 'default',
+                'matcherGroup': {
+                    'combiner': 'AND',
+                    'matchers': [{'matcherType': 'ALL_KEYS', 'negate': False}]
+                },
+                'partitions': [{'treatment': 'on', 'size': 50}, {'treatment': 'off', 'size': 50}]
+            }]
+        }))
+        e = evaluator.Evaluator(split_storage, InMemorySegmentStorage(), Splitter())
+        keys = [('key%d' % index, None) for index in range(20)] + [('key', 'bucketing')]
+        expected = [
+            e.evaluate_treatment('f1', matching_key, bucketing_key, None)['impression']
+            for matching_key, bucketing_key in keys
+        ]
+
+        murmur = splits.HashAlgorithm.MURMUR
+        get_buckets = mocker.spy(Splitter, 'get_buckets')
+        get_bucket = mocker.spy(e._splitter, 'get_bucket')
+        results = list(e.evaluate_treatments_for_keys(['f1'], keys, batch_size=15))
+        assert [result['f1']['impression'] for _, _, result in results] == expected
+        assert sorted(call[0][1:] for call in get_buckets.call_args_list) == [
+            (123456, murmur), (123456, murmur), (321654, murmur), (321654, murmur)
+        ]
+        assert get_buckets.call_args_list[-1][0][0] == ['key15', 'key16', 'key17', 'key18',
+                                                        'key19', 'bucketing']
+        assert get_bucket.call_args_list == []
+
+    def test_evaluate_treatments_with_dependencies(self):
+        """Test that shared parents are evaluated once and cycles don't recurse forever."""
+        def _dependency_condition(parent):
+            return {
+                'conditionType': 'WHITELIST',
+                'label': 'in split ' + parent,
+                'matcherGroup': {
+                    'combiner': 'AND',
+                    'matchers': [{
+                        'matcherType': 'IN_SPLIT_TREATMENT',
+                        'negate': False,
+                        'dependencyMatcherData': {'split': parent, 'treatments': ['on']}
+                    }]
+                },
+                'partitions': [{'treatment': 'on', 'size': 100}]
+            }
+
+        def _split(name, parents):
+            return splits.from_raw({
+                'changeNumber': 123,
+                'trafficTypeName': 'user',
+                'name': name,
+                'trafficAllocation': 100,
+                'trafficAllocationSeed': 123456,
+                'seed': 321654,
+                'status': 'ACTIVE',
+                'killed': False,
+                'defaultTreatment': 'off',
+                'algo': 2,
+                'conditions': [_dependency_condition(parent) for parent in parents] or [{
+                    'conditionType': 'ROLLOUT',
+                    'label': 'default',
+                    'matcherGroup': {
+                        'combiner': 'AND',
+                        'matchers': [{'matcherType': 'ALL_KEYS', 'negate': False}]
+                    },
+                    'partitions': [{'treatment': 'on', 'size': 100}]
+                }]
+            })
+
+        split_storage = InMemorySplitStorage()
+        for split in [_split('parent', []), _split('child1', ['parent']),
+                      _split('child2', ['child1', 'parent']),
+                      _split('cycle1', ['cycle2']), _split('cycle2', ['cycle1'])]:
+            split_storage.put(split)
+
+        ordered, cyclic = split_storage.get_evaluation_order(['child2', 'child1', 'missing'])
+        assert list(ordered.keys()) == ['parent', 'child1', 'child2', 'missing']
+        assert ordered['missing'] is None
+        assert cyclic == set()
+
+        ordered, cyclic = split_storage.get_evaluation_order(['cycle1', 'parent'])
+        assert list(ordered.keys()) == ['cycle2', 'cycle1', 'parent']
+        assert cyclic == set(['cycle1', 'cycle2'])
+
+        e = evaluator.Evaluator(split_storage, InMemorySegmentStorage(), Splitter())
+        original_get = split_storage.get
+        fetched = []
+        def _get(name):
+            fetched.append(name)
+            return original_get(name)
+        split_storage.get = _get
+        e._get_treatment_for_split = _CountingWrapper(e._get_treatment_for_split)
+
+        results = e.evaluate_treatments(['child2', 'child1'], 'key', None)
+        assert results['child1']['treatment'] == 'on'
+        assert results['child2']['treatment'] == 'on'
+        # Splits & their dependencies are read from a single snapshot, not one by one.
+        assert fetched == []
+        assert sorted(e._get_treatment_for_split.evaluated) == ['child1', 'child2', 'parent']
+
+        results = e.evaluate_treatments(['cycle1'], 'key', None)
+        assert results['cycle1']['treatment'] == 'off'
+        assert results['cycle1']['impression']['label'] == Label.NO_CONDITION_MATCHED
+        assert e.evaluate_treatment('cycle2', 'key', None)['treatment'] == 'off'
+
+    def test_evaluate_treatments_prefetches_memberships(self, mocker):
+        """Test that memberships in every referenced segment are resolved before evaluating."""
+        def _split(name, segment_names):
+            return splits.from_raw({
+                'changeNumber': 123,
+                'trafficTypeName': 'user',
+                'name': name,
+                'trafficAllocation': 100,
+                'trafficAllocationSeed': 123456,
+                'seed': 321654,
+                'status': 'ACTIVE',
+                'killed': False,
+                'defaultTreatment': 'off',
+                'algo': 2,
+                'conditions': [{
+                    'conditionType': 'WHITELIST',
+                    'label': 'in ' + segment_name,
+                    'matcherGroup': {
+                        'combiner': 'AND',
+                        'matchers': [{
+                            'matcherType': 'IN_SEGMENT',
+                            'negate': False,
+                            'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+                        }]
+                    },
+                    'partitions': [{'treatment': segment_name, 'size': 100}]
+                } for segment_name in segment_names]
+            })
+
+        split_storage = InMemorySplitStorage()
+        split_storage.put(_split('f1', ['s1', 's2']))
+        split_storage.put(_split('f2', ['s2', 's3']))
+        segment_storage = mocker.Mock(spec=SegmentStorage)
+        segment_storage.get_key_segments.return_value = None
+        segment_storage.get_segment_memberships.side_effect = lambda names, key: {
+            name: name == 's3' for name in names
+        }
+        e = evaluator.Evaluator(split_storage, segment_storage, Splitter())
+
+        results = e.evaluate_treatments(['f1', 'f2'], 'key', None)
+        assert results['f1']['treatment'] == 'off'
+        assert results['f2']['treatment'] == 's3'
+        assert len(segment_storage.get_segment_memberships.mock_calls) == 1
+        assert set(segment_storage.get_segment_memberships.mock_calls[0][1][0]) == \
+            set(['s1', 's2', 's3'])
+        assert not segment_storage.segment_contains.mock_calls
+
+        # Single evaluations resolve the memberships of their split at once too.
+        segment_storage.reset_mock()
+        assert e.evaluate_treatment('f2', 'key', None)['treatment'] == 's3'
+        assert len(segment_storage.get_segment_memberships.mock_calls) == 1
+        assert not segment_storage.segment_contains.mock_calls
+
+        # Storages not supporting it are queried once per matcher.
+        segment_storage.reset_mock()
+        segment_storage.get_segment_memberships.side_effect = None
+        segment_storage.get_segment_memberships.return_value = None
+        segment_storage.segment_contains.side_effect = lambda name, key: name == 's3'
+        assert e.evaluate_treatments(['f2'], 'key', None)['f2']['treatment'] == 's3'
+        assert len(segment_storage.segment_contains.mock_calls) == 2
+
+    def test_evaluate_treatments_isolates_errors(self, mocker):
+        """Test that an error evaluating a feature doesn't affect the rest."""
+        def _split(name, segment_names):
+            return splits.from_raw({
+                'changeNumber': 123,
+                'trafficTypeName': 'user',
+                'name': name,
+                'trafficAllocation': 100,
+                'trafficAllocationSeed': 123456,
+                'seed': 321654,
+                'status': 'ACTIVE',
+                'killed': False,
+                'defaultTreatment': 'off',
+                'algo': 2,
+                'conditions': [{
+                    'conditionType': 'WHITELIST',
+                    'label': 'in ' + segment_name,
+                    'matcherGroup': {
+                        'combiner': 'AND',
+                        'matchers': [{
+                            'matcherType': 'IN_SEGMENT',
+                            'negate': False,
+                            'userDefinedSegmentMatcherData': {'segmentName': segment_name}
+                        }]
+                    },
+                    'partitions': [{'treatment': segment_name, 'size': 100}]
+                } for segment_name in segment_names]
+            })
+
+        def _segment_contains(name, key):
+            if name == 's1':
+                raise Exception('something')
+            return name == 's3'
+
+        split_storage = InMemorySplitStorage()
+        split_storage.put(_split('f1', ['s1']))
+        split_storage.put(_split('f2', ['s2', 's3']))
+        segment_storage = mocker.Mock(spec=SegmentStorage)
+        segment_storage.get_key_segments.return_value = None
+        segment_storage.get_segment_memberships.return_value = None
+        segment_storage.segment_contains.side_effect = _segment_contains
+        e = evaluator.Evaluator(split_storage, segment_storage, Splitter())
+
+        results = e.evaluate_treatments(['f1', 'f2'], 'key', None)
+        assert results['f1'] == {
+            'treatment': evaluator.CONTROL,
+            'configurations': None,
+            'impression': {'label': Label.EXCEPTION, 'change_number': -1}
+        }
+        assert results['f2']['treatment'] == 's3'
+
+        # A failed evaluation isn't mistaken for a circular dependency later on.
+        context = e.build_context('key', None)
+        assert e.evaluate_treatments(['f1'], 'key', None, context=context)['f1']['impression'] == \
+            {'label': Label.EXCEPTION, 'change_number': -1}
+        assert context['evaluations'] == {}
+        segment_storage.segment_contains.side_effect = lambda name, key: name == 's1'
+        assert e.evaluate_treatment('f1', 'key', None, context=context)['treatment'] == 's1'
+
+class _CountingWrapper(object):  #pylint: disable=too-few-public-methods
+    """Record the names of the splits evaluated through the wrapped method."""
+
+    def __init__(self, method):
+        self.method = method
+        self.evaluated = []
+
+    def __call__(self, split, *args, **kwargs):
+        self.evaluated.append(split.name)
+        return self.method(split, *args, **kwargs)
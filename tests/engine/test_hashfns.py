@@ -87,3 +87,37 @@ class HashFunctionsTests(object):
             hashed = int(hashed)
             assert hashfns._murmur_hash(key, seed) == hashed
             assert splitter.get_bucket(key, seed, splits.HashAlgorithm.MURMUR) == bucket
+
+    @pytest.mark.skipif(hashfns.vectorized is None, reason='numpy is not installed')
+    def test_vectorized_hash_functions(self):
+        """Test that vectorized hash functions match the scalar ones bit for bit."""
+        rows = []
+        for name in ['sample-data.jsonl', 'sample-data-non-alpha-numeric.jsonl']:
+            file_name = os.path.join(os.path.dirname(__file__), 'files', name)
+            with io.open(file_name, 'r', encoding='utf-8') as flo:
+                rows.extend(json.loads(line) for line in flo if line.strip())
+
+        keys = [row[1] for row in rows] + ['', 'a', 'ab', 'abc', 'abcd', 'key\x00', '\x00']
+        for seed in [row[0] for row in rows[:10]] + [0, -1, 2147483647, -2147483648]:
+            legacy_hashes = hashfns.vectorized.legacy_hash(keys, seed).tolist()
+            assert legacy_hashes == [hashfns.legacy.legacy_hash(key, seed) for key in keys]
+            murmur_hashes = hashfns.vectorized.murmur32(keys, seed).tolist()
+            assert murmur_hashes == [hashfns.murmur3py.murmur32_py(key, seed) for key in keys]
+
+        # Only ascii samples carry buckets computed by the legacy hash as implemented here.
+        for seed, key, _, bucket in rows[:100]:
+            assert hashfns.get_buckets([key], seed, splits.HashAlgorithm.LEGACY) == [bucket]
+
+        assert hashfns.vectorized.murmur32([], 123).tolist() == []
+        assert hashfns.vectorized.legacy_hash([], 123).tolist() == []
+
+    def test_get_buckets(self, mocker):
+        """Test that bulk bucketing matches single key bucketing, with & without numpy."""
+        splitter = splitters.Splitter()
+        keys = ['key%d' % index for index in range(200)]
+        for algo in [splits.HashAlgorithm.LEGACY, splits.HashAlgorithm.MURMUR]:
+            expected = [splitter.get_bucket(key, 123456, algo) for key in keys]
+            assert splitter.get_buckets(keys, 123456, algo) == expected
+            mocker.patch('splitio.engine.hashfns.vectorized', new=None)
+            assert splitter.get_buckets(keys, 123456, algo) == expected
+            mocker.stopall()
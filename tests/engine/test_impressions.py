@@ -0,0 +1,118 @@
+"""Impressions deduplication tests module."""
+#pylint: disable=no-self-use
+
+from splitio.engine.impressions import ImpressionObserver, ImpressionsCounter, \
+    ImpressionsManager, ImpressionsMode, CountPerFeature, truncate_time_frame
+from splitio.models.impressions import Impression
+from splitio.storage import ImpressionStorage
+from splitio.storage.inmemmory import InMemoryImpressionStorage
+
+
+_HOUR = 3600 * 1000
+
+
+class ImpressionObserverTests(object):
+    """Impression observer test cases."""
+
+    def test_test_and_set(self):
+        """Test that previous times are returned for equivalent impressions only."""
+        observer = ImpressionObserver(2)
+        assert observer.test_and_set(Impression('k1', 'f1', 'on', 'l1', 123, None, 1000)) is None
+        assert observer.test_and_set(Impression('k1', 'f1', 'on', 'l1', 123, None, 2000)) == 1000
+        assert observer.test_and_set(Impression('k1', 'f1', 'off', 'l1', 123, None, 3000)) is None
+        assert observer.test_and_set(Impression('k1', 'f1', 'on', 'l1', 124, None, 3000)) is None
+
+        # Least recently seen impressions are forgotten
+        assert len(observer) == 2
+        assert observer.test_and_set(Impression('k1', 'f1', 'on', 'l1', 123, None, 4000)) is None
+
+
+class ImpressionsCounterTests(object):
+    """Impressions counter test cases."""
+
+    def test_track_pop(self):
+        """Test that impressions are counted per feature & hour."""
+        counter = ImpressionsCounter()
+        counter.track([
+            Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 1),
+            Impression('k2', 'f1', 'on', 'l1', 123, None, _HOUR + 2),
+            Impression('k1', 'f2', 'on', 'l1', 123, None, _HOUR + 3),
+            Impression('k1', 'f1', 'on', 'l1', 123, None, 2 * _HOUR + 1)
+        ])
+        assert sorted(counter.pop_all()) == [
+            CountPerFeature('f1', _HOUR, 2),
+            CountPerFeature('f1', 2 * _HOUR, 1),
+            CountPerFeature('f2', _HOUR, 1)
+        ]
+        assert counter.pop_all() == []
+
+
+class ImpressionsManagerTests(object):
+    """Impressions manager test cases."""
+
+    def test_truncate_time_frame(self):
+        """Test timestamps are truncated to the hour."""
+        assert truncate_time_frame(_HOUR * 5 + 12345) == _HOUR * 5
+        assert truncate_time_frame(_HOUR * 5) == _HOUR * 5
+
+    def test_debug(self):
+        """Test that every impression is stored in debug mode."""
+        storage = InMemoryImpressionStorage(100)
+        manager = ImpressionsManager(storage, ImpressionsMode.DEBUG)
+        impressions = [
+            Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 1),
+            Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 2)
+        ]
+        assert manager.process_impressions(impressions) == impressions
+        manager.flush_counts()
+        assert storage.pop_counts() == []
+
+    def test_optimized(self):
+        """Test that repeated impressions are only counted in optimized mode."""
+        storage = InMemoryImpressionStorage(100)
+        manager = ImpressionsManager(storage, ImpressionsMode.OPTIMIZED, counts_refresh_rate=3600)
+        first = Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 1)
+        assert manager.process_impressions([first]) == [first]
+        assert manager.process_impressions([
+            Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 2),
+            Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 3)
+        ]) == []
+
+        other = Impression('k2', 'f1', 'on', 'l1', 123, None, _HOUR + 4)
+        next_hour = Impression('k1', 'f1', 'on', 'l1', 123, None, 2 * _HOUR + 1)
+        assert manager.process_impressions([other, next_hour]) == [other, next_hour]
+
+        # Counts are only handed to storage when flushing or once the refresh rate expires
+        assert storage.pop_counts() == []
+        manager.flush_counts()
+        assert sorted(storage.pop_counts()) == [
+            CountPerFeature('f1', _HOUR, 4),
+            CountPerFeature('f1', 2 * _HOUR, 1)
+        ]
+
+        manager = ImpressionsManager(storage, ImpressionsMode.OPTIMIZED, counts_refresh_rate=0)
+        manager.process_impressions([first])
+        assert storage.pop_counts() == [CountPerFeature('f1', _HOUR, 1)]
+
+    def test_custom_storage(self):
+        """Test that storages not supporting counts still work in optimized mode."""
+        class _Storage(ImpressionStorage):
+            def put(self, impressions):
+                pass
+
+            def pop_many(self, count):
+                return []
+
+        storage = _Storage()
+        manager = ImpressionsManager(storage, ImpressionsMode.OPTIMIZED, counts_refresh_rate=0)
+        manager.process_impressions([Impression('k1', 'f1', 'on', 'l1', 123, None, _HOUR + 1)])
+        assert storage.pop_counts() == []
+
+    def test_invalid_mode(self):
+        """Test that unknown modes are rejected."""
+        try:
+            ImpressionsManager(None, 'SOMETHING')
+        except ValueError:
+            pass
+        else:
+            assert False
@@ -1,25 +1,11 @@
 """Splitter test module."""
 
-from splitio.models.grammar.partitions import Partition
-from splitio.engine.splitters import Splitter, CONTROL
+from splitio.engine.splitters import Splitter
 
 
 class SplitterTests(object):
     """Tests for engine/splitter."""
 
-    def test_get_treatment(self, mocker):
-        """Test get_treatment method on all possible outputs."""
-        splitter = Splitter()
-
-        # no partitions returns control
-        assert splitter.get_treatment('key', 123, [], 1) == CONTROL
-        # single partition returns that treatment
-        assert splitter.get_treatment('key', 123, [Partition('on', 100)], 1) == 'on'
-        # multiple partitions call hash_functions
-        splitter.get_treatment_for_bucket = lambda x,y: 'on'
-        partitions = [Partition('on', 50), Partition('off', 50)]
-        assert splitter.get_treatment('key', 123, partitions, 1) == 'on'
-
     def test_get_bucket(self, mocker):
         """Test get_bucket method."""
         get_hash_fn_mock = mocker.Mock()
@@ -32,20 +18,47 @@ class SplitterTests(object):
         assert get_hash_fn_mock.mock_calls == [mocker.call(1)]
         assert hash_fn.mock_calls == [mocker.call(1, 123)]
 
-    def test_treatment_for_bucket(self, mocker):
-        """Test treatment for bucket method."""
+    def test_get_treatment_for_table(self, mocker):
+        """Test that treatments are looked up by bucket with the supplied hash function."""
+        hash_fn = mocker.Mock()
+        hash_fn.return_value = -149
+        get_hash_fn_mock = mocker.Mock()
+        mocker.patch('splitio.engine.splitters.get_hash_fn', new=get_hash_fn_mock)
         splitter = Splitter()
-        assert splitter.get_treatment_for_bucket(0, []) == CONTROL
-        assert splitter.get_treatment_for_bucket(-1, []) == CONTROL
-        assert splitter.get_treatment_for_bucket(101, [Partition('a', 100)]) == CONTROL
-        assert splitter.get_treatment_for_bucket(1, [Partition('a', 100)]) == 'a'
-        assert splitter.get_treatment_for_bucket(100, [Partition('a', 100)]) == 'a'
-        assert splitter.get_treatment_for_bucket(50, [Partition('a', 50), Partition('b', 50)]) == 'a'
-        assert splitter.get_treatment_for_bucket(51, [Partition('a', 50), Partition('b', 50)]) == 'b'
-
-
-
-
+        table = ('on',) * 50 + ('off',) * 50
+        assert splitter.get_treatment_for_table('key', 123, table, 2, hash_fn) == 'on'
+        hash_fn.return_value = 50
+        assert splitter.get_treatment_for_table('key', 123, table, 2, hash_fn) == 'off'
+        assert hash_fn.mock_calls == [mocker.call('key', 123), mocker.call('key', 123)]
+        assert get_hash_fn_mock.mock_calls == []
 
+    def test_bucket_cache(self, mocker):
+        """Test that buckets are memoized in LRU order when the cache is enabled."""
+        hash_fn = mocker.Mock()
+        hash_fn.return_value = 42
+        mocker.patch('splitio.engine.splitters.get_hash_fn', new=lambda algo: hash_fn)
+        splitter = Splitter(bucket_cache_size=2)
+        assert splitter.get_bucket('key1', 123, 2) == 43
+        assert splitter.get_bucket('key1', 123, 2) == 43
+        assert splitter.get_bucket('key1', 456, 2) == 43
+        assert hash_fn.mock_calls == [mocker.call('key1', 123), mocker.call('key1', 456)]
+        assert splitter.cache_hits == 1
+        assert splitter.cache_misses == 2
 
+        # ('key1', 123, 2) is now the least recently used entry and gets evicted.
+        splitter.get_bucket('key2', 123, 2)
+        assert len(splitter._cache) == 2
+        hash_fn.reset_mock()
+        splitter.get_bucket('key1', 456, 2)
+        splitter.get_bucket('key1', 123, 2)
+        assert hash_fn.mock_calls == [mocker.call('key1', 123)]
+        assert splitter.cache_hits == 2
+        assert splitter.cache_misses == 4
 
+        # Disabled by default.
+        splitter = Splitter()
+        splitter.get_bucket('key1', 123, 2)
+        splitter.get_bucket('key1', 123, 2)
+        assert splitter._cache is None
+        assert splitter.cache_hits == 0
+        assert splitter.cache_misses == 0
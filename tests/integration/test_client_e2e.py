@@ -12,6 +12,7 @@ from splitio.storage.inmemmory import InMemoryEventStorage, InMemoryImpressionSt
 from splitio.storage.redis import RedisEventsStorage, RedisImpressionsStorage, \
     RedisSplitStorage, RedisSegmentStorage, RedisTelemetryStorage
 from splitio.storage.adapters.redis import RedisAdapter
+from splitio.engine.cache import EvaluationCache
 from splitio.models import splits, segments
 
 
@@ -225,6 +226,39 @@ class InMemoryIntegrationTests(object):
             ('sample_feature', 'invalidKey', 'off'),
         )
 
+    def test_get_treatments_for_keys(self):
+        """Test client.get_treatments_for_keys()."""
+        client = self.factory.client()
+        keys = ['user1', 'invalidKey', 'whitelisted_user']
+        features = ['sample_feature', 'whitelist_feature', 'invalid_feature']
+        results = list(client.get_treatments_for_keys(keys, features))
+        assert results == [
+            (key, client.get_treatments(key, features)) for key in keys
+        ]
+        imp_storage = client._factory._get_storage('impressions')
+        assert len(imp_storage.pop_many(100)) == 2 * len(keys) * len(features)
+
+    def test_evaluation_cache(self):
+        """Test that cached evaluations still generate impressions and get invalidated."""
+        self.factory._evaluation_cache = EvaluationCache(
+            self.factory._get_storage('splits'),
+            self.factory._get_storage('segments'),
+            100
+        )
+        client = self.factory.client()
+        for _ in range(3):
+            assert client.get_treatment('user1', 'sample_feature') == 'on'
+            self._validate_last_impressions(client, ('sample_feature', 'user1', 'on'))
+        assert self.factory.evaluation_cache.hits == 2
+        assert self.factory.evaluation_cache.misses == 1
+
+        split_storage = self.factory._get_storage('splits')
+        killed = split_storage.get('sample_feature').to_json()
+        killed['killed'] = True
+        split_storage.put(splits.from_raw(killed))
+        assert client.get_treatment('user1', 'sample_feature') == 'off'
+        self._validate_last_impressions(client, ('sample_feature', 'user1', 'off'))
+
     def test_manager_methods(self):
         """Test manager.split/splits."""
         manager = self.factory.manager()
@@ -4,7 +4,11 @@
 import json
 import os
 
+from redis.client import Pipeline
+
 from splitio.client.util import get_metadata
+from splitio.engine.evaluator import Evaluator
+from splitio.engine.splitters import Splitter
 from splitio.models import splits, impressions, events
 from splitio.storage.redis import RedisSplitStorage, RedisSegmentStorage, RedisImpressionsStorage, \
     RedisEventsStorage, RedisTelemetryStorage
@@ -111,6 +115,30 @@ class SplitStorageTests(object):
                 'SPLITIO.split.dependency_test'
             )
 
+    def test_get_all_indexed(self):
+        """Test get all names & splits through the split names index."""
+        adapter = _build_default_client({})
+        try:
+            storage = RedisSplitStorage(adapter)
+            with open(os.path.join(os.path.dirname(__file__), 'files', 'split_changes.json'), 'r') as flo:
+                split_changes = json.load(flo)
+
+            split_objects = [splits.from_raw(raw) for raw in split_changes['splits']]
+            storage.apply_changes(split_objects, [], split_changes['till'])
+            storage.apply_changes([], [split_objects[0].name], split_changes['till'] + 1)
+
+            expected = set(split.name for split in split_objects[1:])
+            assert set(adapter.smembers(RedisSplitStorage._SPLIT_NAMES_KEY)) == expected
+            assert set(storage.get_split_names()) == expected
+            assert set(split.name for split in storage.get_all_splits()) == expected
+        finally:
+            adapter.delete(
+                RedisSplitStorage._SPLIT_NAMES_KEY,
+                RedisSplitStorage._SPLIT_TILL_KEY,
+                *[RedisSplitStorage._SPLIT_KEY.format(split_name=raw['name'])
+                  for raw in split_changes['splits']]
+            )
+
 class SegmentStorageTests(object):
     """Redis Segment storage e2e tests."""
 
@@ -134,6 +162,56 @@ class SegmentStorageTests(object):
         finally:
             adapter.delete('SPLITIO.segment.some_segment', 'SPLITIO.segment.some_segment.till')
 
+    def test_evaluation_round_trips(self, mocker):
+        """Test that get_treatments resolves splits & segment memberships in two round-trips."""
+        adapter = _build_default_client({})
+        try:
+            split_storage = RedisSplitStorage(adapter)
+            segment_storage = RedisSegmentStorage(adapter)
+            for index in range(3):
+                adapter.sadd(segment_storage._get_key('segment%d' % index), 'key%d' % index)
+            for index in range(5):
+                adapter.set(split_storage._get_key('feature%d' % index), json.dumps({
+                    'changeNumber': 123,
+                    'trafficTypeName': 'user',
+                    'name': 'feature%d' % index,
+                    'trafficAllocation': 100,
+                    'trafficAllocationSeed': 123456,
+                    'seed': 321654,
+                    'status': 'ACTIVE',
+                    'killed': False,
+                    'defaultTreatment': 'off',
+                    'algo': 2,
+                    'conditions': [{
+                        'conditionType': 'WHITELIST',
+                        'label': 'in segment%d' % segment,
+                        'matcherGroup': {
+                            'combiner': 'AND',
+                            'matchers': [{
+                                'matcherType': 'IN_SEGMENT',
+                                'negate': False,
+                                'userDefinedSegmentMatcherData': {
+                                    'segmentName': 'segment%d' % segment
+                                }
+                            }]
+                        },
+                        'partitions': [{'treatment': 'segment%d' % segment, 'size': 100}]
+                    } for segment in range(3)]
+                }))
+
+            commands = mocker.spy(adapter._decorated, 'execute_command')
+            pipelines = mocker.spy(Pipeline, 'execute')
+            evaluator = Evaluator(split_storage, segment_storage, Splitter())
+            features = ['feature%d' % index for index in range(5)]
+            results = evaluator.evaluate_treatments(features, 'key2', None)
+            assert [results[feature]['treatment'] for feature in features] == ['segment2'] * 5
+            assert len(commands.mock_calls) + len(pipelines.mock_calls) == 2
+        finally:
+            adapter.delete(*(
+                ['SPLITIO.segment.segment%d' % index for index in range(3)] +
+                ['SPLITIO.split.feature%d' % index for index in range(5)]
+            ))
+
 
 class ImpressionsStorageTests(object):
     """Redis Impressions storage e2e tests."""
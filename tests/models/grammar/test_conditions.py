@@ -3,6 +3,7 @@
 from splitio.models.grammar import condition
 from splitio.models.grammar import partitions
 from splitio.models.grammar import matchers
+from splitio.models.treatments import CONTROL
 
 class ConditionTests(object):
     """Test the condition object model."""
@@ -39,6 +40,28 @@ class ConditionTests(object):
         assert parsed.partitions[1].size == 50
         assert parsed._combiner == condition._MATCHER_COMBINERS['AND']
 
+    def test_bucket_treatments(self):
+        """Test that the lookup table agrees with scanning the partitions."""
+        cases = [
+            [],
+            [('on', 100)],
+            [('on', 0), ('off', 100)],
+            [('on', 50), ('off', 50)],
+            [('a', 10), ('b', 20), ('c', 30), ('d', 40)],
+            [('a', 33.3), ('b', 33.3), ('c', 33.4)],
+            [('on', 30)],
+        ]
+        for parts in cases:
+            cond = condition.Condition(
+                [], condition._MATCHER_COMBINERS['AND'],
+                [partitions.Partition(treatment, size) for treatment, size in parts],
+                'some_label'
+            )
+            assert len(cond.bucket_treatments) == 100
+            assert list(cond.bucket_treatments) == [
+                _treatment_for_bucket(bucket, cond.partitions) for bucket in range(1, 101)
+            ]
+
     def test_segment_names(self, mocker):
         """Test fetching segment_names."""
         matcher1 = mocker.Mock(spec=matchers.UserDefinedSegmentMatcher)
@@ -76,3 +99,13 @@ class ConditionTests(object):
         assert cond.matches('some_key', {'a': 1}, {'some_context_option': 0}) == True
         assert matcher1_mock.evaluate.mock_calls == [mocker.call('some_key', {'a': 1}, {'some_context_option': 0})]
         assert matcher2_mock.evaluate.mock_calls == [mocker.call('some_key', {'a': 1}, {'some_context_option': 0})]
+
+
+def _treatment_for_bucket(bucket, parts):
+    """Return the treatment of a bucket scanning the partitions."""
+    covered_buckets = 0
+    for partition in parts:
+        covered_buckets += partition.size
+        if covered_buckets >= bucket:
+            return partition.treatment
+    return CONTROL
@@ -413,6 +413,28 @@ class UserDefinedSegmentMatcherTests(MatcherTestsBase):
             mocker.call('some_segment', 'some_key')
         ]
 
+        # Memberships resolved in advance skip the storage.
+        segment_storage.segment_contains.reset_mock()
+        context = {'segment_storage': segment_storage,
+                   'segment_memberships': {'some_segment': True}}
+        assert matcher.evaluate('some_key', {}, context) is True
+        context['segment_memberships'] = {'some_segment': False}
+        assert matcher.evaluate('some_key', {}, context) is False
+        context['segment_memberships'] = {'other_segment': True}
+        assert matcher.evaluate('some_key', {}, context) is False
+        assert segment_storage.segment_contains.mock_calls == [
+            mocker.call('some_segment', 'some_key')
+        ]
+
+        # So do the segments of the key fetched from a reverse index.
+        segment_storage.segment_contains.reset_mock()
+        context = {'segment_storage': segment_storage,
+                   'key_segments': frozenset(['some_segment'])}
+        assert matcher.evaluate('some_key', {}, context) is True
+        context['key_segments'] = frozenset(['other_segment'])
+        assert matcher.evaluate('some_key', {}, context) is False
+        assert segment_storage.segment_contains.mock_calls == []
+
         assert matcher.evaluate([], {}, {'segment_storage': segment_storage}) is False
         assert matcher.evaluate({}, {}, {'segment_storage': segment_storage}) is False
         assert matcher.evaluate(123, {}, {'segment_storage': segment_storage}) is False
@@ -787,15 +809,16 @@ class DependencyMatcherTests(MatcherTestsBase):
         parsed = matchers.DependencyMatcher(self.raw)
         evaluator = mocker.Mock(spec=Evaluator)
 
-        evaluator.evaluate_treatment.return_value = {'treatment': 'on'}
-        assert parsed.evaluate('test1', {}, {'bucketing_key': 'buck', 'evaluator': evaluator}) is True
+        context = {'bucketing_key': 'buck', 'evaluator': evaluator}
+        evaluator.evaluate_dependency.return_value = {'treatment': 'on'}
+        assert parsed.evaluate('test1', {}, context) is True
 
-        evaluator.evaluate_treatment.return_value = {'treatment': 'off'}
-        assert parsed.evaluate('test1', {}, {'bucketing_key': 'buck', 'evaluator': evaluator}) is False
+        evaluator.evaluate_dependency.return_value = {'treatment': 'off'}
+        assert parsed.evaluate('test1', {}, context) is False
 
-        assert evaluator.evaluate_treatment.mock_calls == [
-            mocker.call('some_split', 'test1', 'buck', {}),
-            mocker.call('some_split', 'test1', 'buck', {})
+        assert evaluator.evaluate_dependency.mock_calls == [
+            mocker.call('some_split', 'test1', {}, context),
+            mocker.call('some_split', 'test1', {}, context)
         ]
 
         assert parsed.evaluate([], {}, {'bucketing_key': 'buck', 'evaluator': evaluator}) is False
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Segment model tests module."""
+#pylint: disable=no-self-use,protected-access
+from __future__ import unicode_literals
+
+from splitio.models.segments import Segment, CompactSegment
+
+
+class SegmentTests(object):
+    """Segment model tests."""
+
+    def test_update(self):
+        """Test that updates swap in a new set of keys."""
+        segment = Segment('some_segment', ['key1', 'key2'], 123)
+        keys = segment.keys
+        segment.update(['key3', 'key4'], ['key1', 'key4'])
+        assert keys == set(['key1', 'key2'])
+        assert segment.keys == set(['key2', 'key3'])
+        assert len(segment) == 2
+
+
+class CompactSegmentTests(object):
+    """Compact segment model tests."""
+
+    def test_contains(self):
+        """Test lookups against the packed keys."""
+        keys = ['key%d' % index for index in range(100)] + ['ключ', '']
+        segment = CompactSegment('some_segment', keys, 123)
+        assert segment.name == 'some_segment'
+        assert segment.change_number == 123
+        assert len(segment) == 102
+        assert segment.keys == set(keys)
+        for key in keys:
+            assert segment.contains(key)
+        for key in ['key100', 'key', 'ключи', 'a', 'zzz']:
+            assert not segment.contains(key)
+
+    def test_update(self):
+        """Test that updates are pending until there are enough of them."""
+        segment = CompactSegment('some_segment', ['key1', 'key2', 'key3'], 123)
+        segment.update(['key4', 'key5', 'key1'], ['key2', 'key5', 'key6'])
+        assert segment.keys == set(['key1', 'key3', 'key4'])
+        assert len(segment) == 3
+        assert segment.contains('key4')
+        assert not segment.contains('key2')
+        assert not segment.contains('key5')
+        assert len(segment._offsets) == 4
+
+        segment.update(['key2'], [])
+        assert segment.contains('key2')
+        assert segment._removed == set()
+
+        to_add = ['new%d' % index for index in range(CompactSegment._MIN_PENDING_CHANGES)]
+        segment.update(to_add, ['key1'])
+        assert segment._added == set()
+        assert segment._removed == set()
+        assert len(segment._offsets) == len(to_add) + 4
+        assert segment.keys == set(to_add + ['key2', 'key3', 'key4'])
+        assert all(segment.contains(key) for key in to_add)
+        assert not segment.contains('key1')
@@ -69,6 +69,28 @@ class RedisStorageAdapterTests(object):
         adapter.ttl('key1')
         assert redis_mock.ttl.mock_calls[0] == mocker.call('some_prefix.key1')
 
+        redis_mock.scan_iter.return_value = iter([b'some_prefix.key1', 'some_prefix.key2'])
+        assert list(adapter.scan_iter('key*', 100)) == ['key1', 'key2']
+        assert redis_mock.scan_iter.mock_calls[0] == mocker.call(match='some_prefix.key*', count=100)
+
+    def test_pipeline(self, mocker):
+        """Test that pipelined commands get the prefix and results are decoded."""
+        redis_mock = mocker.Mock(StrictRedis)
+        pipe_mock = mocker.Mock()
+        pipe_mock.execute.return_value = [True, b'value1', [b'value2', None]]
+        redis_mock.pipeline.return_value = pipe_mock
+        adapter = redis.RedisAdapter(redis_mock, 'some_prefix')
+
+        pipe = adapter.pipeline()
+        pipe.set('key1', 'value1')
+        pipe.get('key1')
+        pipe.mget(['key2', 'key3'])
+        assert pipe.execute() == [True, 'value1', ['value2', None]]
+        assert redis_mock.pipeline.mock_calls[0] == mocker.call(transaction=True)
+        assert pipe_mock.set.mock_calls == [mocker.call('some_prefix.key1', 'value1')]
+        assert pipe_mock.get.mock_calls == [mocker.call('some_prefix.key1')]
+        assert pipe_mock.mget.mock_calls == [mocker.call(['some_prefix.key2', 'some_prefix.key3'])]
+
     def test_adapter_building(self, mocker):
         """Test buildin different types of client according to parameters received."""
         strict_redis_mock = mocker.Mock(spec=StrictRedis)
@@ -1,12 +1,15 @@
 """In-Memory storage test module."""
 #pylint: disable=no-self-use
+import threading
+
 from splitio.models.splits import Split
-from splitio.models.segments import Segment
+from splitio.models.segments import Segment, CompactSegment
 from splitio.models.impressions import Impression
 from splitio.models.events import Event
+from splitio.engine.impressions import CountPerFeature
 
 from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
-    InMemoryImpressionStorage, InMemoryEventStorage, InMemoryTelemetryStorage
+    InMemoryImpressionStorage, InMemoryEventStorage, InMemoryTelemetryStorage, BoundedQueue
 
 
 class InMemorySplitStorageTests(object):
@@ -30,6 +33,58 @@ class InMemorySplitStorageTests(object):
         storage.remove('some_split')
         assert storage.get('some_split') is None
 
+    def test_version(self, mocker):
+        """Test that the version changes whenever splits are stored or removed."""
+        storage = InMemorySplitStorage()
+        split = mocker.Mock(spec=Split)
+        split.name = 'some_split'
+        assert storage.get_version() == 0
+        storage.put(split)
+        assert storage.get_version() == 1
+        storage.remove('nonexistant_split')
+        assert storage.get_version() == 1
+        storage.remove('some_split')
+        assert storage.get_version() == 2
+
+    def test_snapshot(self, mocker):
+        """Test that snapshots aren't affected by later changes."""
+        storage = InMemorySplitStorage()
+        split1 = mocker.Mock(spec=Split)
+        split1.name = 'split1'
+        split2 = mocker.Mock(spec=Split)
+        split2.name = 'split2'
+        storage.put(split1)
+        storage.set_change_number(10)
+
+        snapshot = storage.get_snapshot()
+        storage.put(split2)
+        storage.remove('split1')
+        storage.set_change_number(20)
+
+        assert snapshot.splits == {'split1': split1}
+        assert snapshot.change_number == 10
+        assert snapshot.version == 1
+        assert storage.get_snapshot().splits == {'split2': split2}
+        assert storage.get_snapshot().change_number == 20
+        assert storage.get_snapshot().version == 3
+
+    def test_apply_changes(self, mocker):
+        """Test that a set of changes is published as a single snapshot."""
+        storage = InMemorySplitStorage()
+        split1 = mocker.Mock(spec=Split)
+        split1.name = 'split1'
+        split2 = mocker.Mock(spec=Split)
+        split2.name = 'split2'
+        storage.put(split1)
+
+        snapshot = storage.get_snapshot()
+        storage.apply_changes([split2], ['split1', 'nonexistant_split'], 10)
+        assert snapshot.splits == {'split1': split1}
+        assert storage.get_snapshot() == ({'split2': split2}, 10, 2)
+
+        storage.apply_changes([], ['nonexistant_split'], 11)
+        assert storage.get_snapshot() == ({'split2': split2}, 11, 2)
+
     def test_store_get_changenumber(self):
         """Test that storing and retrieving change numbers works."""
         storage = InMemorySplitStorage()
@@ -119,6 +174,58 @@ class InMemorySegmentStorageTests(object):
         storage.segment_contains('some_segment', 'abc')
         assert segment.contains.mock_calls[0] == mocker.call('abc')
 
+    def test_reverse_index(self):
+        """Test that the reverse index tracks the segments of each key."""
+        storage = InMemorySegmentStorage()
+        storage.put(Segment('segment1', ['key1'], 1))
+        assert storage.get_key_segments('key1') is None
+
+        storage = InMemorySegmentStorage(reverse_index=True)
+        storage.put(Segment('segment1', ['key1', 'key2'], 1))
+        storage.update('segment2', ['key2', 'key3'], [], 1)
+        assert storage.get_key_segments('key1') == frozenset(['segment1'])
+        assert storage.get_key_segments('key2') == frozenset(['segment1', 'segment2'])
+        assert storage.get_key_segments('key3') == frozenset(['segment2'])
+        assert storage.get_key_segments('key4') == frozenset()
+
+        storage.update('segment2', ['key4', 'key5'], ['key2', 'key5', 'key6'], 2)
+        assert storage.get_key_segments('key2') == frozenset(['segment1'])
+        assert storage.get_key_segments('key4') == frozenset(['segment2'])
+        assert storage.get_key_segments('key5') == frozenset()
+
+        storage.put(Segment('segment1', ['key3'], 2))
+        assert storage.get_key_segments('key1') == frozenset()
+        assert storage.get_key_segments('key2') == frozenset()
+        assert storage.get_key_segments('key3') == frozenset(['segment1', 'segment2'])
+        assert storage._key_segments == {  #pylint: disable=protected-access
+            'key3': frozenset(['segment1', 'segment2']),
+            'key4': frozenset(['segment2'])
+        }
+
+    def test_compact_segments(self):
+        """Test that large segments are stored in a compact representation."""
+        storage = InMemorySegmentStorage(compact_segment_size=3)
+        storage.put(Segment('segment1', ['key1', 'key2'], 1))
+        storage.put(Segment('segment2', ['key1', 'key2', 'key3'], 1))
+        assert not isinstance(storage.get('segment1'), CompactSegment)
+        assert isinstance(storage.get('segment2'), CompactSegment)
+        assert storage.segment_contains('segment2', 'key3')
+
+        storage.update('segment1', ['key3'], [], 2)
+        assert isinstance(storage.get('segment1'), CompactSegment)
+        assert storage.get('segment1').keys == set(['key1', 'key2', 'key3'])
+        assert storage.get_change_number('segment1') == 2
+
+    def test_compact_segments_reverse_index(self):
+        """Test that replacing a compact segment only reindexes the changed keys."""
+        storage = InMemorySegmentStorage(reverse_index=True, compact_segment_size=3)
+        storage.put(Segment('segment1', ['key1', 'key2', 'key3'], 1))
+        assert isinstance(storage.get('segment1'), CompactSegment)
+        storage.put(Segment('segment1', ['key2', 'key3', 'key4'], 2))
+        assert storage.get_key_segments('key1') == frozenset()
+        assert storage.get_key_segments('key2') == frozenset(['segment1'])
+        assert storage.get_key_segments('key4') == frozenset(['segment1'])
+
     def test_segment_update(self):
         """Test updating a segment."""
         storage = InMemorySegmentStorage()
@@ -134,6 +241,99 @@ class InMemorySegmentStorageTests(object):
         assert not storage.segment_contains('some_segment', 'key3')
         assert storage.get_change_number('some_segment') == 456
 
+    def test_version(self):
+        """Test that the version only changes when segment data does."""
+        storage = InMemorySegmentStorage()
+        assert storage.get_version() == 0
+        storage.put(Segment('some_segment', ['key1'], 123))
+        assert storage.get_version() == 1
+        storage.update('some_segment', set(), set(), 123)
+        storage.set_change_number('some_segment', 123)
+        assert storage.get_version() == 1
+        storage.update('some_segment', set(['key2']), set(), 123)
+        assert storage.get_version() == 2
+        storage.update('some_segment', set(), set(), 456)
+        assert storage.get_version() == 3
+        storage.set_change_number('some_segment', 789)
+        assert storage.get_version() == 4
+        storage.update('other_segment', set(['key1']), set(), 123)
+        assert storage.get_version() == 5
+
+    def test_segment_contains_keys(self):
+        """Test resolving the membership of many keys at once."""
+        storage = InMemorySegmentStorage()
+        storage.put(Segment('some_segment', ['key1', 'key2', 'key3'], 123))
+        assert storage.segment_contains_keys('some_segment', ['key1', 'key3', 'key4']) == \
+            set(['key1', 'key3'])
+        assert storage.segment_contains_keys('nonexistant_segment', ['key1']) == set()
+
+
+class BoundedQueueTests(object):
+    """Bounded queue test cases."""
+
+    def test_put_pop(self):
+        """Test bulk puts & pops."""
+        items = BoundedQueue(5)
+        assert items.put_many([1, 2, 3])
+        assert not items.put_many([4, 5, 6, 7])
+        assert len(items) == 5
+        assert not items.put_many([8])
+        assert items.pop_many(2) == [1, 2]
+        assert items.pop_many(10) == [3, 4, 5]
+        assert items.pop_many(10) == []
+        assert items.put_many([9])
+        assert items.pop_many(1) == [9]
+
+        unbounded = BoundedQueue(0)
+        assert unbounded.put_many(list(range(10000)))
+        assert unbounded.pop_many(10000) == list(range(10000))
+
+    def test_overflow_policies(self):
+        """Test how each overflow policy handles items that don't fit."""
+        items = BoundedQueue(3)
+        assert not items.put_many([1, 2, 3, 4, 5])
+        assert items.dropped == 2
+        assert items.pop_many(10) == [1, 2, 3]
+
+        items = BoundedQueue(3, BoundedQueue.OVERFLOW_DROP_OLDEST)
+        assert items.put_many([1, 2])
+        assert not items.put_many([3, 4, 5])
+        assert items.dropped == 2
+        assert items.pop_many(10) == [3, 4, 5]
+
+        items = BoundedQueue(3, BoundedQueue.OVERFLOW_SAMPLE)
+        assert not items.put_many(list(range(100)))
+        assert items.dropped == 97
+        sampled = items.pop_many(10)
+        assert len(sampled) == 3
+        assert set(sampled) <= set(range(100))
+
+        items = BoundedQueue(3, BoundedQueue.OVERFLOW_BLOCK, 0.1)
+        assert items.put_many([1, 2])
+        assert not items.put_many([3, 4, 5])
+        assert items.dropped == 2
+        assert items.pop_many(10) == [1, 2, 3]
+
+        try:
+            BoundedQueue(3, 'unknown')
+        except ValueError:
+            pass
+        else:
+            assert False
+
+    def test_block_until_popped(self):
+        """Test that the block policy waits for items to be popped."""
+        items = BoundedQueue(2, BoundedQueue.OVERFLOW_BLOCK, 5)
+        assert items.put_many([1, 2])
+        popped = []
+        consumer = threading.Timer(0.1, lambda: popped.extend(items.pop_many(2)))
+        consumer.start()
+        assert items.put_many([3, 4])
+        consumer.join()
+        assert popped == [1, 2]
+        assert items.pop_many(10) == [3, 4]
+        assert items.dropped == 0
+
 
 class InMemoryImpressionsStorageTests(object):
     """InMemory impressions storage test cases."""
@@ -187,6 +387,47 @@ class InMemoryImpressionsStorageTests(object):
         storage.put(impressions)
         assert queue_full_hook.mock_calls == mocker.call()
 
+    def test_high_water_mark(self, mocker):
+        """Test queue_full_hook is executed once when the high water mark is reached."""
+        storage = InMemoryImpressionStorage(100, high_water_mark=10)
+        queue_full_hook = mocker.Mock()
+        storage.set_queue_full_hook(queue_full_hook)
+        impressions = [
+            Impression('key%d' % i, 'feature1', 'on', 'l1', 123456, 'b1', 321654)
+            for i in range(0, 9)
+        ]
+        assert storage.put(impressions)
+        assert queue_full_hook.mock_calls == []
+        assert storage.put(impressions)
+        assert storage.put(impressions)
+        assert len(queue_full_hook.mock_calls) == 1
+
+        storage.pop_many(5)
+        assert storage.put(impressions)
+        assert len(queue_full_hook.mock_calls) == 2
+
+    def test_dropped(self):
+        """Test the number of impressions discarded is tracked."""
+        storage = InMemoryImpressionStorage(5, BoundedQueue.OVERFLOW_DROP_OLDEST)
+        impressions = [
+            Impression('key%d' % i, 'feature1', 'on', 'l1', 123456, 'b1', 321654)
+            for i in range(0, 8)
+        ]
+        assert not storage.put(impressions)
+        assert storage.dropped == 3
+        assert storage.pop_many(10) == impressions[3:]
+
+    def test_put_pop_counts(self):
+        """Test impression counts are aggregated per feature & hour."""
+        storage = InMemoryImpressionStorage(5)
+        storage.put_counts([CountPerFeature('f1', 3600000, 3), CountPerFeature('f2', 3600000, 1)])
+        storage.put_counts([CountPerFeature('f1', 3600000, 2)])
+        assert sorted(storage.pop_counts()) == [
+            CountPerFeature('f1', 3600000, 5),
+            CountPerFeature('f2', 3600000, 1)
+        ]
+        assert storage.pop_counts() == []
+
 
 class InMemoryEventsStorageTests(object):
     """InMemory events storage test cases."""
@@ -225,6 +466,17 @@ class InMemoryEventsStorageTests(object):
         storage.put(events)
         assert queue_full_hook.mock_calls == mocker.call()
 
+    def test_high_water_mark(self, mocker):
+        """Test queue_full_hook is executed when the high water mark is reached."""
+        storage = InMemoryEventStorage(100, BoundedQueue.OVERFLOW_SAMPLE, high_water_mark=50)
+        queue_full_hook = mocker.Mock()
+        storage.set_queue_full_hook(queue_full_hook)
+        events = [Event('key%d' % i, 'user', 'purchase', 12.5, 321654) for i in range(0, 150)]
+        assert not storage.put(events)
+        assert len(queue_full_hook.mock_calls) == 1
+        assert storage.dropped == 50
+        assert len(storage.pop_many(200)) == 100
+
 
 class InMemoryTelemetryStorageTests(object):
     """In-Memory telemetry storage unit tests."""
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Memory mapped storage test module."""
+#pylint: disable=no-self-use,protected-access
+from __future__ import unicode_literals
+
+import os
+
+from splitio.models.segments import Segment
+from splitio.storage.mmapped import MMapSegmentStorage
+
+
+class MMapSegmentStorageTests(object):
+    """Memory mapped segment storage test cases."""
+
+    def test_put_get_contains(self, tmpdir):
+        """Test storing, fetching and querying segments."""
+        storage = MMapSegmentStorage(str(tmpdir))
+        assert storage.get('some/segment') is None
+        assert storage.get_change_number('some/segment') is None
+        assert not storage.segment_contains('some/segment', 'key1')
+
+        keys = ['key%d' % index for index in range(100)] + ['ключ']
+        storage.put(Segment('some/segment', keys, 123))
+        assert os.listdir(str(tmpdir)) == ['some%2Fsegment.segment']
+        assert storage.get_change_number('some/segment') == 123
+        assert storage.get('some/segment').keys == set(keys)
+        assert storage.get('some/segment').change_number == 123
+        for key in keys:
+            assert storage.segment_contains('some/segment', key)
+        assert not storage.segment_contains('some/segment', 'key100')
+        assert storage.segment_contains_keys('some/segment', ['key1', 'other']) == set(['key1'])
+
+        storage.put(Segment('empty', [], 1))
+        assert not storage.segment_contains('empty', 'key1')
+        assert storage.get('empty').keys == set()
+
+    def test_update(self, tmpdir):
+        """Test updating segments & change numbers."""
+        storage = MMapSegmentStorage(str(tmpdir))
+        storage.update('some_segment', ['key1', 'key2', 'key3'], [], 1)
+        storage.update('some_segment', ['key4', 'key5', 'key1'], ['key2', 'key5'], 2)
+        assert storage.get('some_segment').keys == set(['key1', 'key3', 'key4'])
+        assert storage.get_change_number('some_segment') == 2
+
+        storage.set_change_number('some_segment', 3)
+        storage.set_change_number('nonexistant_segment', 3)
+        assert storage.get_change_number('some_segment') == 3
+        assert storage.get_change_number('nonexistant_segment') is None
+        assert storage.get('some_segment').keys == set(['key1', 'key3', 'key4'])
+        assert sorted(os.listdir(str(tmpdir))) == ['some_segment.segment']
+
+    def test_shared_directory(self, tmpdir):
+        """Test that segments written by another storage are picked up after a refresh."""
+        writer = MMapSegmentStorage(str(tmpdir))
+        reader = MMapSegmentStorage(str(tmpdir), refresh_interval=0)
+        cached_reader = MMapSegmentStorage(str(tmpdir), refresh_interval=3600)
+        writer.put(Segment('some_segment', ['key1'], 1))
+        assert reader.segment_contains('some_segment', 'key1')
+        assert cached_reader.segment_contains('some_segment', 'key1')
+
+        writer.update('some_segment', ['key2'], ['key1'], 2)
+        assert reader.segment_contains('some_segment', 'key2')
+        assert not reader.segment_contains('some_segment', 'key1')
+        assert reader.get_change_number('some_segment') == 2
+        assert cached_reader.get_change_number('some_segment') == 1
+        cached_reader.refresh()
+        assert cached_reader.get_change_number('some_segment') == 2
+
+    def test_writer_lock(self, tmpdir):
+        """Test that a single storage per directory holds the writer lock."""
+        writer = MMapSegmentStorage(str(tmpdir))
+        reader = MMapSegmentStorage(str(tmpdir))
+        assert writer.acquire_writer_lock()
+        assert writer.acquire_writer_lock()
+        assert not reader.acquire_writer_lock()
+        assert MMapSegmentStorage(str(tmpdir.join('other'))).acquire_writer_lock()
+
+        writer._writer_lock_file.close()
+        assert reader.acquire_writer_lock()
+
+    def test_get_version(self, tmpdir):
+        """Test that the version increases when segments are written or replaced elsewhere."""
+        writer = MMapSegmentStorage(str(tmpdir))
+        reader = MMapSegmentStorage(str(tmpdir), refresh_interval=0)
+        version = reader.get_version()
+        assert not reader.segment_contains('some_segment', 'key1')
+        assert reader.get_version() == version
+
+        writer.put(Segment('some_segment', ['key1'], 1))
+        assert reader.get_version() > version
+        version = reader.get_version()
+        assert reader.get_version() == version
+        assert reader.segment_contains('some_segment', 'key1')
+
+        # Files replaced by another process bump the version without querying the segment.
+        writer.update('some_segment', ['key2'], ['key1'], 2)
+        assert reader.get_version() > version
+
+        version = writer.get_version()
+        writer.put(Segment('other_segment', ['key1'], 1))
+        assert writer.get_version() > version
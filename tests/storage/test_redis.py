@@ -3,12 +3,15 @@
 
 import json
 
+import pytest
+
 from splitio.client.util import get_metadata
 from splitio.storage.redis import RedisEventsStorage, RedisImpressionsStorage, \
     RedisSegmentStorage, RedisSplitStorage, RedisTelemetryStorage
 from splitio.models.segments import Segment
 from splitio.models.impressions import Impression
 from splitio.models.events import Event
+from splitio.engine.impressions import CountPerFeature
 from splitio.storage.adapters.redis import RedisAdapter, RedisAdapterException
 
 
@@ -38,6 +41,53 @@ class RedisSplitStorageTests(object):
         assert adapter.get.mock_calls == [mocker.call('SPLITIO.split.some_split')]
         assert not from_raw.mock_calls
 
+    def test_get_split_cached(self, mocker):
+        """Test that parsed splits are cached until the change number advances."""
+        data = {
+            'SPLITIO.splits.till': '1',
+            'SPLITIO.split.some_split': '{"name": "some_split"}'
+        }
+        adapter = mocker.Mock(spec=RedisAdapter)
+        adapter.get.side_effect = data.get
+        from_raw = mocker.Mock()
+        mocker.patch('splitio.models.splits.from_raw', new=from_raw)
+        now = mocker.Mock()
+        now.return_value = 100
+        mocker.patch('splitio.storage.redis.time.time', new=now)
+
+        storage = RedisSplitStorage(adapter, 500)
+        split = storage.get('some_split')
+        assert storage.get('some_split') is split
+        assert storage.get('missing') is None
+        assert storage.get('missing') is None
+        assert from_raw.mock_calls == [mocker.call({"name": "some_split"})]
+        assert adapter.get.mock_calls == [
+            mocker.call('SPLITIO.splits.till'),
+            mocker.call('SPLITIO.split.some_split'),
+            mocker.call('SPLITIO.split.missing'),
+            mocker.call('SPLITIO.split.missing')
+        ]
+
+        # The change number is only checked once the interval has elapsed.
+        adapter.reset_mock()
+        data['SPLITIO.splits.till'] = '2'
+        now.return_value = 100.4
+        assert storage.get('some_split') is split
+        assert adapter.get.mock_calls == []
+
+        now.return_value = 100.5
+        storage.get('some_split')
+        assert adapter.get.mock_calls == [
+            mocker.call('SPLITIO.splits.till'),
+            mocker.call('SPLITIO.split.some_split')
+        ]
+        assert len(from_raw.mock_calls) == 2
+
+        # Unchanged change number keeps the cache.
+        adapter.reset_mock()
+        now.return_value = 101
+        storage.get('some_split')
+        assert adapter.get.mock_calls == [mocker.call('SPLITIO.splits.till')]
 
     def test_get_changenumber(self, mocker):
         """Test fetching changenumber."""
@@ -50,41 +100,129 @@ class RedisSplitStorageTests(object):
     def test_get_all_splits(self, mocker):
         """Test fetching all splits."""
         adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        adapter.pipeline.return_value = pipe
         storage = RedisSplitStorage(adapter)
+        storage._MGET_CHUNK_SIZE = 2
         from_raw = mocker.Mock()
         mocker.patch('splitio.models.splits.from_raw', new=from_raw)
 
-        adapter.keys.return_value = [
-            'SPLITIO.split.split1',
-            'SPLITIO.split.split2',
-            'SPLITIO.split.split3'
+        adapter.smembers.return_value = ['split1', 'split2', 'split3']
+        pipe.execute.return_value = [
+            ['{"name": "split1"}', None],
+            ['{"name": "split3"}']
         ]
-        def _mget_mock(*_):
-            return ['{"name": "split1"}', '{"name": "split2"}', '{"name": "split3"}']
-        adapter.mget.side_effect = _mget_mock
 
         storage.get_all_splits()
 
-        assert adapter.keys.mock_calls == [mocker.call('SPLITIO.split.*')]
-        assert adapter.mget.mock_calls == [
-            mocker.call(['SPLITIO.split.split1', 'SPLITIO.split.split2', 'SPLITIO.split.split3'])
+        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.splits.names')]
+        assert not adapter.keys.mock_calls
+        assert adapter.pipeline.call_args_list == [mocker.call(transaction=False)]
+        assert pipe.mock_calls == [
+            mocker.call.mget(['SPLITIO.split.split1', 'SPLITIO.split.split2']),
+            mocker.call.mget(['SPLITIO.split.split3']),
+            mocker.call.execute()
         ]
 
-        assert len(from_raw.mock_calls) == 3
+        assert len(from_raw.mock_calls) == 2
         assert mocker.call({'name': 'split1'}) in from_raw.mock_calls
-        assert mocker.call({'name': 'split2'}) in from_raw.mock_calls
         assert mocker.call({'name': 'split3'}) in from_raw.mock_calls
 
+    def test_fetch_many(self, mocker):
+        """Test fetching many splits with a single MGET & prefetching dependencies."""
+        data = {
+            'SPLITIO.splits.till': '1',
+            'SPLITIO.split.child': '{"name": "child", "parents": ["parent"]}',
+            'SPLITIO.split.parent': '{"name": "parent", "parents": ["grandparent"]}',
+            'SPLITIO.split.grandparent': '{"name": "grandparent", "parents": []}',
+            'SPLITIO.split.other': '{"name": "other", "parents": ["parent"]}'
+        }
+        adapter = mocker.Mock(spec=RedisAdapter)
+        adapter.get.side_effect = data.get
+        adapter.mget.side_effect = lambda keys: [data.get(key) for key in keys]
+
+        def _from_raw(raw):
+            split = mocker.Mock()
+            split.name = raw['name']
+            split.get_dependency_names.return_value = raw['parents']
+            return split
+        mocker.patch('splitio.models.splits.from_raw', new=_from_raw)
+
+        storage = RedisSplitStorage(adapter)
+        fetched = storage.fetch_many(['child', 'missing'])
+        assert fetched['child'].name == 'child'
+        assert fetched['missing'] is None
+        assert adapter.mget.mock_calls == [
+            mocker.call(['SPLITIO.split.child', 'SPLITIO.split.missing'])
+        ]
+
+        adapter.reset_mock()
+        ordered, cyclic = storage.get_evaluation_order(['child', 'other'])
+        assert list(ordered.keys()) == ['grandparent', 'parent', 'child', 'other']
+        assert cyclic == set()
+        assert len(adapter.mget.mock_calls) == 3
+        assert not adapter.get.mock_calls
+
+        # Cached splits aren't fetched again.
+        adapter.reset_mock()
+        storage = RedisSplitStorage(adapter, 1000)
+        storage.fetch_many(['child', 'other'])
+        fetched = storage.fetch_many(['child', 'parent'])
+        assert [split.name for split in fetched.values()] == ['child', 'parent']
+        assert adapter.mget.mock_calls == [
+            mocker.call(['SPLITIO.split.child', 'SPLITIO.split.other']),
+            mocker.call(['SPLITIO.split.parent'])
+        ]
+
+    def test_apply_changes(self, mocker):
+        """Test that changes are applied in a single pipeline."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        adapter.pipeline.return_value = pipe
+        split = mocker.Mock()
+        split.name = 'split1'
+        split.to_json.return_value = {'name': 'split1'}
+
+        storage = RedisSplitStorage(adapter)
+        storage.apply_changes([split], ['split2', 'split3'], 123)
+        assert pipe.mock_calls == [
+            mocker.call.set('SPLITIO.split.split1', '{"name": "split1"}'),
+            mocker.call.sadd('SPLITIO.splits.names', 'split1'),
+            mocker.call.delete('SPLITIO.split.split2', 'SPLITIO.split.split3'),
+            mocker.call.srem('SPLITIO.splits.names', 'split2', 'split3'),
+            mocker.call.set('SPLITIO.splits.till', 123),
+            mocker.call.execute()
+        ]
+        assert not adapter.set.mock_calls
+
+        pipe.execute.side_effect = RedisAdapterException('something')
+        storage._logger = mocker.Mock()
+        with pytest.raises(RedisAdapterException):
+            storage.apply_changes([], ['split1'], 124)
+        assert len(storage._logger.error.mock_calls) == 1
+
     def test_get_split_names(self, mocker):
         """Test getching split names."""
         adapter = mocker.Mock(spec=RedisAdapter)
         storage = RedisSplitStorage(adapter)
-        adapter.keys.return_value = [
+        adapter.smembers.return_value = ['split1', 'split2', 'split3']
+        assert storage.get_split_names() == ['split1', 'split2', 'split3']
+        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.splits.names')]
+        assert not adapter.scan_iter.mock_calls
+
+        # Without an index, split keys are scanned.
+        adapter.smembers.return_value = []
+        adapter.scan_iter.return_value = iter([
             'SPLITIO.split.split1',
             'SPLITIO.split.split2',
             'SPLITIO.split.split3'
-        ]
+        ])
         assert storage.get_split_names() == ['split1', 'split2', 'split3']
+        assert adapter.scan_iter.mock_calls == [mocker.call('SPLITIO.split.*', 1000)]
+        assert not adapter.keys.mock_calls
+
+        adapter.smembers.side_effect = RedisAdapterException('something')
+        assert storage.get_split_names() == []
 
 
 class RedisSegmentStorageTests(object):
@@ -137,6 +275,54 @@ class RedisSegmentStorageTests(object):
             mocker.call('SPLITIO.segment.some_segment', 'some_key')
         ]
 
+    def test_get_segment_memberships(self, mocker):
+        """Test resolving memberships in many segments with a single pipeline."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        pipe.execute.return_value = [True, False]
+        adapter.pipeline.return_value = pipe
+        storage = RedisSegmentStorage(adapter)
+        assert storage.get_segment_memberships(['segment1', 'segment2'], 'some_key') == {
+            'segment1': True,
+            'segment2': False
+        }
+        assert adapter.pipeline.call_args_list == [mocker.call(transaction=False)]
+        assert pipe.mock_calls == [
+            mocker.call.sismember('SPLITIO.segment.segment1', 'some_key'),
+            mocker.call.sismember('SPLITIO.segment.segment2', 'some_key'),
+            mocker.call.execute()
+        ]
+        assert not adapter.sismember.mock_calls
+
+        pipe.execute.side_effect = RedisAdapterException('something')
+        assert storage.get_segment_memberships(['segment1'], 'some_key') is None
+
+    def test_segment_contains_keys(self, mocker):
+        """Test testing many keys for membership with chunked pipelines."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        pipe.execute.side_effect = [[True, False], [True]]
+        adapter.pipeline.return_value = pipe
+        storage = RedisSegmentStorage(adapter)
+        storage._SISMEMBER_CHUNK_SIZE = 2
+        assert storage.segment_contains_keys('some_segment', ['k1', 'k2', 'k3']) == \
+            set(['k1', 'k3'])
+        assert adapter.pipeline.call_args_list == [
+            mocker.call(transaction=False),
+            mocker.call(transaction=False)
+        ]
+        assert pipe.mock_calls == [
+            mocker.call.sismember('SPLITIO.segment.some_segment', 'k1'),
+            mocker.call.sismember('SPLITIO.segment.some_segment', 'k2'),
+            mocker.call.execute(),
+            mocker.call.sismember('SPLITIO.segment.some_segment', 'k3'),
+            mocker.call.execute()
+        ]
+        assert not adapter.sismember.mock_calls
+
+        pipe.execute.side_effect = RedisAdapterException('something')
+        assert storage.segment_contains_keys('some_segment', ['k1']) == set()
+
 
 class RedisImpressionsStorageTests(object):  #pylint: disable=too-few-public-methods
     """Redis Events storage test cases."""
@@ -144,6 +330,8 @@ class RedisImpressionsStorageTests(object):  #pylint: disable=too-few-public-met
     def test_add_impressions(self, mocker):
         """Test that adding impressions to storage works."""
         adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        adapter.pipeline.return_value = pipe
         metadata = get_metadata({})
         storage = RedisImpressionsStorage(adapter, metadata)
 
@@ -154,6 +342,7 @@ class RedisImpressionsStorageTests(object):  #pylint: disable=too-few-public-met
             Impression('key4', 'feature1', 'on', 'some_label', 123456, 'buck1', 321654)
         ]
 
+        pipe.execute.return_value = [8]
         assert storage.put(impressions) is True
 
         to_validate = [json.dumps({
@@ -173,15 +362,95 @@ class RedisImpressionsStorageTests(object):  #pylint: disable=too-few-public-met
             }
         }) for impression in impressions]
 
-        assert adapter.rpush.mock_calls == [mocker.call('SPLITIO.impressions', *to_validate)]
+        pipe.execute.return_value = [4]
+        assert storage.put(impressions) is True
+        assert adapter.pipeline.call_args_list == [
+            mocker.call(transaction=False),
+            mocker.call(transaction=False)
+        ]
+        assert pipe.mock_calls == [
+            mocker.call.rpush('SPLITIO.impressions', *to_validate),
+            mocker.call.execute(),
+            mocker.call.rpush('SPLITIO.impressions', *to_validate),
+            mocker.call.execute()
+        ]
+
+        # The TTL is only set when the queue is created.
+        assert adapter.expire.call_args_list == [mocker.call('SPLITIO.impressions', 3600)]
 
         # Assert that if an exception is thrown it's caught and False is returned
         adapter.reset_mock()
         def _raise_exc(*_):
             raise RedisAdapterException('something')
-        adapter.rpush.side_effect = _raise_exc
+        pipe.execute.side_effect = _raise_exc
         assert storage.put(impressions) is False
 
+    def test_queued_impressions(self, mocker):
+        """Test that queued impressions are pushed in bulk when flushing."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        adapter.pipeline.return_value = pipe
+        storage = RedisImpressionsStorage(adapter, get_metadata({}), 5, 2)
+        hook = mocker.Mock()
+        storage.set_queue_full_hook(hook)
+
+        impressions = [
+            Impression('key%d' % index, 'feature1', 'on', 'some_label', 123456, None, 321654)
+            for index in range(6)
+        ]
+        assert storage.put(impressions[:3]) is True
+        assert not adapter.pipeline.mock_calls
+        assert not hook.mock_calls
+        assert storage.put(impressions[3:5]) is True
+        assert hook.mock_calls == [mocker.call()]
+        assert storage.put(impressions[5:]) is False
+
+        pipe.execute.return_value = [2, 4, 5]
+        assert storage.flush() == 5
+        serialized = [json.loads(call[1][1]) for call in pipe.rpush.mock_calls]
+        assert [item['i']['k'] for item in serialized] == ['key0', 'key2', 'key4']
+        assert [len(call[1]) - 1 for call in pipe.rpush.mock_calls] == [2, 2, 1]
+        assert pipe.mock_calls[-1] == mocker.call.execute()
+        assert adapter.pipeline.call_count == 1
+        assert adapter.expire.call_args_list == [mocker.call('SPLITIO.impressions', 3600)]
+
+        adapter.reset_mock()
+        assert storage.flush() == 0
+        assert not adapter.pipeline.mock_calls
+
+        # Failed pushes are reported as nothing flushed.
+        pipe.execute.side_effect = RedisAdapterException('something')
+        assert storage.put(impressions[:1]) is True
+        assert storage.flush() == 0
+
+    def test_put_counts(self, mocker):
+        """Test that impression counts are added to a hash in a single pipeline."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        adapter.pipeline.return_value = pipe
+        storage = RedisImpressionsStorage(adapter, get_metadata({}))
+        pipe.execute.return_value = [0, 3, 1]
+        assert storage.put_counts([
+            CountPerFeature('feature1', 3600000, 3),
+            CountPerFeature('feature2', 7200000, 1)
+        ]) is True
+        assert pipe.mock_calls == [
+            mocker.call.exists('SPLITIO.impressions.count'),
+            mocker.call.hincrby('SPLITIO.impressions.count', 'feature1::3600000', 3),
+            mocker.call.hincrby('SPLITIO.impressions.count', 'feature2::7200000', 1),
+            mocker.call.execute()
+        ]
+        assert adapter.expire.call_args_list == [mocker.call('SPLITIO.impressions.count', 3600)]
+
+        # The TTL of an existing hash is left untouched.
+        adapter.reset_mock()
+        pipe.execute.return_value = [1, 6]
+        assert storage.put_counts([CountPerFeature('feature1', 3600000, 3)]) is True
+        assert not adapter.expire.mock_calls
+
+        pipe.execute.side_effect = RedisAdapterException('something')
+        assert storage.put_counts([CountPerFeature('feature1', 3600000, 3)]) is False
+
 
 class RedisEventsStorageTests(object):  #pylint: disable=too-few-public-methods
     """Redis Impression storage test cases."""
@@ -284,3 +553,37 @@ class RedisTelemetryStorageTests(object):
             mocker.call('SPLITIO/' + metadata.sdk_version + '/' + metadata.instance_name + '/gauge.gauge1', 123),
             mocker.call('SPLITIO/' + metadata.sdk_version + '/' + metadata.instance_name + '/gauge.gauge2', 456)
         ]
+
+    def test_aggregated_metrics(self, mocker):
+        """Test that aggregated metrics are written in a single pipeline when flushing."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipe = mocker.Mock()
+        adapter.pipeline.return_value = pipe
+        metadata = get_metadata({})
+        prefix = 'SPLITIO/' + metadata.sdk_version + '/' + metadata.instance_name + '/'
+
+        storage = RedisTelemetryStorage(adapter, metadata, True)
+        storage.inc_latency('some_latency', 2)
+        storage.inc_latency('some_latency', 2)
+        storage.inc_latency('some_latency', 30)
+        storage.inc_counter('some_counter')
+        storage.put_gauge('gauge1', 123)
+        storage.put_gauge('gauge1', 456)
+        assert not adapter.mock_calls
+
+        assert storage.flush() == 3
+        assert adapter.pipeline.call_args_list == [mocker.call(transaction=False)]
+        assert sorted(pipe.incr.mock_calls) == sorted([
+            mocker.call(prefix + 'latency.some_latency.bucket.2', 2),
+            mocker.call(prefix + 'count.some_counter', 1)
+        ])
+        assert pipe.set.mock_calls == [mocker.call(prefix + 'gauge.gauge1', 456)]
+        assert pipe.execute.mock_calls == [mocker.call()]
+
+        adapter.reset_mock()
+        assert storage.flush() == 0
+        assert not adapter.mock_calls
+
+        storage.inc_counter('some_counter')
+        pipe.execute.side_effect = RedisAdapterException('something')
+        assert storage.flush() == 0
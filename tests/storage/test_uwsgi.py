@@ -9,6 +9,7 @@ from splitio.models.splits import Split
 from splitio.models.segments import Segment
 from splitio.models.impressions import Impression
 from splitio.models.events import Event
+from splitio.engine.impressions import CountPerFeature
 
 from splitio.storage.adapters.uwsgi_cache import get_uwsgi
 
@@ -101,6 +102,25 @@ class UWSGISplitStorageTests(object):
         s2 = next(split for split in splits if split.name == 'some_split_2')
 
 
+    def test_apply_changes(self, mocker):
+        """Test applying a set of changes at once."""
+        uwsgi = get_uwsgi(True)
+        storage = UWSGISplitStorage(uwsgi)
+        splits = []
+        for name in ['split1', 'split2', 'split3']:
+            split = mocker.Mock(spec=Split)
+            split.to_json.return_value = '{}'
+            split.name = name
+            splits.append(split)
+        storage.apply_changes(splits, [], 1)
+        assert set(storage.get_split_names()) == set(['split1', 'split2', 'split3'])
+        assert storage.get_change_number() == 1
+
+        storage.apply_changes(splits[2:], ['split1', 'split2'], 2)
+        assert storage.get_split_names() == ['split3']
+        assert storage.get_change_number() == 2
+        assert storage.get('split1') is None
+
 
 class UWSGISegmentStorageTests(object):
     """UWSGI Segment storage test cases."""
@@ -180,6 +200,21 @@ class UWSGIImpressionsStorageTests(object):
         res = storage.pop_many(10)
         assert res == impressions
 
+    def test_put_pop_counts(self):
+        """Test storing and fetching impression counts."""
+        uwsgi = get_uwsgi(True)
+        storage = UWSGIImpressionStorage(uwsgi)
+        storage.put_counts([CountPerFeature('feature1', 3600000, 3)])
+        storage.put_counts([
+            CountPerFeature('feature1', 3600000, 2),
+            CountPerFeature('feature::2', 7200000, 1)
+        ])
+        assert sorted(storage.pop_counts()) == [
+            CountPerFeature('feature1', 3600000, 5),
+            CountPerFeature('feature::2', 7200000, 1)
+        ]
+        assert storage.pop_counts() == []
+
     def test_flush(self):
         """Test requesting, querying and acknowledging a flush."""
         uwsgi = get_uwsgi(True)
@@ -32,6 +32,7 @@ class EventsSyncTests(object):
         assert task.is_running()
         assert storage.pop_many.mock_calls[0] == mocker.call(5)
         assert api.flush_events.mock_calls[0] == mocker.call(events)
+        assert task.flushed >= len(events)
         stop_event = threading.Event()
         calls_now = len(api.flush_events.mock_calls)
         task.stop(stop_event)
@@ -6,6 +6,7 @@ from splitio.api.client import HttpResponse
 from splitio.tasks import impressions_sync
 from splitio.storage import ImpressionStorage
 from splitio.models.impressions import Impression
+from splitio.engine.impressions import CountPerFeature, ImpressionsManager, ImpressionsMode
 from splitio.api.impressions import ImpressionsAPI
 
 class ImpressionsSyncTests(object):
@@ -22,6 +23,7 @@ class ImpressionsSyncTests(object):
             Impression('key5', 'split3', 'off', 'l1', 123456, 'b1', 321654)
         ]
         storage.pop_many.return_value = impressions
+        storage.pop_counts.return_value = [CountPerFeature('split1', 3600000, 10)]
         api = mocker.Mock(spec=ImpressionsAPI)
         api.flush_impressions.return_value = HttpResponse(200, '')
         task = impressions_sync.ImpressionsSyncTask(api, storage, 1, 5)
@@ -30,9 +32,36 @@ class ImpressionsSyncTests(object):
         assert task.is_running()
         assert storage.pop_many.mock_calls[0] == mocker.call(5)
         assert api.flush_impressions.mock_calls[0] == mocker.call(impressions)
+        assert task.flushed >= len(impressions)
+        assert api.flush_counters.mock_calls[0] == mocker.call(
+            [CountPerFeature('split1', 3600000, 10)]
+        )
         stop_event = threading.Event()
         calls_now = len(api.flush_impressions.mock_calls)
         task.stop(stop_event)
         stop_event.wait(5)
         assert stop_event.is_set()
         assert len(api.flush_impressions.mock_calls) > calls_now
+
+
+class ImpressionsCountSyncTests(object):
+    """Impression counts syncrhonization task test cases."""
+
+    def test_normal_operation(self, mocker):
+        """Test that counts are handed to storage periodically and when stopped."""
+        storage = mocker.Mock(spec=ImpressionStorage)
+        manager = ImpressionsManager(storage, ImpressionsMode.OPTIMIZED, 10, 3600)
+        manager.process_impressions([Impression('key1', 'split1', 'on', 'l1', 123, None, 1000)])
+        task = impressions_sync.ImpressionsCountSyncTask(manager, 0.5)
+        task.start()
+        time.sleep(1)
+        assert task.is_running()
+        assert storage.put_counts.mock_calls == [mocker.call([CountPerFeature('split1', 0, 1)])]
+
+        manager.process_impressions([Impression('key1', 'split1', 'on', 'l1', 123, None, 2000)])
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        stop_event.wait(5)
+        assert stop_event.is_set()
+        assert not task.is_running()
+        assert storage.put_counts.mock_calls[-1] == mocker.call([CountPerFeature('split1', 0, 1)])
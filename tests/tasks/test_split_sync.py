@@ -90,9 +90,12 @@ class SplitSynchronizationTests(object):
         assert mocker.call(-1) in api.fetch_splits.mock_calls
         assert mocker.call(123) in api.fetch_splits.mock_calls
 
-        inserted_split = storage.put.mock_calls[0][1][0]
-        assert isinstance(inserted_split, Split)
-        assert inserted_split.name == 'some_name'
+        to_put, to_remove, change_number = storage.apply_changes.mock_calls[0][1]
+        assert len(to_put) == 1
+        assert isinstance(to_put[0], Split)
+        assert to_put[0].name == 'some_name'
+        assert to_remove == []
+        assert change_number == 123
 
     def test_that_errors_dont_stop_task(self, mocker):
         """Test that if fetching splits fails at some_point, the task will continue running."""
@@ -0,0 +1,29 @@
+"""Storage flushing task unit test module."""
+#pylint: disable=no-self-use
+import threading
+import time
+
+from splitio.storage.redis import RedisImpressionsStorage
+from splitio.tasks.storage_flush import StorageFlushTask
+
+
+class StorageFlushTaskTests(object):  #pylint: disable=too-few-public-methods
+    """Storage flushing task test cases."""
+
+    def test_normal_operation(self, mocker):
+        """Test that the storage is flushed periodically and when stopped."""
+        storage = mocker.Mock(spec=RedisImpressionsStorage)
+        storage.flush.return_value = 2
+        task = StorageFlushTask(storage, 0.5)
+        task.start()
+        time.sleep(1.2)
+        assert task.is_running()
+        calls = len(storage.flush.mock_calls)
+        assert calls >= 2
+
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        stop_event.wait()
+        assert not task.is_running()
+        assert len(storage.flush.mock_calls) == calls + 1
+        assert task.flushed == 2 * (calls + 1)